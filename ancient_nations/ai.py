@@ -5,11 +5,11 @@ ai.py – Nation AI decision making. Each turn every living nation:
   3. Manages armies (spawn, order, move)
   4. Handles diplomacy (trade, war, peace)
 """
-import random
 import math
 from constants import *
 from entities import Army, Town
-from pathfinding import find_path
+from pathfinding import PathRequest
+from targets import ATTACK, EXPAND
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -18,17 +18,34 @@ class NationAI:
         self.n     = nation
         self.world = world
         self.game  = game
+        self.rng   = game.rng.ai
 
     # ── main entry ────────────────────────────────────────────────────────
     def tick(self, turn):
         if not self.n.alive: return
+        prof = self.game.profiler
+        if prof:
+            prof.push(self.n.name, 'leader')
+            try:
+                self._tick(turn, prof)
+            finally:
+                prof.pop(2)
+        else:
+            self._tick(turn, None)
+
+    def _tick(self, turn, prof):
         self._tick_leader(turn)
         self._check_surrender(turn)
         if not self.n.alive: return   # may have just surrendered
+        if prof: prof.step('diplomacy')
         self._tick_diplomacy(turn)
+        if prof: prof.step('armies')
         self._manage_armies(turn)
+        if prof: prof.step('expansion')
         self._expansion_decisions(turn)
+        if prof: prof.step('development')
         self._development_decisions(turn)
+        if prof: prof.step('trade')
         self._trade_decisions(turn)
 
     # ── leader lifecycle ──────────────────────────────────────────────────
@@ -38,7 +55,7 @@ class NationAI:
         # Natural death — probability climbs from 0 after 60 turns in power
         if self.n.leader_age > 60:
             death_chance = (self.n.leader_age - 60) * 0.003   # ~12 % at turn 100
-            if random.random() < death_chance:
+            if self.rng.random() < death_chance:
                 old_ep = self.n.leader_epithet()
                 self.n.new_leader()
                 self.game.log(turn,
@@ -57,7 +74,7 @@ class NationAI:
             hist = self.n.history['territory']
             if len(hist) >= 5 and hist[-1] < hist[-5] * 0.85:
                 overthrow += 0.05
-        if overthrow > 0 and random.random() < overthrow:
+        if overthrow > 0 and self.rng.random() < overthrow:
             old_ep = self.n.leader_epithet()
             self.n.new_leader(crisis=True)
             self.game.log(turn,
@@ -125,7 +142,7 @@ class NationAI:
                 )
                 # Hawks hold on longer before offering peace
                 peace_threshold = 0.5 - self.n.leader_aggression * 0.2
-                if not surrender_desperate and ratio < peace_threshold and random.random() < 0.15:
+                if not surrender_desperate and ratio < peace_threshold and self.rng.random() < 0.15:
                     self._offer_peace(other, turn)
 
             # --- ALLIANCE: mutual-defence + break check + union vote ---
@@ -145,7 +162,7 @@ class NationAI:
                 aggro_threshold = 1.5 - self.n.leader_aggression * 0.4
                 war_chance      = 0.08 + self.n.leader_aggression * 0.22
                 if adjacent and ratio >= aggro_threshold:
-                    if random.random() < war_chance:
+                    if self.rng.random() < war_chance:
                         self._declare_war(other, turn)
 
             # --- PEACE: consider forming alliance ---
@@ -156,7 +173,7 @@ class NationAI:
                 if self._should_ally(other, my_str):
                     # Hawks are less interested in pacts
                     ally_chance = AI_ALLY_CHANCE * (1.0 - self.n.leader_aggression * 0.5)
-                    if random.random() < ally_chance:
+                    if self.rng.random() < ally_chance:
                         self._propose_alliance(other, turn)
 
     def _declare_war(self, other, turn):
@@ -187,7 +204,7 @@ class NationAI:
         # A crushingly dominant winner expects surrender, not treaty
         if ratio > 3.0:
             base_accept *= 0.4
-        if random.random() < base_accept:
+        if self.rng.random() < base_accept:
             self.n.make_peace(other.idx, turn)
             other.make_peace(self.n.idx, turn)
             self.game.log(turn,
@@ -199,7 +216,7 @@ class NationAI:
     def _should_ally(self, other, my_str):
         """True when it's strategically wise to ally with other."""
         # Refuse to ally a known betrayer (reputation penalty)
-        if other.betrayed_turns > 20 and random.random() < BETRAYAL_ALLY_CHANCE_MOD:
+        if other.betrayed_turns > 20 and self.rng.random() < BETRAYAL_ALLY_CHANCE_MOD:
             return False
         rivals = [n for n in self.game.nations
                   if n.alive and n.idx != self.n.idx and n.idx != other.idx]
@@ -215,7 +232,7 @@ class NationAI:
         other_ai     = self.game.ai[other.idx]
         their_str    = other.army_strength() or 1
         accept_bonus = 0.3 - other.leader_aggression * 0.2   # 0.1 – 0.3
-        if other_ai._should_ally(self.n, their_str) or random.random() < accept_bonus:
+        if other_ai._should_ally(self.n, their_str) or self.rng.random() < accept_bonus:
             # Both sides must be able to pay the formation cost (diplomatic gifts)
             cost = {RES_GOLD: ALLIANCE_FORM_GOLD, RES_FOOD: ALLIANCE_FORM_FOOD}
             if not (self.n.can_afford(cost) and other.can_afford(cost)):
@@ -239,7 +256,7 @@ class NationAI:
             # Join if we're strong enough and not already overstretched
             wars_active = sum(1 for n in self.game.nations
                               if self.n.at_war_with(n.idx))
-            if wars_active < 2 and random.random() < self.n.mutual_def_chance(ally.idx):
+            if wars_active < 2 and self.rng.random() < self.n.mutual_def_chance(ally.idx):
                 self.n.declare_war(enemy.idx, turn)
                 enemy.declare_war(self.n.idx, turn)
                 self.game.log(turn,
@@ -252,7 +269,7 @@ class NationAI:
         their_str = ally.army_strength() or 1
         # Betray if they're way stronger and adjacent (threat) — rare
         if their_str > my_str * 2.5 and self._is_adjacent_to(ally):
-            if random.random() < 0.02:
+            if self.rng.random() < 0.02:
                 self._execute_betrayal(ally, turn)
 
     def _execute_betrayal(self, ally, turn):
@@ -283,10 +300,10 @@ class NationAI:
         # Only the larger nation calls the vote
         if len(self.n.tiles) < len(ally.tiles):
             return
-        if random.random() > UNION_VOTE_CHANCE:
+        if self.rng.random() > UNION_VOTE_CHANCE:
             return
 
-        roll = random.random()
+        roll = self.rng.random()
         if roll < UNION_SUCCESS_CHANCE:
             # Vote passes — smaller is absorbed, trait blended
             smaller = ally
@@ -329,7 +346,7 @@ class NationAI:
         # If we have no armies at all, ratio is irrelevant — we're defenceless
         ratio = (my_str / their_str) if their_str > 0 else 0.0
 
-        if ratio < SURRENDER_STRENGTH_RATIO and random.random() < SURRENDER_CHANCE:
+        if ratio < SURRENDER_STRENGTH_RATIO and self.rng.random() < SURRENDER_CHANCE:
             self.game.absorb_nation(strongest, self.n, turn)
 
     def _is_adjacent_to(self, other):
@@ -344,12 +361,7 @@ class NationAI:
         if cap and other_cap:
             if math.dist((cap.x, cap.y), (other_cap.x, other_cap.y)) <= 45:
                 return True
-        other_tiles = other.tiles
-        for (x, y) in self.n.tiles:
-            if ((x+1, y) in other_tiles or (x-1, y) in other_tiles or
-                    (x, y+1) in other_tiles or (x, y-1) in other_tiles):
-                return True
-        return False
+        return self.game.territory.adjacent(self.n, other)
 
     def _resource_pressure(self):
         """0-1 score; high = running low on multiple resources."""
@@ -361,17 +373,31 @@ class NationAI:
 
     # ── army management ───────────────────────────────────────────────────
     def _manage_armies(self, turn):
-        # Move existing armies
+        # Armies absorbed from another nation may still await their routes
+        self.game.paths.settle()
+        # Move existing armies; those needing a route queue a PathRequest
+        batch = []
         for army in list(self.n.armies):
             if not army.is_alive():
                 self._remove_army(army)
                 continue
-            self._move_army(army, turn)
+            self._move_army(army, turn, batch)
             army.turns_alive += 1
 
         # Spawn new armies if needed & affordable
         self._maybe_spawn_armies(turn)
 
+        # Route the whole turn's requests together (see PathService.submit)
+        if batch:
+            self.game.paths.submit([req for _, req, _ in batch],
+                                   lambda paths: self._apply_paths(batch, paths))
+
+    def _apply_paths(self, batch, paths):
+        for (army, _, has_dest), path in zip(batch, paths):
+            army.path = path
+            if has_dest and not path:
+                army.destination = None  # unreachable, retry next turn
+
     def _maybe_spawn_armies(self, turn):
         max_armies = max(4, len(self.n.tiles) // 10)
         current    = self.n.total_armies()
@@ -386,15 +412,12 @@ class NationAI:
             cost  = self.n.army_build_cost(level)
             if self.n.can_afford(cost):
                 self.n.spend(cost)
-                army = Army(town.x, town.y, self.n.idx, level)
+                army = self.game.new_army(town.x, town.y, self.n.idx, level)
                 army.order = self._pick_order()
                 self.n.armies.append(army)
-                t = self.world.t(town.x, town.y)
-                t.armies.append(army)
-                t.army = army
-                self.game.log(turn,
-                    f"  {self.n.name} trained Level-{level} army at {town.name}",
-                    self.n.idx)
+                self.world.place_army(army, town.x, town.y)
+                self.game.log(turn, "  {} trained Level-{} army at {}", self.n.idx,
+                              self.n.name, level, town.name)
                 break   # one spawn per turn
 
     def _pick_order(self):
@@ -405,10 +428,10 @@ class NationAI:
         if at_war: return 'attack'
         # Hawks lean toward attack even in peacetime
         if self.n.leader_aggression >= 0.65:
-            return random.choice(['expand', 'attack', 'attack', 'defend'])
-        return random.choice(['expand', 'expand', 'attack', 'defend'])
+            return self.rng.choice(['expand', 'attack', 'attack', 'defend'])
+        return self.rng.choice(['expand', 'expand', 'attack', 'defend'])
 
-    def _move_army(self, army, turn):
+    def _move_army(self, army, turn, batch):
         if army.path:
             steps = max(1, int(self.world.t(army.x,army.y).terrain_speed()))
             for _ in range(steps):
@@ -416,14 +439,17 @@ class NationAI:
                 nx,ny = army.path.pop(0)
                 self._step_army(army, nx, ny, turn)
         else:
-            self._assign_destination(army, turn)
+            self._assign_destination(army, turn, batch)
 
-    def _assign_destination(self, army, turn):
+    def _assign_destination(self, army, turn, batch):
+        """Pick army's destination and queue its route in batch."""
+        shared = False   # goal many armies head for (enemy capital)
         if army.order == 'attack':
             # Strictly target enemy tiles; fall back to marching on enemy capital
             dest = self._find_attack_target(army)
             if dest is None:
                 dest = self._find_enemy_capital_target(army)
+                shared = True
         elif army.order == 'expand':
             dest = self._find_expansion_target(army)
         elif army.order == 'defend':
@@ -436,10 +462,9 @@ class NationAI:
 
         if dest:
             army.destination = dest
-            army.path = find_path(self.world, army.x, army.y, dest[0], dest[1],
-                                   self.n.idx, road_allied=road_allied)
-            if not army.path:
-                army.destination = None  # unreachable, retry next turn
+            batch.append((army, PathRequest(army.x, army.y, dest[0], dest[1],
+                                            road_allied=road_allied,
+                                            shared=shared), True))
         else:
             # Wander to unclaimed adjacent land
             candidates = []
@@ -447,36 +472,18 @@ class NationAI:
                 if t.is_land() and t.owner != self.n.idx:
                     candidates.append((t.x, t.y))
             if candidates:
-                d = random.choice(candidates)
-                army.path = find_path(self.world, army.x, army.y, d[0], d[1],
-                                       self.n.idx, road_allied=road_allied)
+                d = self.rng.choice(candidates)
+                batch.append((army, PathRequest(army.x, army.y, d[0], d[1],
+                                                road_allied=road_allied), False))
 
     def _find_attack_target(self, army):
-        """Find the best enemy-owned tile within search radius to conquer."""
-        needed = self._most_needed_resource()
-        best_score = -1
-        best_tile  = None
-        cx, cy = army.x, army.y
+        """Find the best enemy-owned tile within search radius to conquer.
 
-        for t in self.world.tiles_in_radius(cx, cy, 18):
-            if not t.is_land(): continue
-            if t.owner < 0: continue                         # skip neutral
-            if t.owner == self.n.idx: continue               # skip own tiles
-            if not self.n.at_war_with(t.owner): continue    # skip non-enemies
-
-            score = 0
-            d = t.deposits
-            score += d[needed] * 3
-            for r in range(NUM_RESOURCES):
-                score += d[r]
-            dist = abs(t.x - cx) + abs(t.y - cy)
-            score /= (dist + 1)
-
-            if score > best_score:
-                best_score = score
-                best_tile  = (t.x, t.y)
-
-        return best_tile
+        Score: (3 * needed deposit + all deposits) / (distance + 1); see
+        targets.TargetMaps, which answers without scanning the radius.
+        """
+        return self.game.targets.best(self.n, ATTACK, self._most_needed_resource(),
+                                      army.x, army.y)
 
     def _find_enemy_capital_target(self, army):
         """When at war but no enemy tiles are within local search radius,
@@ -495,48 +502,28 @@ class NationAI:
         return best_dest
 
     def _find_expansion_target(self, army):
-        """Find the best tile to conquer: prioritise needed resources."""
-        needed = self._most_needed_resource()
-        best_score = -1
-        best_tile  = None
-        cx, cy = army.x, army.y
-
-        # Search radius around army
-        for t in self.world.tiles_in_radius(cx, cy, 18):
-            if not t.is_land(): continue
-            if t.owner == self.n.idx: continue
-
-            # Skip tiles owned by friends at peace
-            if t.owner >= 0:
-                if not self.n.at_war_with(t.owner): continue
-
-            # Score based on resource deposits
-            score = 0
-            d = t.deposits
-            score += d[needed] * 3
-            for r in range(NUM_RESOURCES):
-                score += d[r]
-            # Penalise distance (Manhattan — no sqrt needed for relative scoring)
-            dist = abs(t.x - cx) + abs(t.y - cy)
-            score /= (dist + 1)
-
-            if score > best_score:
-                best_score = score
-                best_tile  = (t.x, t.y)
+        """Find the best tile to conquer: prioritise needed resources.
 
-        return best_tile
+        Like _find_attack_target, but neutral land counts too.
+        """
+        return self.game.targets.best(self.n, EXPAND, self._most_needed_resource(),
+                                      army.x, army.y)
 
     def _find_defense_target(self, army):
-        """Return coordinates of our most threatened border tile."""
-        rows = self.world.tiles
-        for x, y in self.n.tiles:
-            for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
-                nx, ny = x+dx, y+dy
-                if 0 <= nx < MAP_SIZE and 0 <= ny < MAP_SIZE:
-                    nb = rows[ny][nx]
-                    if nb.armies and nb.armies[0].nation != self.n.idx:
-                        return (x, y)
-        return None
+        """Return coordinates of our most threatened border tile.
+
+        That is the first of our tiles (in territory order) next to a stack
+        led by another nation; found from the stacks, not our territory.
+        """
+        tiles = self.n.tiles
+        threatened = [
+            (nb.x, nb.y)
+            for t in self.world.army_index.tiles()
+            if t.armies[0].nation != self.n.idx
+            for nb in self.world.neighbors4(t.x, t.y)
+            if (nb.x, nb.y) in tiles
+        ]
+        return min(threatened, key=tiles.__getitem__, default=None)
 
     def _most_needed_resource(self):
         """Return the resource index we have the least of (weighted by value)."""
@@ -552,8 +539,7 @@ class NationAI:
     def _step_army(self, army, nx, ny, turn):
         # Remove from old tile
         old_t = self.world.t(army.x, army.y)
-        if army in old_t.armies: old_t.armies.remove(army)
-        if old_t.army == army:   old_t.army = old_t.armies[0] if old_t.armies else None
+        self.world.lift_army(army, army.x, army.y)
 
         target_t = self.world.t(nx, ny)
 
@@ -581,11 +567,9 @@ class NationAI:
                 atk_surge=atk_surge, tier4_def=tier4_def,
                 atk_trait_dice=atk_trait_dice, def_trait_dice=def_trait_dice)
             self.game.battles.append(battle)
-            self.game.log(turn,
-                f"[WAR]  Battle at ({nx},{ny}): {self.n.name} vs "
-                f"{self.game.nations[enemy.nation].name} > "
-                f"{'WIN' if winner==self.n.idx else 'LOSS'}",
-                self.n.idx)
+            self.game.log(turn, "[WAR]  Battle at ({},{}): {} vs {} > {}", self.n.idx,
+                          nx, ny, self.n.name, self.game.nations[enemy.nation].name,
+                          'WIN' if winner==self.n.idx else 'LOSS')
 
             if winner == self.n.idx:
                 # Conquer tile
@@ -593,22 +577,19 @@ class NationAI:
                 if not enemy.is_alive():
                     self._remove_army(enemy, self.game.nations[enemy.nation])
                 army.x, army.y = nx, ny
-                target_t.armies.append(army)
-                target_t.army = army
+                self.world.place_army(army, nx, ny)
             else:
                 # Repelled – stay put (army may be dead)
                 if not army.is_alive():
                     self._remove_army(army)
                 else:
                     army.x, army.y = old_t.x, old_t.y
-                    old_t.armies.append(army)
-                    old_t.army = army
+                    self.world.place_army(army, old_t.x, old_t.y)
                 army.path = []
         else:
             # No enemy – just move; do not claim neutral tiles in transit
             army.x, army.y = nx, ny
-            target_t.armies.append(army)
-            target_t.army = army
+            self.world.place_army(army, nx, ny)
 
     def _conquer_tile(self, tile, army, turn):
         prev_owner = tile.owner
@@ -626,28 +607,22 @@ class NationAI:
                 self.game.nations[prev_owner].towns.remove(old_town)
             old_town.nation = self.n.idx
             self.n.towns.append(old_town)
-            self.game.log(turn,
-                f"  {self.n.name} captured {old_town.name}!",
-                self.n.idx)
+            self.game.log(turn, "  {} captured {}!", self.n.idx,
+                          self.n.name, old_town.name)
 
     def _remove_army(self, army, nation=None):
         n = nation or self.n
         if army in n.armies:
             n.armies.remove(army)
-        t = self.world.t(army.x, army.y)
-        if army in t.armies: t.armies.remove(army)
-        if t.army == army:   t.army = t.armies[0] if t.armies else None
+        self.world.lift_army(army, army.x, army.y)
 
     # ── expansion / development ───────────────────────────────────────────
     def _expansion_decisions(self, turn):
         """Claim neutral adjacent tiles using town influence."""
-        radius_bonus = self.n.trait_val('town_radius_bonus', 0)
-        for town in self.n.towns:
-            r = town.radius + radius_bonus
-            for tile in self.world.tiles_in_radius(town.x, town.y, r):
-                if tile.owner == -1 and tile.is_land():
-                    self.world.set_tile_owner(tile.x, tile.y, self.n.idx)
-                    self.n.tiles.add((tile.x, tile.y))
+        # Same tiles, same order as scanning every town's radius (territory.py).
+        for x, y in self.game.territory.claimable(self.n):
+            self.world.set_tile_owner(x, y, self.n.idx)
+            self.n.tiles.add((x, y))
 
     def _development_decisions(self, turn):
         """Build farms, mines, roads."""
@@ -658,11 +633,12 @@ class NationAI:
         # Build farms near rivers if food is low
         farm_wood = DEV_FARM_WOOD * dcm
         if self.n.res[RES_FOOD] < AI_LOW_RESOURCE * 2:
-            for (x,y) in random.sample(list(self.n.tiles), min(20, len(self.n.tiles))):
+            for (x,y) in self.rng.sample(list(self.n.tiles), min(20, len(self.n.tiles))):
                 t = w.t(x,y)
                 if t.can_build_farm() and t.terrain == TERRAIN_RIVER:
                     if self.n.res[RES_WOOD] >= farm_wood:
                         t.entity = 'farm'
+                        w.touch(x, y)
                         self.n.res[RES_WOOD] -= farm_wood
                         self.n.res[RES_FOOD] -= DEV_FARM_FOOD
                         break
@@ -671,12 +647,13 @@ class NationAI:
         mine_wood  = DEV_MINE_WOOD  * dcm
         mine_metal = DEV_MINE_METAL * dcm
         if self.n.res[RES_METAL] < AI_LOW_RESOURCE:
-            for (x,y) in random.sample(list(self.n.tiles), min(20, len(self.n.tiles))):
+            for (x,y) in self.rng.sample(list(self.n.tiles), min(20, len(self.n.tiles))):
                 t = w.t(x,y)
                 if t.terrain == TERRAIN_MOUNTAIN and t.entity is None:
                     if (self.n.res[RES_WOOD]  >= mine_wood and
                             self.n.res[RES_METAL] >= mine_metal):
                         t.entity = 'mine'
+                        w.touch(x, y)
                         self.n.res[RES_WOOD]  -= mine_wood
                         self.n.res[RES_METAL] -= mine_metal
                         break
@@ -685,12 +662,12 @@ class NationAI:
         if self.n.res[RES_WOOD] > 60 and len(self.n.towns) > 1:
             towns = self.n.towns
             if len(towns) >= 2:
-                t1 = random.choice(towns)
+                t1 = self.rng.choice(towns)
                 t2 = min([t for t in towns if t is not t1],
                          key=lambda t: math.dist((t1.x,t1.y),(t.x,t.y)),
                          default=None)
                 if t2:
-                    path = find_path(w, t1.x, t1.y, t2.x, t2.y, self.n.idx)
+                    path = self.game.paths.path(t1.x, t1.y, t2.x, t2.y, self.n.idx)
                     road_unit = (DEV_ROAD_WOOD + DEV_ROAD_METAL) * dcm
                     cost = len(path) * road_unit
                     if self.n.res[RES_WOOD] >= cost and cost > 0:
@@ -699,6 +676,7 @@ class NationAI:
                             rt = w.t(rx,ry)
                             if rt.is_land():
                                 rt.road = True
+                                w.touch(rx, ry)
 
         # Build castles at border tiles with armies
         castle_wood  = DEV_CASTLE_WOOD  * dcm
@@ -710,8 +688,9 @@ class NationAI:
                         t.is_land() and t.terrain != TERRAIN_OCEAN):
                     is_border = any(nb.owner != self.n.idx
                                     for nb in w.neighbors4(army.x, army.y))
-                    if is_border and random.random() < 0.05:
+                    if is_border and self.rng.random() < 0.05:
                         t.entity = 'castle'
+                        w.touch(army.x, army.y)
                         self.n.res[RES_WOOD]  -= castle_wood
                         self.n.res[RES_METAL] -= castle_metal
                         break
@@ -725,7 +704,7 @@ class NationAI:
         if len(self.n.towns) >= 8: return
         capital = self.n.capital
         if not capital or capital.level < 3: return
-        if random.random() > 0.03: return  # low chance per turn
+        if self.rng.random() > 0.03: return  # low chance per turn
 
         # Find a good spot ~10-15 tiles from capital, on plains/forest, owned
         candidates = []
@@ -738,19 +717,18 @@ class NationAI:
                     candidates.append((x,y))
 
         if candidates:
-            x,y = random.choice(candidates)
-            town = Town(x, y, self.n.idx, is_capital=False)
+            x,y = self.rng.choice(candidates)
+            town = self.game.new_town(x, y, self.n.idx)
             self.world.t(x,y).town = town
             self.n.towns.append(town)
             self.n.res[RES_WOOD]  -= 30
             self.n.res[RES_FOOD]  -= 20
-            self.game.log(turn,
-                f"  {self.n.name} founded {town.name} at ({x},{y})",
-                self.n.idx)
+            self.game.log(turn, "  {} founded {} at ({},{})", self.n.idx,
+                          self.n.name, town.name, x, y)
 
     # ── trade ─────────────────────────────────────────────────────────────
     def _trade_decisions(self, turn):
-        if random.random() > AI_TRADE_CHANCE: return
+        if self.rng.random() > AI_TRADE_CHANCE: return
         my_surplus = self._surplus_resource()
         my_need    = self._most_needed_resource()
         if my_surplus == my_need: return
@@ -775,11 +753,9 @@ class NationAI:
                     other.res[their_need]     += amount
                     self.n.history['trades_done'] += 1
                     other.history['trades_done']  += 1
-                    self.game.log(turn,
-                        f"  {self.n.name} <> {other.name}: "
-                        f"trade {RESOURCE_NAMES[my_surplus]}<>"
-                        f"{RESOURCE_NAMES[my_need]}",
-                        self.n.idx)
+                    self.game.log(turn, "  {} <> {}: trade {}<>{}", self.n.idx,
+                                  self.n.name, other.name,
+                                  RESOURCE_NAMES[my_surplus], RESOURCE_NAMES[my_need])
                     break
 
     def _surplus_resource(self):
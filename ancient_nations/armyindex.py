@@ -0,0 +1,44 @@
+"""
+armyindex.py – Where the armies are, without scanning the map.
+
+ArmyIndex records every tile whose `armies` stack is non-empty, bucketed by
+outer region (INNER_SIZE x INNER_SIZE blocks).  World.place_army and
+World.lift_army keep it current, so every change to a tile's stack must go
+through them.  Queries cost O(occupied tiles) — a few dozen — instead of
+O(territory) or O(map).
+
+Stacks are stored as tiles, not armies: an army's nation can change in place
+(union, rebellion) without moving, so callers read tile.armies live.
+"""
+from constants import *
+
+
+class ArmyIndex:
+    """Occupied tiles, bucketed by outer region."""
+
+    def __init__(self):
+        self._buckets = {}   # (ox, oy) -> {(x, y): tile}
+
+    def __len__(self):
+        return sum(len(b) for b in self._buckets.values())
+
+    def update(self, tile):
+        """Record tile's stack as occupied or empty."""
+        key = (tile.x // INNER_SIZE, tile.y // INNER_SIZE)
+        if tile.armies:
+            self._buckets.setdefault(key, {})[(tile.x, tile.y)] = tile
+        else:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.pop((tile.x, tile.y), None)
+                if not bucket:
+                    del self._buckets[key]
+
+    def tiles(self):
+        """Every tile with at least one army."""
+        for bucket in self._buckets.values():
+            yield from bucket.values()
+
+    def in_region(self, ox, oy):
+        """Occupied tiles of outer region (ox, oy)."""
+        return list(self._buckets.get((ox, oy), {}).values())
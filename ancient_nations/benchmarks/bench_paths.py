@@ -0,0 +1,106 @@
+"""
+Benchmark: reference A* (find_path) vs the flat-array PathService engine.
+
+Queries are random endpoint pairs on worlds advanced a few turns (so roads
+and borders exist).  Caching is bypassed: every query is a fresh search.
+Also checks that inside the search box both return the same path, and
+reports how often the region corridor found a cheaper route.
+
+Run from ancient_nations/:
+    python benchmarks/bench_paths.py
+    python benchmarks/bench_paths.py --seeds 1-5 --queries 500 --pretty
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from constants import *
+from game import Game
+from pathfinding import PathService, _route, _search_box, _step_cost, find_path
+
+
+def _parse_seeds(spec):
+    if '-' in spec:
+        lo, hi = map(int, spec.split('-'))
+        return list(range(lo, hi + 1))
+    return [int(s) for s in spec.split(',')]
+
+
+def _queries(seed, n):
+    rnd = random.Random(seed)
+    return [tuple(rnd.randrange(MAP_SIZE) for _ in range(4)) for _ in range(n)]
+
+
+def _cost(w, path):
+    return sum(_step_cost(w.t(x, y), True, frozenset()) for x, y in path)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument('--seeds', default='1-3', help='Seed range a-b or list a,b,c')
+    p.add_argument('--queries', type=int, default=300, help='Queries per seed')
+    p.add_argument('--turns', type=int, default=50, help='Turns to play before timing')
+    p.add_argument('--pretty', action='store_true')
+    args = p.parse_args()
+
+    ref, flat, boxed, mismatched, cheaper = [], [], [], [], 0
+    for seed in _parse_seeds(args.seeds):
+        g = Game(seed=seed)
+        for _ in range(args.turns):
+            g.process_turn()
+        w     = g.world
+        paths = PathService(w)
+        grid  = paths.grid()
+        queries = _queries(seed, args.queries)
+
+        t0 = time.perf_counter()
+        want = [find_path(w, *q) for q in queries]
+        ref.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for sx, sy, tx, ty in queries:
+            paths._buffers.search(grid.cost, sx, sy, tx, ty, _search_box(sx, sy, tx, ty))
+        boxed.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        got = [_route(grid, paths._buffers, *q) for q in queries]
+        flat.append(time.perf_counter() - t0)
+
+        for q, a, (b, box) in zip(queries, want, got):
+            if box is not None and a != b:
+                mismatched.append([seed, *q])
+            elif box is None and a != b:
+                if not a or _cost(w, b) < _cost(w, a):
+                    cheaper += 1
+                else:
+                    mismatched.append([seed, *q])
+
+    def ms(xs):
+        return {'median': round(statistics.median(xs) * 1000, 2),
+                'min':    round(min(xs) * 1000, 2)}
+
+    out = {
+        'map_size':        MAP_SIZE,
+        'seeds':           len(ref),
+        'queries_per_seed': args.queries,
+        'reference_ms':    ms(ref),
+        'flat_boxed_ms':   ms(boxed),
+        'flat_service_ms': ms(flat),
+        'speedup_boxed':   round(statistics.median(ref) / statistics.median(boxed), 2),
+        'speedup_service': round(statistics.median(ref) / statistics.median(flat), 2),
+        'corridor_improved': cheaper,
+        'mismatched_queries': mismatched,
+    }
+    sys.stdout.write(json.dumps(out, indent=2 if args.pretty else None) + '\n')
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == '__main__':
+    main()
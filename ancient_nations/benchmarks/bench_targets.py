@@ -0,0 +1,109 @@
+"""
+Benchmark: radius-scan vs TargetMaps army target selection.
+
+For every army of every living nation, at several points of a game, picks
+attack and expansion targets with the original tiles_in_radius scan and
+with targets.TargetMaps (vectorised and, with --no-numpy, pure Python),
+timing each and checking that all of them choose the same tiles.
+
+Run from ancient_nations/:
+    python benchmarks/bench_targets.py
+    python benchmarks/bench_targets.py --seeds 1-5 --turns 200 --pretty
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import targets
+from constants import *
+from game import Game
+from targets import ATTACK, EXPAND, SEARCH_RADIUS, TargetMaps
+
+
+def _parse_seeds(spec):
+    if '-' in spec:
+        lo, hi = map(int, spec.split('-'))
+        return list(range(lo, hi + 1))
+    return [int(s) for s in spec.split(',')]
+
+
+def _scan(ai, kind, needed, cx, cy):
+    """The AI's original target search."""
+    best_score = -1
+    best_tile  = None
+    for t in ai.world.tiles_in_radius(cx, cy, SEARCH_RADIUS):
+        if not t.is_land(): continue
+        if t.owner == ai.n.idx: continue
+        if t.owner < 0:
+            if kind == ATTACK: continue
+        elif not ai.n.at_war_with(t.owner): continue
+        score = 0
+        d = t.deposits
+        score += d[needed] * 3
+        for r in range(NUM_RESOURCES):
+            score += d[r]
+        dist = abs(t.x - cx) + abs(t.y - cy)
+        score /= (dist + 1)
+        if score > best_score:
+            best_score = score
+            best_tile  = (t.x, t.y)
+    return best_tile
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument('--seeds', default='1-3', help='Seed range a-b or list a,b,c')
+    p.add_argument('--turns', type=int, default=150, help='Turns per game')
+    p.add_argument('--every', type=int, default=25, help='Sample every N turns')
+    p.add_argument('--pretty', action='store_true')
+    args = p.parse_args()
+
+    modes = ['python'] + (['numpy'] if targets.np is not None else [])
+    times = {'scan': [], **{m: [] for m in modes}}
+    picks, mismatched = 0, []
+    for seed in _parse_seeds(args.seeds):
+        g = Game(seed=seed)
+        maps = {m: TargetMaps(g, vectorized=(m == 'numpy')) for m in modes}
+        for _ in range(args.turns):
+            g.process_turn()
+            if g.turn % args.every:
+                continue
+            queries = [(ai, kind, ai._most_needed_resource(), a.x, a.y)
+                       for ai in g.ai if ai.n.alive
+                       for a in ai.n.armies
+                       for kind in (ATTACK, EXPAND)]
+            picks += len(queries)
+            t0 = time.perf_counter()
+            want = [_scan(*q) for q in queries]
+            times['scan'].append(time.perf_counter() - t0)
+            for m in modes:
+                t0 = time.perf_counter()
+                got = [maps[m].best(ai.n, kind, needed, x, y)
+                       for ai, kind, needed, x, y in queries]
+                times[m].append(time.perf_counter() - t0)
+                for q, a, b in zip(queries, want, got):
+                    if a != b:
+                        mismatched.append([seed, g.turn, m, q[1], q[3], q[4]])
+
+    total = {k: sum(v) for k, v in times.items()}
+    out = {
+        'map_size':   MAP_SIZE,
+        'seeds':      len(_parse_seeds(args.seeds)),
+        'picks':      picks,
+        'scan_us_per_pick': round(total['scan'] / picks * 1e6, 1),
+        **{f'{m}_us_per_pick': round(total[m] / picks * 1e6, 1) for m in modes},
+        **{f'speedup_{m}': round(total['scan'] / total[m], 2) for m in modes},
+        'mismatched_picks': mismatched,
+    }
+    sys.stdout.write(json.dumps(out, indent=2 if args.pretty else None) + '\n')
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: reference (per-tile Python) vs vectorised (NumPy) world generation.
+
+Also checks that both pipelines produce the same map for every seed timed.
+
+Run from ancient_nations/:
+    python benchmarks/bench_worldgen.py
+    python benchmarks/bench_worldgen.py --seeds 1-20 --grid arrays --pretty
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import worldgen
+from constants import *
+from world import World
+
+
+def _parse_seeds(spec):
+    if '-' in spec:
+        lo, hi = map(int, spec.split('-'))
+        return list(range(lo, hi + 1))
+    return [int(s) for s in spec.split(',')]
+
+
+def _fingerprint(w):
+    return [(t.terrain, t.elevation, t.moisture, tuple(t.deposits.values()))
+            for row in w.tiles for t in row]
+
+
+def _time(seed, grid, vectorized):
+    t0 = time.perf_counter()
+    w  = World(seed, grid=grid, vectorized=vectorized)
+    return time.perf_counter() - t0, w
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument('--seeds', default='1-10', help='Seed range a-b or list a,b,c')
+    p.add_argument('--grid', choices=World.GRID_MODES, default='objects')
+    p.add_argument('--pretty', action='store_true')
+    args = p.parse_args()
+
+    if not worldgen.available(0):
+        sys.exit('NumPy is not installed — nothing to compare.')
+
+    ref, vec, mismatched = [], [], []
+    for seed in _parse_seeds(args.seeds):
+        t_ref, w_ref = _time(seed, args.grid, False)
+        t_vec, w_vec = _time(seed, args.grid, True)
+        ref.append(t_ref)
+        vec.append(t_vec)
+        if _fingerprint(w_ref) != _fingerprint(w_vec):
+            mismatched.append(seed)
+
+    out = {
+        'map_size':      MAP_SIZE,
+        'grid':          args.grid,
+        'seeds':         len(ref),
+        'reference_ms':  {'median': round(statistics.median(ref) * 1000, 2),
+                          'min':    round(min(ref) * 1000, 2)},
+        'vectorized_ms': {'median': round(statistics.median(vec) * 1000, 2),
+                          'min':    round(min(vec) * 1000, 2)},
+        'speedup':       round(statistics.median(ref) / statistics.median(vec), 2),
+        'mismatched_seeds': mismatched,
+    }
+    sys.stdout.write(json.dumps(out, indent=2 if args.pretty else None) + '\n')
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+Benchmark suite: fixed-seed timings of the engine, with JSON baselines and
+regression gating.
+
+Benchmarks (each reports one or more metrics):
+    worldgen     World generation, uncached                       ms / world
+    turns        turns/sec over early, mid and late game windows  turns/s
+    paths        find_path and PathService search latency         p50/p90/p99 µs
+    collect      Nation.collect_resources, cached and uncached    µs / nation
+    summary      snapshot.game_summary + json.dumps               ms
+    narrative    narrative.render of a finished game              ms
+
+Run from ancient_nations/:
+    python benchmarks/suite.py run --save baseline          # write benchmarks/baselines/baseline.json
+    python benchmarks/suite.py run --compare baseline       # run, then gate against it
+    python benchmarks/suite.py run --only turns,paths --out now.json
+    python benchmarks/suite.py compare baseline.json now.json --threshold 0.15
+
+`compare` (and `run --compare`) exit 1 when any metric is worse than the
+baseline by more than --threshold (a fraction; default 0.20).  Baselines are
+machine-specific: record one before a change and compare after it on the
+same machine.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from constants import *
+
+BASELINES = Path(__file__).parent / 'baselines'
+SEED = 42
+
+
+def _metric(value, unit, better='lower'):
+    return {'value': round(value, 3), 'unit': unit, 'better': better}
+
+
+def _best(fn, repeat):
+    """Fastest of `repeat` timed calls of fn(), in seconds."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def _game(turns, seed=SEED):
+    from game import Game
+    g = Game(seed=seed)
+    for _ in range(turns):
+        g.process_turn()
+    return g
+
+
+# ── benchmarks ────────────────────────────────────────────────────────────────
+
+def bench_worldgen(repeat, quick):
+    from world import World
+    seeds = (1, 2) if quick else (1, 2, 3, 4, 5)
+    ms = statistics.median(_best(lambda s=s: World(s), repeat) for s in seeds) * 1000
+    return {'worldgen_ms': _metric(ms, 'ms')}
+
+
+def bench_turns(repeat, quick):
+    from game import Game
+    windows = ((0, 25), (100, 125), (200, 225)) if quick else \
+              ((0, 50), (200, 250), (500, 550))
+    out = {}
+    # One game per repeat; the fastest pass through each window counts.
+    best = {}
+    for _ in range(repeat):
+        g = Game(seed=SEED)
+        for name, (lo, hi) in zip(('early', 'mid', 'late'), windows):
+            while g.turn < lo:
+                g.process_turn()
+            t0 = time.perf_counter()
+            while g.turn < hi:
+                g.process_turn()
+            rate = (hi - lo) / (time.perf_counter() - t0)
+            best[name] = max(best.get(name, 0.0), rate)
+    for name in ('early', 'mid', 'late'):
+        out[f'turns_per_sec_{name}'] = _metric(best[name], 'turns/s', 'higher')
+    return out
+
+
+def bench_paths(repeat, quick):
+    from pathfinding import PathService, _route, find_path
+    g = _game(50 if quick else 150)
+    w = g.world
+    rnd = random.Random(SEED)
+    queries = [tuple(rnd.randrange(MAP_SIZE) for _ in range(4))
+               for _ in range(60 if quick else 300)]
+    paths = PathService(w)
+    grid = paths.grid()
+    out = {}
+    for name, fn in (('find_path', lambda q: find_path(w, *q)),
+                     ('path_search', lambda q: _route(grid, paths._buffers, *q))):
+        lat = []
+        for q in queries:
+            lat.append(_best(lambda: fn(q), repeat) * 1e6)
+        lat.sort()
+        for p in (50, 90, 99):
+            out[f'{name}_p{p}_us'] = _metric(lat[min(len(lat) - 1, len(lat) * p // 100)], 'µs')
+    paths.detach()
+    return out
+
+
+def bench_collect(repeat, quick):
+    g = _game(50 if quick else 200)
+    live = [n for n in g.nations if n.alive]
+    saved = [dict(n.res) for n in live]
+
+    def run(yields):
+        for n in live:
+            n.collect_resources(g.world, 1.0, yields)
+
+    def restore():
+        for n, res in zip(live, saved):
+            n.res.clear()
+            n.res.update(res)
+
+    out = {}
+    for name, yields in (('cached', g.yields), ('uncached', None)):
+        t = _best(lambda: run(yields), repeat)
+        restore()
+        out[f'collect_{name}_us'] = _metric(t / len(live) * 1e6, 'µs')
+    return out
+
+
+def bench_summary(repeat, quick):
+    from snapshot import game_summary
+    g = _game(100 if quick else 400)
+    t = _best(lambda: json.dumps(game_summary(g, log_limit=500)), repeat)
+    return {'summary_ms': _metric(t * 1000, 'ms')}
+
+
+def bench_narrative(repeat, quick):
+    import narrative
+    from engine import GameSession
+    from snapshot import battle_dict
+    s = GameSession(seed=SEED)
+    s.run_turns(100 if quick else 400)
+    state = s.snapshot(log_limit=500)
+    state['battles'] = [battle_dict(b, [n.name for n in s.game.nations])
+                        for b in s.game.battles]
+    t = _best(lambda: narrative.render(state), repeat)
+    return {'narrative_ms': _metric(t * 1000, 'ms')}
+
+
+BENCHMARKS = {
+    'worldgen':  bench_worldgen,
+    'turns':     bench_turns,
+    'paths':     bench_paths,
+    'collect':   bench_collect,
+    'summary':   bench_summary,
+    'narrative': bench_narrative,
+}
+
+
+# ── runs and comparisons ──────────────────────────────────────────────────────
+
+def run(names, repeat=3, quick=False):
+    """Run the named benchmarks; returns the results document."""
+    metrics = {}
+    for name in names:
+        metrics.update(BENCHMARKS[name](repeat, quick))
+    return {
+        'seed':     SEED,
+        'quick':    quick,
+        'repeat':   repeat,
+        'python':   platform.python_version(),
+        'machine':  platform.machine(),
+        'metrics':  metrics,
+    }
+
+
+def compare(base, new, threshold=0.20):
+    """Per-metric change from base to new results; `regressed` is True where
+    the metric got worse by more than threshold (a fraction)."""
+    rows = {}
+    for key, m in new['metrics'].items():
+        b = base['metrics'].get(key)
+        if b is None or not b['value']:
+            continue
+        change = (m['value'] - b['value']) / b['value']
+        worse  = change if m['better'] == 'lower' else -change
+        rows[key] = {'base': b['value'], 'new': m['value'], 'unit': m['unit'],
+                     'change': round(change, 4), 'regressed': worse > threshold}
+    return rows
+
+
+def _load(spec):
+    path = Path(spec)
+    if not path.suffix:
+        path = BASELINES / f'{spec}.json'
+    return json.loads(path.read_text())
+
+
+def _report(rows, threshold, pretty):
+    regressed = sorted(k for k, r in rows.items() if r['regressed'])
+    out = {'threshold': threshold, 'metrics': rows, 'regressed': regressed}
+    sys.stdout.write(json.dumps(out, indent=2 if pretty else None, ensure_ascii=False) + '\n')
+    return 1 if regressed else 0
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = p.add_subparsers(dest='command', required=True)
+
+    r = sub.add_parser('run', help='Run benchmarks')
+    r.add_argument('--only', default=None, help='Comma-separated subset: ' + ','.join(BENCHMARKS))
+    r.add_argument('--repeat', type=int, default=3, help='Timed repeats; the fastest counts')
+    r.add_argument('--quick', action='store_true', help='Smaller workloads (smoke test)')
+    r.add_argument('--out', default=None, metavar='FILE', help='Write results here')
+    r.add_argument('--save', default=None, metavar='NAME',
+                   help='Write results as benchmarks/baselines/NAME.json')
+    r.add_argument('--compare', default=None, metavar='BASELINE',
+                   help='Gate against a baseline (name or path); exit 1 on regression')
+    r.add_argument('--threshold', type=float, default=0.20)
+    r.add_argument('--pretty', action='store_true')
+
+    c = sub.add_parser('compare', help='Compare two result files')
+    c.add_argument('base', help='Baseline (name or path)')
+    c.add_argument('new',  help='New results (name or path)')
+    c.add_argument('--threshold', type=float, default=0.20)
+    c.add_argument('--pretty', action='store_true')
+    args = p.parse_args()
+
+    if args.command == 'compare':
+        sys.exit(_report(compare(_load(args.base), _load(args.new), args.threshold),
+                         args.threshold, args.pretty))
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        sys.exit(f'Unknown benchmark(s): {", ".join(unknown)}')
+    results = run(names, args.repeat, args.quick)
+    text = json.dumps(results, indent=2, ensure_ascii=False) + '\n'
+    for path in filter(None, (args.out, args.save and BASELINES / f'{args.save}.json')):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(text, encoding='utf-8')
+    if args.compare:
+        sys.exit(_report(compare(_load(args.compare), results, args.threshold),
+                         args.threshold, args.pretty))
+    sys.stdout.write(json.dumps(results, indent=2 if args.pretty else None,
+                                ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    main()
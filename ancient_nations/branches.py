@@ -0,0 +1,141 @@
+"""
+branches.py – What-if branches from one point of a game (`cli.py branch`).
+
+Replaying a seed to turn 500 for every alternate future costs 500 turns per
+branch.  Here the base session is played (or restored) once, frozen with
+GameSession.freeze(), and each variant is thawed from those bytes, altered
+and played on: N what-ifs cost N × the remaining turns.
+
+Variants are dicts; every key but `branch` is optional:
+
+    branch     label; reseeds the random streams (GameSession.fork)
+    no_events  true: no world events from here on
+    trait      {nation: trait id}   change a nation's doctrine
+    war        [[nation, nation], ...]   force these pairs into war
+
+Nations are given by index or by name prefix (as in `cli.py query --nation`).
+Variants run across a process pool like sweep.py.  Where processes start by
+fork, workers inherit the frozen base copy-on-write instead of receiving it.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+
+VARIANT_KEYS = ('branch', 'no_events', 'trait', 'war')
+
+
+def _nation(game, ref):
+    if isinstance(ref, int):
+        if 0 <= ref < len(game.nations):
+            return game.nations[ref]
+    else:
+        for n in game.nations:
+            if n.name.lower().startswith(str(ref).lower()):
+                return n
+    raise ValueError(f'no nation {ref!r}')
+
+
+def _resolve(game, variant):
+    """(trait changes [(nation, trait)], wars [(a, b)]) of a variant; raises
+    ValueError for unknown keys, nations or traits."""
+    unknown = set(variant) - set(VARIANT_KEYS)
+    if unknown:
+        raise ValueError(f'unknown variant keys: {", ".join(sorted(unknown))}')
+    traits = {t['id']: t for t in game.trait_list}
+    changes = []
+    for ref, tid in (variant.get('trait') or {}).items():
+        if tid not in traits:
+            raise ValueError(f'no trait {tid!r} (have {", ".join(traits)})')
+        changes.append((_nation(game, int(ref) if str(ref).isdigit() else ref), traits[tid]))
+    wars = []
+    for a, b in variant.get('war') or ():
+        a, b = _nation(game, a), _nation(game, b)
+        if a is b:
+            raise ValueError(f'{a.name} cannot war on itself')
+        wars.append((a, b))
+    return changes, wars
+
+
+def apply_variant(session, variant) -> None:
+    """Apply a variant's changes to session (a fresh fork) at its current turn."""
+    g, turn = session.game, session.game.turn
+    changes, wars = _resolve(g, variant)
+    if variant.get('no_events'):
+        session.disable_random_events()
+    for n, trait in changes:
+        old = n.trait or {}
+        n.trait = trait
+        n.trait_history.append({
+            'turn': turn,
+            'from_trait': old.get('name', 'Unknown'),
+            'to_trait': trait['name'],
+            'from_trait_id': old.get('id'),
+            'to_trait_id': trait['id'],
+        })
+        g.log(turn, f"[WHAT-IF] {n.name} adopts {trait['name']} doctrine", n.idx)
+    for a, b in wars:
+        if not a.at_war_with(b.idx):
+            a.declare_war(b.idx, turn)
+            b.declare_war(a.idx, turn)
+            g.log(turn, f"[WAR]  {a.name} declares WAR on {b.name}! (what-if)", a.idx)
+    what_if = {k: v for k, v in variant.items() if k != 'branch'}
+    if what_if:
+        session.options['what_if'] = [*session.options.get('what_if', ()), [turn, what_if]]
+
+
+def branch(frozen, variant, turns, log_limit=0):
+    """Thaw a variant from frozen base state and play `turns` more turns.
+
+    Returns (label, NDJSON line): {'branch': label, 'variant': ..., **game_summary}."""
+    from engine import GameSession
+    label = str(variant.get('branch', ''))
+    s = GameSession.thaw(frozen, label or None)
+    apply_variant(s, variant)
+    s.run_turns(turns)
+    return label, json.dumps({'branch': label, 'variant': variant,
+                              **s.snapshot(log_limit=log_limit)})
+
+
+# ── pool ──────────────────────────────────────────────────────────────────────
+
+_base = None     # frozen base state in each worker
+
+
+def _init_worker(frozen):
+    global _base
+    _base = frozen
+
+
+def _branch_task(task):
+    return branch(_base, *task)
+
+
+def run_branches(session, variants, turns, workers=None, log_limit=0, emit=None):
+    """Play every variant `turns` turns on from session, passing each branch's
+    line to emit(line) as it finishes.  session itself is not advanced.
+    Returns the labels in the order they finished."""
+    for v in variants:                 # fail before any worker starts
+        _resolve(session.game, v)
+    frozen = session.freeze()
+    tasks = [(v, turns, log_limit) for v in variants]
+    workers = workers or os.cpu_count() or 1
+    done = []
+
+    def _consume(results):
+        for label, line in results:
+            done.append(label)
+            if emit is not None:
+                emit(line)
+
+    if workers <= 1 or len(tasks) <= 1:
+        _consume(branch(frozen, *t) for t in tasks)
+    else:
+        # Forked workers share the base state's pages; spawned ones get a pickled copy each.
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        ctx = multiprocessing.get_context(method)
+        with ctx.Pool(min(workers, len(tasks)), _init_worker, (frozen,)) as pool:
+            _consume(pool.imap_unordered(_branch_task, tasks))
+    return done
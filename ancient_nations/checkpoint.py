@@ -0,0 +1,165 @@
+"""
+checkpoint.py – Save and restore complete simulation state.
+
+A checkpoint is the whole Game object graph: map, nations, towns, armies,
+AI controllers, event cooldowns, pending recoveries, logs, battles, and the
+per-game random streams and id sequences (Game.rng, see rng.py).  Restoring
+one and stepping on gives exactly the turns an uninterrupted run would have
+produced.
+
+File layout:
+    b'ANCP' | u16 format | u16 reserved | u32 header length | header JSON
+    (little-endian prefix), then the zlib-compressed pickle of the state.
+The header (seed, turn, session options, code digest) is readable without
+unpickling, so CheckpointStore can pick a checkpoint cheaply.
+
+The payload is a pickle: only load checkpoints this program wrote.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import pickle
+import struct
+import zlib
+from pathlib import Path
+
+from worldcache import CacheDir
+
+FORMAT_VERSION = 2
+_MAGIC  = b'ANCP'
+_PREFIX = struct.Struct('<4sHHI')
+
+_HERE = Path(__file__).parent
+
+# Save every this many turns while CheckpointStore.advance() simulates.
+CHECKPOINT_INTERVAL = 100
+
+
+class CheckpointError(ValueError):
+    """The file is not a checkpoint this build can restore."""
+
+
+@functools.cache
+def code_digest() -> str:
+    """Hash of every simulation source and data file.
+
+    Pickled objects are rebuilt against the current classes, and any rule
+    change alters later turns, so a checkpoint is only valid for the exact
+    code that wrote it.
+    """
+    h = hashlib.sha256(f'{FORMAT_VERSION}'.encode())
+    for p in sorted(_HERE.glob('*.py')) + sorted((_HERE / 'data').glob('*.json5')):
+        h.update(p.name.encode())
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def dumps(game, options=None) -> bytes:
+    """Serialise game.  options (JSON-safe) go in the header."""
+    payload = zlib.compress(pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL), 6)
+    header = {
+        'seed':    game.world.seed,
+        'turn':    game.turn,
+        'options': options or {},
+        'code':    code_digest(),
+    }
+    hbytes = json.dumps(header, separators=(',', ':')).encode()
+    return _PREFIX.pack(_MAGIC, FORMAT_VERSION, 0, len(hbytes)) + hbytes + payload
+
+
+def read_header(data) -> dict:
+    """Parse and validate the header of checkpoint bytes; raises CheckpointError."""
+    try:
+        magic, fmt, _, hlen = _PREFIX.unpack_from(data, 0)
+        header = json.loads(bytes(data[_PREFIX.size:_PREFIX.size + hlen]))
+    except (struct.error, ValueError) as e:
+        raise CheckpointError(f'not a checkpoint: {e}') from None
+    if magic != _MAGIC:
+        raise CheckpointError('not a checkpoint: bad magic')
+    if fmt != FORMAT_VERSION:
+        raise CheckpointError(f'checkpoint format {fmt}, expected {FORMAT_VERSION}')
+    if header.get('code') != code_digest():
+        raise CheckpointError('checkpoint was written by a different version of the simulation')
+    header['_offset'] = _PREFIX.size + hlen
+    return header
+
+
+def loads(data):
+    """Rebuild (game, header) from checkpoint bytes."""
+    header = read_header(data)
+    try:
+        game = pickle.loads(zlib.decompress(data[header.pop('_offset'):]))
+    except (zlib.error, pickle.UnpicklingError, EOFError) as e:
+        raise CheckpointError(f'corrupt checkpoint: {e}') from None
+    return game, header
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+class CheckpointStore(CacheDir):
+    """LRU-capped directory of checkpoints, keyed by seed and session options.
+
+    Files are named <key>-<turn>.ckpt, where key hashes the seed, the options
+    and the code digest, so stale checkpoints are never matched and age out.
+    """
+
+    KIND   = 'checkpoints'
+    SUFFIX = '.ckpt'
+
+    def key(self, seed, options) -> str:
+        blob = json.dumps([seed, options, code_digest()], sort_keys=True)
+        return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+    def _file(self, seed, options, turn) -> Path:
+        return self.path / f'{self.key(seed, options)}-{turn:07d}{self.SUFFIX}'
+
+    def turns(self, seed, options):
+        """Sorted turns with a stored checkpoint for (seed, options)."""
+        out = []
+        for p in self.path.glob(f'{self.key(seed, options)}-*{self.SUFFIX}'):
+            try:
+                out.append(int(p.stem.rsplit('-', 1)[1]))
+            except ValueError:
+                continue
+        return sorted(out)
+
+    def save(self, session, options) -> bool:
+        g = session.game
+        return self._write(self._file(g.world.seed, options, g.turn),
+                           [dumps(g, options)])
+
+    def nearest(self, seed, turn, options):
+        """Restore the latest checkpoint at or before turn, or None.
+
+        Unreadable or stale files are deleted and the next-older one is tried.
+        """
+        from engine import GameSession   # local import — engine imports this module
+        for t in reversed(self.turns(seed, options)):
+            if t > turn:
+                continue
+            f = self._file(seed, options, t)
+            try:
+                data = f.read_bytes()
+                session = GameSession.from_checkpoint(data)
+            except (OSError, CheckpointError):
+                self._discard(f)
+                continue
+            self._touch(f)
+            return session
+        return None
+
+    def advance(self, seed, turn, options, open_session):
+        """Return a session at turn, resuming from the nearest checkpoint.
+
+        open_session() builds a fresh session when none applies.  While
+        simulating, a checkpoint is saved every CHECKPOINT_INTERVAL turns and
+        at turn itself.
+        """
+        s = self.nearest(seed, turn, options) or open_session()
+        while s.game.turn < turn:
+            stop = min(turn, (s.game.turn // CHECKPOINT_INTERVAL + 1) * CHECKPOINT_INTERVAL)
+            s.run_turns(stop - s.game.turn)
+            self.save(s, options)
+        return s
@@ -15,8 +15,17 @@ Usage
   python cli.py query --seed 42 --turns 800 --events --from 600   # events with turn >= 600
   python cli.py stream --seed 42 --turns 50            # NDJSON one line per turn
   python cli.py stream --seed 42 --turns 200 --from 150   # only emit turns >= 150
+  python cli.py stream --seed 42 --turns 50 --profile  # + per-turn phase timings
+  python cli.py stream --seed 42 --turns 1000 --delta  # keyframes + per-turn diffs (python delta.py decodes)
+  python cli.py profile --seed 42 --turns 400          # turn-phase / per-nation timings
   python cli.py battles --seed 42 --turns 200
+  python cli.py battles --seed 42 --turns 400 --nation Romanus --from 300   # filtered by nation/region/turns
   python cli.py map    --seed 42              # ASCII map: no turns simulated unless --turns set
+  python cli.py export --seed 42 --turns 1000 --out run42/   # columnar tables (Arrow/Parquet/npz)
+  python cli.py sweep  --seeds 1-5000 --turns 1000 --workers 8 --out sweep.ndjson
+  python cli.py branch --seed 42 --turns 500 --then 200 --variants variants.json   # what-ifs from turn 500
+  python cli.py serve  --socket /tmp/an.sock    # resident sessions over JSON-RPC (see server.py)
+  python cli.py serve  --port 8765
 
 `run` defaults to JSON; use `--format narrative` for plain-text chronicle output.
 Other commands write JSON (or NDJSON for `stream`) to stdout unless noted.
@@ -27,149 +36,185 @@ import argparse
 import json
 import sys
 import math
+import time
 from engine import GameSession
 from constants import *
-from snapshot import army_dict, battle_dict, nation_dict, tile_dict
+from snapshot import (QueryError, battle_dict, events_query, nation_query, region_query,
+                      tile_query)
+from worldcache import WorldCache
+from checkpoint import CheckpointStore
+from profiler import TurnProfiler
+from delta import DeltaEncoder
+from serialize import ENCODERS, Rows, available, write
 
 
 # ── Session helper ────────────────────────────────────────────────────────────
 
+def _cache_created(path):
+    # Caching is on by default for explicit seeds; say so the first time it writes.
+    print(f'cli.py: created cache {path} (--no-cache skips it; safe to delete)',
+          file=sys.stderr)
+
+
 def _open_session(args) -> GameSession:
-    s = GameSession(seed=args.seed, num_nations=args.nations)
+    # Only explicit seeds are worth caching — random ones are never asked for again.
+    cache = None
+    if args.seed is not None and not getattr(args, 'no_cache', False):
+        cache = WorldCache(on_create=_cache_created)
+    s = GameSession(seed=args.seed, num_nations=args.nations, grid=args.grid,
+                    world_cache=cache, path_workers=getattr(args, 'path_workers', 0))
     if getattr(args, 'no_events', False):
         s.disable_random_events()
     return s
 
 
+def _session_at(args, turn) -> GameSession:
+    """Session advanced to `turn`, resumed from the nearest on-disk checkpoint.
+
+    Like the world cache, checkpoints are only kept for explicit seeds; the
+    simulated stretch is checkpointed for the next invocation.
+    """
+    if args.seed is None or getattr(args, 'no_cache', False) or turn <= 0:
+        s = _open_session(args)
+        s.run_turns(turn)
+        return s
+    options = {'nations': args.nations, 'grid': args.grid,
+               'no_events': bool(getattr(args, 'no_events', False))}
+    store = CheckpointStore(on_create=_cache_created)
+    s = store.advance(args.seed, turn, options, lambda: _open_session(args))
+    if getattr(args, 'path_workers', 0) and s.game.paths.executor is None:
+        s.game.paths.use_workers(args.path_workers)   # pools are not checkpointed
+    return s
+
+
 # ── Commands ──────────────────────────────────────────────────────────────────
 
 def cmd_run(args):
     """Run N turns and print final state summary."""
-    s = _open_session(args)
-    s.run_turns(args.turns)
+    s = _session_at(args, args.turns)
     g = s.game
 
     log_limit = max(1, min(args.log_limit, min(10_000, LOG_MAX)))
-    out = s.snapshot(log_limit=log_limit)
-    out['battles'] = [battle_dict(b, [n.name for n in g.nations]) for b in g.battles]
+    names = [n.name for n in g.nations]
 
     if getattr(args, 'format', 'json') == 'narrative':
         import narrative
+        out = s.snapshot(log_limit=log_limit)
+        out['battles'] = [battle_dict(b, names) for b in g.battles]
         sys.stdout.write(narrative.render(out) + '\n')
     else:
-        _print(out, args.pretty)
+        # Events, logs and battles are converted as they are written.
+        out = s.snapshot(log_limit=log_limit, lazy=True)
+        out['battles'] = Rows(g.battles, lambda b: battle_dict(b, names))
+        _print(out, args.pretty, args.encoder)
 
 
 def cmd_query(args):
     """Query specific aspect of game state after N turns."""
-    s = _open_session(args)
-    s.run_turns(args.turns)
+    s = _session_at(args, args.turns)
     g = s.game
 
     from_turn = getattr(args, 'from_turn', None)
-
-    if args.tile:
-        x, y = map(int, args.tile.split(','))
-        if not g.world.in_bounds(x, y):
-            _error({'error': f'Tile ({x},{y}) out of bounds'}, args.pretty)
-            return
-        _print(tile_dict(g.world.t(x, y), g), args.pretty)
-
-    elif args.nation:
-        match = [n for n in g.nations
-                 if n.name.lower().startswith(args.nation.lower())]
-        if not match:
-            _error({'error': f'Nation "{args.nation}" not found'}, args.pretty)
-            return
-        n   = match[0]
-        out = nation_dict(n, g.turn)
-        out['wars_with'] = [o.name for o in g.nations
-                            if o.idx != n.idx and n.at_war_with(o.idx)]
-        # History arrays
-        out['history'] = n.history
-        # All armies
-        out['army_details'] = [army_dict(a, [x.name for x in g.nations])
-                                for a in n.armies if a.is_alive()]
-        _print(out, args.pretty)
-
-    elif args.region:
-        ox, oy = map(int, args.region.split(','))
-        if not (0 <= ox < OUTER_SIZE and 0 <= oy < OUTER_SIZE):
-            _error({'error': f'Region ({ox},{oy}) out of bounds (0-{OUTER_SIZE-1})'}, args.pretty)
-            return
-        tiles = g.world.outer_region(ox, oy)
-        # Summarise ownership
-        owner_counts = {}
-        terrain_counts = {}
-        for t in tiles:
-            owner = g.nations[t.owner].name if t.owner >= 0 else 'Neutral'
-            owner_counts[owner] = owner_counts.get(owner, 0) + 1
-            tn = TERRAIN_NAMES[t.terrain]
-            terrain_counts[tn] = terrain_counts.get(tn, 0) + 1
-        towns_in_region = [tile_dict(t, g) for t in tiles if t.town]
-        armies_in_region = [army_dict(a, [n.name for n in g.nations])
-                            for t in tiles for a in t.armies]
-        _print({
-            'region':          [ox, oy],
-            'turn':            g.turn,
-            'ownership':       owner_counts,
-            'terrain_types':   terrain_counts,
-            'towns':           towns_in_region,
-            'armies':          armies_in_region,
-            'tile_details':    [tile_dict(t, g) for t in tiles],
-        }, args.pretty)
-
-    elif args.events:
-        ev = g.events_history
-        if from_turn is not None:
-            ev = [e for e in ev if e.turn >= from_turn]
-        _print({
-            'turn':   g.turn,
-            'events': [e.to_dict() for e in ev],
-        }, args.pretty)
-
-    else:
-        # Default: full summary
-        out = s.snapshot()
-        if from_turn is not None:
-            out['events'] = [e for e in out['events'] if e['turn'] >= from_turn]
-            out['events_total'] = len(out['events'])
-        _print(out, args.pretty)
+    try:
+        if args.tile:
+            out = tile_query(g, *map(int, args.tile.split(',')))
+        elif args.nation:
+            out = nation_query(g, args.nation)
+        elif args.region:
+            out = region_query(g, *map(int, args.region.split(',')), lazy=True)
+        elif args.events:
+            out = events_query(g, from_turn, lazy=True)
+        else:
+            # Default: full summary
+            out = s.snapshot(lazy=True)
+            if from_turn is not None:
+                out['events'] = events_query(g, from_turn, lazy=True)['events']
+                out['events_total'] = len(out['events'])
+    except QueryError as e:
+        _error({'error': str(e)}, args.pretty)
+        return
+    _print(out, args.pretty, args.encoder)
 
 
 def cmd_stream(args):
     """Run turn by turn, emitting one JSON line per turn (NDJSON)."""
-    s = _open_session(args)
-    g = s.game
     from_turn = getattr(args, 'from_turn', None)
-    for _ in range(args.turns):
+    # Turns before --from are never emitted, so start from a checkpoint if one fits.
+    s = _session_at(args, min(args.turns, (from_turn or 1) - 1))
+    g = s.game
+    prof = TurnProfiler().attach(g) if args.profile else None
+    enc  = None
+    while g.turn < args.turns:
         s.step()
         if from_turn is not None and g.turn < from_turn:
             continue
-        line = json.dumps(s.turn_snapshot())
+        snap = s.turn_snapshot()
+        if prof:
+            snap['profile'] = prof.turn_dict()
+        if args.delta:
+            # Created at the first emitted turn, so that line is a keyframe.
+            enc = enc or DeltaEncoder(g, args.keyframe)
+            snap = enc.encode(snap)
+        line = json.dumps(snap)
         sys.stdout.write(line + '\n')
         sys.stdout.flush()
+    if enc:
+        enc.close()
 
 
-def cmd_battles(args):
-    """Run N turns and print the full battle log."""
+def cmd_profile(args):
+    """Run N turns under the turn profiler; JSON totals or folded stacks."""
+    # Always simulate from turn 0: a checkpoint would skip the turns to measure.
     s = _open_session(args)
+    prof = TurnProfiler().attach(s.game)
+    t0 = time.perf_counter()
     s.run_turns(args.turns)
+    wall = time.perf_counter() - t0
+    prof.detach()
+    if args.format == 'folded':
+        sys.stdout.write(prof.folded())
+        sys.stdout.flush()
+        return
+    _print({
+        'seed':     s.game.world.seed,
+        'map_size': MAP_SIZE,
+        'wall_ms':  round(wall * 1000, 3),
+        **prof.summary(),
+    }, args.pretty)
+
+
+def cmd_battles(args):
+    """Run N turns and print the full battle log."""
+    s = _session_at(args, args.turns)
     g = s.game
 
     nation_names = [n.name for n in g.nations]
+    lo, hi = args.from_turn, args.to_turn
+    region = tuple(map(int, args.region.split(','))) if args.region else None
+    if args.nation:
+        match = [n for n in g.nations if n.name.lower().startswith(args.nation.lower())]
+        if not match:
+            _error({'error': f'Nation "{args.nation}" not found'}, args.pretty)
+            return
+        battles = g.battles.for_nation(match[0].idx, lo, hi)
+        if region:
+            battles = [b for b in battles
+                       if (b.x // INNER_SIZE, b.y // INNER_SIZE) == region]
+    elif region:
+        battles = g.battles.in_region(*region, lo, hi)
+    else:
+        battles = g.battles.between(lo, hi)
     _print({
         'turn':    g.turn,
         'seed':    g.world.seed,
-        'count':   len(g.battles),
-        'battles': [battle_dict(b, nation_names) for b in g.battles],
-    }, args.pretty)
+        'count':   len(battles),
+        'battles': Rows(battles, lambda b: battle_dict(b, nation_names)),
+    }, args.pretty, args.encoder)
 
 
 def cmd_map(args):
     """Generate world and dump ASCII map + terrain/resource summary (no simulation)."""
-    s = _open_session(args)
-    s.run_turns(args.turns)
+    s = _session_at(args, args.turns)
     g = s.game
 
     w  = g.world
@@ -206,12 +251,12 @@ def cmd_map(args):
 
 def cmd_summary(args):
     """Run simulation and emit a compact human-readable summary for sharing."""
-    s = _open_session(args)
-    s.run_turns(args.turns)
+    s = _session_at(args, args.turns)
     g = s.game
 
     out   = s.snapshot()
-    out['battles'] = [battle_dict(b, [n.name for n in g.nations]) for b in g.battles]
+    names = [n.name for n in g.nations]
+    out['battles'] = [battle_dict(b, names) for b in g.battles]
 
     nations  = out['nations']
     battles  = out['battles']
@@ -257,9 +302,110 @@ def cmd_summary(args):
     sys.stdout.flush()
 
 
+def cmd_export(args):
+    """Run N turns, writing per-turn columnar tables (see export.py)."""
+    import export
+    fmt = args.format or export.default_format()
+    if fmt is None or not export.available(fmt):
+        need = 'pyarrow' if fmt in ('arrow', 'parquet') else 'numpy or pyarrow'
+        _error({'error': f'export needs {need}'}, args.pretty)
+    # Every turn is recorded, so always simulate from turn 0.
+    s = _open_session(args)
+    g = s.game
+    exp = export.RunExporter(g, args.out, fmt, batch=args.batch)
+    while g.turn < args.turns:
+        s.step()
+        exp.record()
+    _print({'out': str(args.out), **exp.close()}, args.pretty)
+
+
+def cmd_serve(args):
+    """Keep sessions resident behind a local JSON-RPC server until interrupted."""
+    import os
+    import server
+    pool = server.SessionPool(args.max_sessions, args.idle, cache=not args.no_cache)
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)            # stale socket from an earlier server
+        srv, address = server.UnixRPCServer(args.socket, pool), f'unix:{args.socket}'
+    else:
+        srv = server.HTTPRPCServer((args.host, args.port), pool)
+        address = f'http://{args.host}:{srv.server_address[1]}'
+    _print({'serving': address, 'methods': sorted(server.METHODS)})
+    try:
+        srv.serve_forever(poll_interval=1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+def cmd_sweep(args):
+    """Run many seeds across a process pool; NDJSON per seed, then one aggregate line."""
+    import sweep
+    try:
+        seeds = sweep.parse_seeds(args.seeds)
+    except ValueError as e:
+        _error({'error': f'Bad --seeds: {e}'}, args.pretty)
+    params = {
+        'turns':     args.turns,
+        'nations':   args.nations,
+        'grid':      args.grid,
+        'no_events': args.no_events,
+        'no_cache':  args.no_cache,
+        'log_limit': max(0, args.log_limit),
+    }
+
+    def emit(line):
+        sys.stdout.write(line + '\n')
+        sys.stdout.flush()
+
+    try:
+        result = sweep.run_sweep(seeds, params, workers=args.workers, out=args.out, emit=emit)
+    except ValueError as e:   # --out belongs to a sweep with other parameters
+        _error({'error': str(e)}, args.pretty)
+    _print({'aggregate': result}, args.pretty)
+
+
+def cmd_branch(args):
+    """Play to --turns once, then every variant --then turns on; NDJSON per branch."""
+    import branches
+    spec = args.variants
+    try:
+        if not spec.lstrip().startswith('['):
+            with open(spec, encoding='utf-8') as fh:
+                spec = fh.read()
+        variants = json.loads(spec)
+        if not isinstance(variants, list) or not all(isinstance(v, dict) for v in variants):
+            raise ValueError('--variants must be a JSON list of objects')
+    except (OSError, ValueError) as e:
+        _error({'error': f'Bad --variants: {e}'}, args.pretty)
+    s = _session_at(args, args.turns)
+
+    def emit(line):
+        sys.stdout.write(line + '\n')
+        sys.stdout.flush()
+
+    try:
+        done = branches.run_branches(s, variants, args.then, workers=args.workers,
+                                     log_limit=max(0, args.log_limit), emit=emit)
+    except ValueError as e:
+        _error({'error': str(e)}, args.pretty)
+    _print({'base_turn': s.game.turn, 'then': args.then, 'branches': done}, args.pretty)
+
+
 # ── Utilities ─────────────────────────────────────────────────────────────────
 
-def _print(obj, pretty=False):
+def _print(obj, pretty=False, encoder='json'):
+    if not available(encoder):
+        _error({'error': f'--encoder {encoder}: the {encoder} package is not installed'}, pretty)
+    if encoder != 'json' or _streams(obj):
+        sys.stdout.flush()
+        write(sys.stdout.buffer, obj, encoder, pretty)
+        sys.stdout.buffer.flush()
+        return
     if pretty:
         sys.stdout.write(json.dumps(obj, indent=2) + '\n')
     else:
@@ -267,6 +413,10 @@ def _print(obj, pretty=False):
     sys.stdout.flush()
 
 
+def _streams(obj):
+    return isinstance(obj, dict) and any(isinstance(v, Rows) for v in obj.values())
+
+
 def _error(obj, pretty=False):
     """Print an error dict and exit with non-zero status."""
     _print(obj, pretty)
@@ -289,16 +439,29 @@ def build_parser():
     shared.add_argument('--nations', type=int, default=NUM_NATIONS, help='Number of nations')
     shared.add_argument('--pretty',  action='store_true',          help='Pretty-print JSON')
     shared.add_argument('--no-events', action='store_true',        help='Disable random world events')
+    shared.add_argument('--grid', choices=['objects', 'arrays'], default='objects',
+                        help='Map storage: Tile objects (default) or flat typed arrays')
+    shared.add_argument('--no-cache', action='store_true',
+                        help='Ignore the on-disk world cache and simulation checkpoints')
+    shared.add_argument('--path-workers', type=int, default=0, dest='path_workers',
+                        help='Worker processes for army route searches (default 0: in-process; '
+                             'results are identical)')
+
+    # Output encoder for the commands with large responses
+    encoded = argparse.ArgumentParser(add_help=False)
+    encoded.add_argument('--encoder', choices=ENCODERS, default='json',
+                         help='json (default), orjson, or msgpack (binary); '
+                              'orjson and msgpack are optional packages')
 
     # run
-    sp = sub.add_parser('run', parents=[shared], help='Run simulation and print final state')
+    sp = sub.add_parser('run', parents=[shared, encoded], help='Run simulation and print final state')
     sp.add_argument('--format', choices=['json', 'narrative'], default='json',
                     help='Output format (default: json)')
     sp.add_argument('--log-limit', type=int, default=50, dest='log_limit',
                     help='Max log entries in output (default 50; sim only retains up to LOG_MAX lines in memory)')
 
     # query
-    sq = sub.add_parser('query', parents=[shared], help='Query a specific aspect of state')
+    sq = sub.add_parser('query', parents=[shared, encoded], help='Query a specific aspect of state')
     sq.add_argument('--tile',    type=str, help='Tile coordinates x,y')
     sq.add_argument('--nation',  type=str, help='Nation name (prefix match)')
     sq.add_argument('--region',  type=str, help='Outer region ox,oy')
@@ -310,19 +473,91 @@ def build_parser():
     st = sub.add_parser('stream', parents=[shared],
                         help='Emit one JSON line per turn (NDJSON)')
     st.add_argument('--from', dest='from_turn', type=int, default=None, metavar='T',
-                    help='Only emit lines for turns >= T (full sim still runs from start)')
+                    help='Only emit lines for turns >= T (earlier turns resume from a checkpoint when one exists)')
+    st.add_argument('--profile', action='store_true',
+                    help='Add a "profile" field: milliseconds per turn phase')
+    st.add_argument('--delta', action='store_true',
+                    help='Keyframes plus per-turn diffs (see delta.py; decode with python delta.py)')
+    st.add_argument('--keyframe', type=int, default=50, metavar='K',
+                    help='With --delta: a full keyframe every K lines (default 50)')
+
+    # profile
+    sf = sub.add_parser('profile', parents=[shared],
+                        help='Time turn phases, nations and hot helpers')
+    sf.add_argument('--format', choices=['json', 'folded'], default='json',
+                    help='JSON totals (default) or folded stacks for flamegraph tools')
 
     # summary
     sub.add_parser('summary', parents=[shared],
                    help='Compact human-readable summary — standings, deaths, notable events')
 
     # battles
-    sub.add_parser('battles', parents=[shared], help='Print full battle log')
+    sb = sub.add_parser('battles', parents=[shared, encoded], help='Print full battle log')
+    sb.add_argument('--nation', type=str, help='Only battles this nation (prefix match) fought')
+    sb.add_argument('--region', type=str, help='Only battles in outer region ox,oy')
+    sb.add_argument('--from', dest='from_turn', type=int, default=None, metavar='T',
+                    help='Only battles with turn >= T')
+    sb.add_argument('--to', dest='to_turn', type=int, default=None, metavar='T',
+                    help='Only battles with turn <= T')
 
     # map
     sm = sub.add_parser('map', parents=[shared], help='Print ASCII map and terrain info')
     sm.set_defaults(turns=0)
 
+    # export
+    se = sub.add_parser('export', parents=[shared],
+                        help='Write the whole run as columnar files (Arrow / Parquet / npz)')
+    se.add_argument('--out', required=True, metavar='DIR', help='Output directory')
+    se.add_argument('--format', choices=['arrow', 'parquet', 'npz'], default=None,
+                    help='Default: arrow when pyarrow is installed, else npz (NumPy)')
+    se.add_argument('--batch', type=int, default=50, metavar='N',
+                    help='Turns buffered per write (default 50)')
+
+    # sweep — own flags: many seeds instead of one
+    sw = sub.add_parser('sweep', help='Run many seeds in parallel and aggregate statistics')
+    sw.add_argument('--seeds',   type=str, required=True, help='Seeds: 1-5000, 3,7,9 or a mix')
+    sw.add_argument('--turns',   type=int, default=100,        help='Turns per game')
+    sw.add_argument('--nations', type=int, default=NUM_NATIONS, help='Number of nations')
+    sw.add_argument('--workers', type=int, default=None,
+                    help='Worker processes (default: CPU count; 1 runs in-process)')
+    sw.add_argument('--out',     type=str, default=None, metavar='FILE',
+                    help='Append per-seed NDJSON here instead of stdout; re-running resumes')
+    sw.add_argument('--log-limit', type=int, default=0, dest='log_limit',
+                    help='Log entries kept in each per-seed summary (default 0)')
+    sw.add_argument('--pretty',  action='store_true',          help='Pretty-print the aggregate')
+    sw.add_argument('--no-events', action='store_true',        help='Disable random world events')
+    sw.add_argument('--grid', choices=['objects', 'arrays'], default='objects',
+                    help='Map storage: Tile objects (default) or flat typed arrays')
+    sw.add_argument('--no-cache', action='store_true',
+                    help='Regenerate worlds instead of using the on-disk world cache')
+
+    # branch
+    sr = sub.add_parser('branch', parents=[shared],
+                        help='Play to --turns once, then many what-if variants from there')
+    sr.add_argument('--variants', required=True, metavar='FILE|JSON',
+                    help='JSON list of variants (see branches.py), inline or in a file')
+    sr.add_argument('--then', type=int, default=100, metavar='N',
+                    help='Turns each branch plays after the branch point (default 100)')
+    sr.add_argument('--workers', type=int, default=None,
+                    help='Worker processes (default: CPU count; 1 runs in-process)')
+    sr.add_argument('--log-limit', type=int, default=0, dest='log_limit',
+                    help='Log entries kept in each branch summary (default 0)')
+
+    # serve — sessions are opened by clients, so no game flags here
+    sv = sub.add_parser('serve', help='Keep sessions resident behind a local JSON-RPC server')
+    where = sv.add_mutually_exclusive_group()
+    where.add_argument('--socket', type=str, default=None, metavar='PATH',
+                       help='Serve newline-delimited JSON-RPC on this Unix socket')
+    where.add_argument('--port', type=int, default=8765,
+                       help='Serve JSON-RPC over HTTP POST on this port (default 8765; 0 picks one)')
+    sv.add_argument('--host', type=str, default='127.0.0.1', help='HTTP bind address')
+    sv.add_argument('--max-sessions', type=int, default=8, dest='max_sessions',
+                    help='Sessions kept; the least recently used is dropped (default 8)')
+    sv.add_argument('--idle', type=float, default=600.0, metavar='SECONDS',
+                    help='Drop sessions unused this long (default 600)')
+    sv.add_argument('--no-cache', action='store_true',
+                    help='Ignore the on-disk world cache and simulation checkpoints')
+
     return p
 
 
@@ -338,9 +573,14 @@ def main():
         'run':     cmd_run,
         'query':   cmd_query,
         'stream':  cmd_stream,
+        'profile': cmd_profile,
         'summary': cmd_summary,
         'battles': cmd_battles,
         'map':     cmd_map,
+        'export':  cmd_export,
+        'sweep':   cmd_sweep,
+        'branch':  cmd_branch,
+        'serve':   cmd_serve,
     }
     dispatch[args.command](args)
 
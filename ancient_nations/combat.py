@@ -1,7 +1,6 @@
 """
 combat.py – RISK-style dice combat resolution.
 """
-import random
 import math
 from constants import *
 from entities import Battle
@@ -9,11 +8,11 @@ from entities import Battle
 
 DICE_SIDES = 6
 
-def roll_dice(n, sides=DICE_SIDES):
-    return sorted([random.randint(1, sides) for _ in range(n)], reverse=True)
+def roll_dice(rng, n, sides=DICE_SIDES):
+    return sorted([rng.randint(1, sides) for _ in range(n)], reverse=True)
 
 
-def resolve_battle(attacker, defender, def_tile, turn, log_fn,
+def resolve_battle(attacker, defender, def_tile, turn, log_fn, rng,
                    atk_surge=False, tier4_def=False,
                    atk_trait_dice=0, def_trait_dice=0,
                    nations=None):
@@ -21,6 +20,7 @@ def resolve_battle(attacker, defender, def_tile, turn, log_fn,
     Resolve a battle between two armies.
     Returns (winner, battle_record).
     defender may be None (neutral tile conquest).
+    rng is the game's combat stream (a random.Random) used for all dice.
 
     atk_surge      – attacker gets +1 die (post-betrayal surge bonus)
     tier4_def      – defender gets +1 die (Tier-4 alliance joint-command bonus)
@@ -59,8 +59,8 @@ def resolve_battle(attacker, defender, def_tile, turn, log_fn,
     rounds = max(attacker.level, defender.level if defender else 1)
 
     for _ in range(rounds):
-        ar = roll_dice(atk_dice)
-        dr = roll_dice(def_dice)
+        ar = roll_dice(rng, atk_dice)
+        dr = roll_dice(rng, def_dice)
         pairs = min(len(ar), len(dr))
         for i in range(pairs):
             if ar[i] > dr[i]:
@@ -154,6 +154,7 @@ MIN_NATION_DISTANCE = _b['MIN_NATION_DISTANCE']
 LOG_MAX        = _b['LOG_MAX']
 BATTLE_LOG_MAX = 100
 CHART_HISTORY  = _b['CHART_HISTORY']
+HISTORY_ARCHIVE = _b['HISTORY_ARCHIVE']
 TURN_DELAY     = _b['TURN_DELAY']
 WINDOW_WIDTH   = _b['WINDOW_WIDTH']
 WINDOW_HEIGHT  = _b['WINDOW_HEIGHT']
@@ -0,0 +1,187 @@
+"""
+delta.py – Delta-encoded stream lines (`cli.py stream --delta`) and their decoder.
+
+A plain stream line is a full snapshot.turn_summary.  In delta mode the
+first line, and every `keyframe`-th turn after it, is a keyframe; the lines
+between carry only what changed since the previous line:
+
+    keyframe  {"frame": "key", "turn", "map_size", "nations": [row, ...],
+               "battles_this_turn", "events_this_turn",
+               "owners": [[owner, count], ...]}
+    delta     {"frame": "delta", "turn",
+               "nations": {"<idx>": {changed fields}},
+               "dropped": {"<idx>": [keys no longer on the row]},   (only if any)
+               "battles_this_turn", "events_this_turn",
+               "owners": [[start, count, owner], ...]}
+
+Nation rows are exactly turn_summary's.  Tile ownership uses row-major tile
+numbers (y * map_size + x) and owner -1 for unclaimed: a keyframe
+run-length encodes the whole map, a delta lists spans of consecutive
+changed tiles that now share an owner.  A "profile" field, when streamed,
+is passed through unchanged.
+
+DeltaDecoder needs nothing from the game: feed it the lines in order and it
+returns the full turn_summary frames (and keeps the ownership map).
+
+    python delta.py < run.delta.ndjson > run.ndjson     # expand to plain lines
+"""
+import copy
+import json
+import sys
+
+def _owner_runs(owners):
+    runs = []
+    for o in owners:
+        if runs and runs[-1][0] == o:
+            runs[-1][1] += 1
+        else:
+            runs.append([o, 1])
+    return runs
+
+
+def _change_spans(changes):
+    """[(tile number, owner)] sorted by tile -> [[start, count, owner]]."""
+    spans = []
+    for i, o in changes:
+        last = spans[-1] if spans else None
+        if last and last[0] + last[1] == i and last[2] == o:
+            last[1] += 1
+        else:
+            spans.append([i, 1, o])
+    return spans
+
+
+class DeltaEncoder:
+    """Turns a game's turn_summary frames into keyframe / delta lines.
+
+    Follows the world's ownership journal (World.set_tile_owner) from
+    creation; call close() when done to stop following it.
+    """
+
+    def __init__(self, game, keyframe=50):
+        self.world    = game.world
+        self.keyframe = max(1, keyframe)
+        self.size     = len(self.world.tiles)
+        self._owned   = set()
+        self.world.owner_watchers.append(self._owned)
+        self._owners  = None        # ownership as of the previous line
+        self._rows    = None        # nation rows of the previous line
+        self._since   = 0           # lines since the last keyframe
+
+    def close(self):
+        self.world.unwatch(self._owned)
+
+    def encode(self, frame):
+        """Encode one turn_summary (plus optional 'profile') as a line dict."""
+        rows = frame['nations']
+        if (self._rows is None or len(rows) != len(self._rows)
+                or self._since >= self.keyframe):
+            out = self._key(frame)
+        else:
+            out = self._delta(frame)
+        self._rows = rows
+        if 'profile' in frame:
+            out['profile'] = frame['profile']
+        return out
+
+    def _key(self, frame):
+        self._owners = self.world.owners()
+        self._owned.clear()
+        self._since = 1
+        return {
+            'frame':             'key',
+            'turn':              frame['turn'],
+            'map_size':          self.size,
+            'nations':           frame['nations'],
+            'battles_this_turn': frame['battles_this_turn'],
+            'events_this_turn':  frame['events_this_turn'],
+            'owners':            _owner_runs(self._owners),
+        }
+
+    def _delta(self, frame):
+        nations, dropped = {}, {}
+        for i, (old, new) in enumerate(zip(self._rows, frame['nations'])):
+            changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+            if changed:
+                nations[str(i)] = changed
+            gone = [k for k in old if k not in new]
+            if gone:
+                dropped[str(i)] = gone
+
+        size, tiles, owners = self.size, self.world.tiles, self._owners
+        changes = []
+        for x, y in sorted(self._owned, key=lambda xy: (xy[1], xy[0])):
+            o = tiles[y][x].owner
+            i = y * size + x
+            if owners[i] != o:
+                owners[i] = o
+                changes.append((i, o))
+        self._owned.clear()
+        self._since += 1
+
+        out = {'frame': 'delta', 'turn': frame['turn'], 'nations': nations}
+        if dropped:
+            out['dropped'] = dropped
+        out['battles_this_turn'] = frame['battles_this_turn']
+        out['events_this_turn']  = frame['events_this_turn']
+        out['owners'] = _change_spans(changes)
+        return out
+
+
+class DeltaDecoder:
+    """Rebuilds full turn_summary frames from keyframe / delta lines."""
+
+    def __init__(self):
+        self.rows     = None
+        self.owners   = None        # row-major tile owners after the last line
+        self.map_size = None
+
+    def feed(self, line):
+        """Decode one line (str or parsed dict); returns the full frame."""
+        if isinstance(line, str):
+            line = json.loads(line)
+        kind = line.get('frame')
+        if kind == 'key':
+            self.map_size = line['map_size']
+            self.rows = copy.deepcopy(line['nations'])
+            self.owners = []
+            for o, count in line['owners']:
+                self.owners.extend([o] * count)
+        elif kind == 'delta':
+            if self.rows is None:
+                raise ValueError('delta line before the first keyframe')
+            for i, changed in line['nations'].items():
+                self.rows[int(i)].update(copy.deepcopy(changed))
+            for i, keys in line.get('dropped', {}).items():
+                for k in keys:
+                    self.rows[int(i)].pop(k, None)
+            owners = self.owners
+            for start, count, o in line['owners']:
+                owners[start:start + count] = [o] * count
+        else:
+            raise ValueError(f'not a delta stream line: frame={kind!r}')
+        frame = {
+            'turn':              line['turn'],
+            'nations':           copy.deepcopy(self.rows),
+            'battles_this_turn': line['battles_this_turn'],
+            'events_this_turn':  line['events_this_turn'],
+        }
+        if 'profile' in line:
+            frame['profile'] = line['profile']
+        return frame
+
+    def owner(self, x, y):
+        return self.owners[y * self.map_size + x]
+
+
+def decode(lines):
+    """Yield full frames for an iterable of delta stream lines."""
+    dec = DeltaDecoder()
+    for line in lines:
+        if line.strip():
+            yield dec.feed(line)
+
+
+if __name__ == '__main__':
+    for frame in decode(sys.stdin):
+        sys.stdout.write(json.dumps(frame) + '\n')
@@ -0,0 +1,85 @@
+"""
+driver.py – asyncio driver that plays a GameSession off the event loop.
+
+Turns run in one worker thread (run_in_executor), so the event loop behind
+a TUI or a client stays free while a slow late-game turn is computed.
+Playback follows the session's flags: nothing runs while session.paused,
+otherwise one turn starts every session.speed seconds (start to start, so a
+turn slower than the delay is followed at once by the next).
+
+Nothing polls.  `changed` is set after every turn and by notify() (a key
+press, a view change); consumers await wait_changed().  Call wake() after
+changing session.paused or session.speed so the wait for the next turn is
+recomputed.
+
+Between turns the game is quiescent.  While `stepping`, readers on the
+loop thread may see a turn half-applied; the `changed` that ends the turn
+tells them to read again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SessionDriver:
+    """Steps one GameSession in a worker thread on behalf of an event loop."""
+
+    def __init__(self, session):
+        self.session   = session
+        self.changed   = asyncio.Event()
+        self.stepping  = False
+        self.turn_time = 0.0           # seconds the last turn took
+        self._wake     = asyncio.Event()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='turns')
+
+    def notify(self) -> None:
+        """Mark the view stale without a turn (input, view changes)."""
+        self.changed.set()
+
+    def wake(self) -> None:
+        """Playback flags changed: re-check pause and speed now."""
+        self._wake.set()
+
+    async def wait_changed(self) -> None:
+        await self.changed.wait()
+        self.changed.clear()
+
+    async def step(self) -> None:
+        """Play one turn in the worker thread."""
+        self.stepping = True
+        t0 = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.session.step)
+        finally:
+            self.stepping  = False
+            self.turn_time = time.perf_counter() - t0
+        self.changed.set()
+
+    async def run(self) -> None:
+        """Play turns as the session's playback flags say, until cancelled."""
+        s, loop = self.session, asyncio.get_running_loop()
+        last = -float('inf')
+        while True:
+            if s.paused:
+                await self._sleep(None)
+                continue
+            delay = last + s.speed - loop.time()
+            if delay > 0:
+                await self._sleep(delay)
+                continue
+            last = loop.time()
+            await self.step()
+
+    async def _sleep(self, timeout) -> None:
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    def close(self) -> None:
+        """Wait for a turn in progress, then stop the worker thread."""
+        self._executor.shutdown(wait=True)
@@ -7,12 +7,20 @@ directly if they intend to share the same architectural path.
 
 Playback flags (paused, speed) live on the session — they are not part of
 simulation state and are not serialized into turn processing.
+
+checkpoint()/restore() save and reload the complete simulation (see
+checkpoint.py), so a client can resume at turn N without replaying 1..N.
+fork() copies a live session in memory for what-if branches (see branches.py).
 """
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
+import pickle
+
+import checkpoint
 from constants import NUM_NATIONS, TURN_DELAY
 from game import Game
 from snapshot import game_summary, turn_summary
@@ -21,8 +29,19 @@ from snapshot import game_summary, turn_summary
 class GameSession:
     """Owns one live Game plus optional interactive driver state."""
 
-    def __init__(self, seed=None, num_nations: int = NUM_NATIONS):
-        self.game = Game(seed=seed, num_nations=num_nations)
+    def __init__(self, seed=None, num_nations: int = NUM_NATIONS, grid: str = 'objects',
+                 world_cache=None, path_workers: int = 0, headless: bool = False):
+        """world_cache: optional worldcache.WorldCache to load/store the generated map.
+        path_workers: processes for army route searches (0 = in-process).
+        headless: fast mode for runs that only read final state — log lines are
+        counted but not kept (game.logs stays empty); the simulation is identical."""
+        self.game = Game(seed=seed, num_nations=num_nations, grid=grid,
+                         world_cache=world_cache, path_workers=path_workers,
+                         log_text=not headless)
+        # Options that shape the trajectory; recorded in checkpoints.
+        self.options = {'nations': num_nations, 'grid': grid, 'no_events': False}
+        if headless:
+            self.options['headless'] = True   # checkpoints without logs stay apart
         self.paused = True
         self.speed = TURN_DELAY
 
@@ -38,10 +57,75 @@ class GameSession:
         """Match CLI --no-events: suppress world event firings."""
         for k in self.game.events._cooldowns:
             self.game.events._cooldowns[k] = 999999
+        self.options['no_events'] = True
+
+    # ── checkpoints ───────────────────────────────────────────────────────
+    def checkpoint(self, path=None):
+        """Serialise the full simulation.  Writes to path if given; returns the bytes."""
+        data = checkpoint.dumps(self.game, self.options)
+        if path is not None:
+            Path(path).write_bytes(data)
+        return data
+
+    @classmethod
+    def restore(cls, path) -> GameSession:
+        """Load a session from a checkpoint file written by checkpoint().
+
+        The game's random streams come back with it, so stepping the result
+        continues the original run exactly.  Raises checkpoint.CheckpointError
+        for foreign, corrupt or stale files.
+        """
+        return cls.from_checkpoint(Path(path).read_bytes())
+
+    @classmethod
+    def from_checkpoint(cls, data: bytes) -> GameSession:
+        game, header = checkpoint.loads(data)
+        s = cls.__new__(cls)
+        s.game    = game
+        s.options = header['options']
+        s.paused  = True
+        s.speed   = TURN_DELAY
+        return s
+
+    # ── branching ─────────────────────────────────────────────────────────
+    def fork(self, branch=None) -> GameSession:
+        """Independent copy of this session at the current turn.
+
+        branch=None continues this session's random streams, so the copy
+        plays the same future as the original.  A branch label (str) reseeds
+        each stream from its current state and the label: the copy diverges,
+        reproducibly — the same label at the same point gives the same future.
+        """
+        return self.thaw(self.freeze(), branch)
+
+    def freeze(self) -> bytes:
+        """In-memory state for thaw(): an uncompressed pickle with no header.
+
+        Cheaper than checkpoint() and only meant for this process or its
+        workers; freeze once and thaw per branch."""
+        return pickle.dumps((self.game, self.options), protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def thaw(cls, frozen: bytes, branch=None) -> GameSession:
+        """A new session from freeze() bytes; branch as for fork()."""
+        game, options = pickle.loads(frozen)
+        s = cls.__new__(cls)
+        s.game    = game
+        s.options = options
+        s.paused  = True
+        s.speed   = TURN_DELAY
+        if branch is not None:
+            game.rng.branch(branch)
+            # A branch plays a different future: keep its checkpoints apart.
+            s.options['branch'] = [*options.get('branch', ()), [game.turn, str(branch)]]
+        return s
+
+    def snapshot(self, log_limit: int = 50, lazy: bool = False) -> dict[str, Any]:
+        """JSON-serializable summary of current simulation state (see snapshot.game_summary).
 
-    def snapshot(self, log_limit: int = 50) -> dict[str, Any]:
-        """JSON-serializable summary of current simulation state (see snapshot.game_summary)."""
-        return game_summary(self.game, log_limit=log_limit)
+        lazy=True leaves events and logs as serialize.Rows for serialize.write.
+        """
+        return game_summary(self.game, log_limit=log_limit, lazy=lazy)
 
     def turn_snapshot(self) -> dict[str, Any]:
         """Lightweight per-turn dict for streaming (see snapshot.turn_summary)."""
@@ -1,25 +1,23 @@
 """
 entities.py – Town, Army, Castle, Farm, Mine, Road entity classes.
 """
-import random
 import math
 from constants import *
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 class Town:
-    _id_counter = 0
+    """Create through Game.new_town, which assigns the id and the name stream."""
 
-    def __init__(self, x, y, nation_idx, is_capital=False):
-        Town._id_counter += 1
-        self.id          = Town._id_counter
+    def __init__(self, x, y, nation_idx, uid, rng, is_capital=False):
+        self.id          = uid
         self.x           = x
         self.y           = y
         self.nation      = nation_idx
         self.level       = 1         # 1-3 (town), 4 = city
         self.is_capital  = is_capital
         self.population  = 20
-        self.name        = self._gen_name(nation_idx, is_capital)
+        self.name        = self._gen_name(rng, nation_idx)
 
         # Local stockpile
         self.resources   = {RES_FOOD:20, RES_WOOD:15, RES_METAL:10, RES_GOLD:0}
@@ -68,7 +66,7 @@ class Town:
         if self.is_capital: return 'Capital'
         return names.get(self.level,'Town')
 
-    def _gen_name(self, nidx, capital):
+    def _gen_name(self, rng, nidx):
         prefixes = [
             ['Roma','Aqua','Urb','Arx','Vicus'],
             ['Athena','Sparta','Korin','Theba','Delphi'],
@@ -78,18 +76,17 @@ class Town:
             ['Skyth','Borys','Olbia','Tanais','Getae'],
         ]
         suffixes = ['','polis','um','ia','ax','on','ica','opolis']
-        p = random.choice(prefixes[nidx % len(prefixes)])
-        s = random.choice(suffixes)
+        p = rng.choice(prefixes[nidx % len(prefixes)])
+        s = rng.choice(suffixes)
         return p + s
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 class Army:
-    _id_counter = 0
+    """Create through Game.new_army, which assigns the id."""
 
-    def __init__(self, x, y, nation_idx, level=1):
-        Army._id_counter += 1
-        self.id           = Army._id_counter
+    def __init__(self, x, y, nation_idx, uid, level=1):
+        self.id           = uid
         self.x            = x
         self.y            = y
         self.nation       = nation_idx
@@ -4,7 +4,6 @@ events.py – Random world events that fire periodically.
 Event metadata (rarity, labels, etc.) is loaded from data/events.json5 so
 players can tune frequency without touching code.  Effect logic lives here.
 """
-import random
 import math
 from pathlib import Path
 from constants import *
@@ -70,6 +69,7 @@ class WorldEvent:
 class EventSystem:
     def __init__(self, game):
         self.game    = game
+        self.rng     = game.rng.events
         self.history : list[WorldEvent] = []
         self._cooldowns = {k: 0 for k in EVENT_RARITY}
 
@@ -80,7 +80,7 @@ class EventSystem:
             if cd > 0:
                 self._cooldowns[evt_type] -= 1
                 continue
-            if random.random() < 1.0 / rarity:
+            if self.rng.random() < 1.0 / rarity:
                 evt = self._fire(evt_type, turn)
                 if evt:
                     fired.append(evt)
@@ -89,13 +89,11 @@ class EventSystem:
 
     def _fire(self, evt_type, turn):
         w = self.game.world
-        land = [(x,y) for y in range(5, MAP_SIZE-5)
-                       for x in range(5, MAP_SIZE-5)
-                       if w.t(x,y).is_land()]
+        land = w.land_points(5)
         if not land:
             return None
-        cx, cy = random.choice(land)
-        mag = random.randint(3, 10)
+        cx, cy = self.rng.choice(land)
+        mag = self.rng.randint(3, 10)
 
         dispatch = {
             EVT_EARTHQUAKE:    self._earthquake,
@@ -124,18 +122,20 @@ class EventSystem:
             dist = math.dist((cx,cy),(tile.x,tile.y))
             intensity = 1.0 - dist/radius
 
-            if tile.terrain == TERRAIN_PLAIN and random.random() < intensity * 0.15:
+            if tile.terrain == TERRAIN_PLAIN and self.rng.random() < intensity * 0.15:
                 tile.terrain = TERRAIN_MOUNTAIN
-                tile.deposits[RES_METAL] += random.uniform(1,4)
+                tile.deposits[RES_METAL] += self.rng.uniform(1,4)
+                w.touch(tile.x, tile.y)
                 effects['terrain_changed'] += 1
 
-            if tile.entity in ('castle','farm','mine') and random.random() < intensity * 0.4:
+            if tile.entity in ('castle','farm','mine') and self.rng.random() < intensity * 0.4:
                 tile.entity = None
+                w.touch(tile.x, tile.y)
                 effects['buildings_destroyed'] += 1
 
             for army in list(tile.armies):
-                if random.random() < intensity * 0.5:
-                    dmg = random.randint(1, max(1, int(mag * intensity)))
+                if self.rng.random() < intensity * 0.5:
+                    dmg = self.rng.randint(1, max(1, int(mag * intensity)))
                     army.health = max(0, army.health - dmg)
                     effects['armies_damaged'] += 1
                     if not army.is_alive():
@@ -157,13 +157,14 @@ class EventSystem:
         for tile in w.tiles_in_radius(cx, cy, radius):
             if tile.terrain in (TERRAIN_PLAIN, TERRAIN_DESERT, TERRAIN_FOREST):
                 dist = math.dist((cx,cy),(tile.x,tile.y))
-                if random.random() < (1 - dist/radius) * 0.5:
+                if self.rng.random() < (1 - dist/radius) * 0.5:
                     if tile.entity == 'farm':
                         tile.entity = None
                         effects['farms_destroyed'] += 1
                     tile.terrain = TERRAIN_RIVER
                     tile.deposits[RES_FOOD] = max(tile.deposits[RES_FOOD],
-                                                   random.uniform(2,5))
+                                                   self.rng.uniform(2,5))
+                    w.touch(tile.x, tile.y)
                     effects['tiles_flooded'] += 1
 
         desc = (f"FLOOD near ({cx},{cy})! "
@@ -209,7 +210,7 @@ class EventSystem:
                     effects['pop_lost'] += lost
             for army in nation.armies:
                 if math.dist((cx,cy),(army.x,army.y)) <= radius:
-                    if random.random() < 0.3:
+                    if self.rng.random() < 0.3:
                         army.health = max(1, int(army.health * 0.7))
                         effects['armies_weakened'] += 1
 
@@ -227,9 +228,10 @@ class EventSystem:
         effects = {'gold_added': 0, 'tiles': 0}
 
         for tile in w.tiles_in_radius(cx, cy, radius):
-            if tile.is_land() and random.random() < 0.3:
-                amount = random.uniform(1, mag * 0.5)
+            if tile.is_land() and self.rng.random() < 0.3:
+                amount = self.rng.uniform(1, mag * 0.5)
                 tile.deposits[RES_GOLD] += amount
+                w.touch(tile.x, tile.y)
                 effects['gold_added'] += amount
                 effects['tiles'] += 1
 
@@ -249,12 +251,13 @@ class EventSystem:
 
         for tile in w.tiles_in_radius(cx, cy, radius):
             dist = math.dist((cx,cy),(tile.x,tile.y))
-            if tile.terrain == TERRAIN_FOREST and random.random() < (1-dist/radius)*0.7:
+            if tile.terrain == TERRAIN_FOREST and self.rng.random() < (1-dist/radius)*0.7:
                 tile.terrain  = TERRAIN_PLAIN
                 tile.deposits[RES_WOOD] = 0
                 tile.deposits[RES_FOOD] = max(tile.deposits[RES_FOOD], 1.5)
                 if tile.entity == 'farm':
                     tile.entity = None
+                w.touch(tile.x, tile.y)
                 effects['forests_burned'] += 1
                 effects['plains_created'] += 1
 
@@ -278,13 +281,14 @@ class EventSystem:
         for tile in w.tiles_in_radius(cx, cy, radius):
             dist = math.dist((cx,cy),(tile.x,tile.y))
             if tile.is_land() and tile.terrain != TERRAIN_MOUNTAIN:
-                if random.random() < (1-dist/radius)*0.5:
+                if self.rng.random() < (1-dist/radius)*0.5:
                     if tile.entity == 'farm':
                         tile.entity = None
                     if tile.terrain != TERRAIN_OCEAN:
                         tile.terrain = TERRAIN_DESERT
                         tile.deposits[RES_FOOD] *= 0.3
                         effects['tiles_covered'] += 1
+                    w.touch(tile.x, tile.y)
 
         for nation in self.game.nations:
             if not nation.alive: continue
@@ -309,8 +313,9 @@ class EventSystem:
 
         for tile in w.tiles_in_radius(cx, cy, radius):
             if tile.is_land():
-                amount = random.uniform(2, mag * 0.8)
+                amount = self.rng.uniform(2, mag * 0.8)
                 tile.deposits[RES_METAL] += amount
+                w.touch(tile.x, tile.y)
                 effects['metal_added'] += amount
                 effects['tiles'] += 1
 
@@ -366,7 +371,7 @@ class EventSystem:
             weights.append(1 + at_war)
 
         total = sum(weights)
-        r = random.random() * total
+        r = self.rng.random() * total
         target = candidates[0]
         for n, w in zip(candidates, weights):
             r -= w
@@ -384,12 +389,12 @@ class EventSystem:
         target.new_leader(crisis=True)
         new_ep = target.leader_epithet()
 
-        if random.random() < ASSN_CHANGE_CHANCE:
+        if self.rng.random() < ASSN_CHANGE_CHANCE:
             # New leader may also shift national doctrine
             all_traits = self.game.trait_list
             others = [t for t in all_traits if t['id'] != (old_trait or {}).get('id')]
             if others:
-                new_trait = random.choice(others)
+                new_trait = self.rng.choice(others)
                 target.trait = new_trait
                 effects['new_trait']    = new_trait['name']
                 effects['trait_changed'] = True
@@ -441,7 +446,7 @@ class EventSystem:
         candidates.sort(key=lambda x: x[0], reverse=True)
         parent = None
         for chance, n in candidates:
-            if random.random() < chance:
+            if self.rng.random() < chance:
                 parent = n
                 break
 
@@ -0,0 +1,255 @@
+"""
+export.py – Columnar export of a whole run for analytics (`cli.py export`).
+
+RunExporter records, after every turn, one row per nation slot with its
+full resource and army state, the turn's ownership map, and the battles
+and world events the turn added.  Rows are buffered for `batch` turns and
+then written out, so memory stays flat however long the run.
+
+Tables (one file, or one file per batch, each in the output directory):
+
+    nations    turn, nation, name, alive, territory, population, towns,
+               armies, army_strength, food, wood, metal, gold
+    ownership  turn, owners   (zlib of the row-major int8 owner map; -1 = none)
+    battles    turn, x, y, attacker, defender, winner, atk_losses, def_losses, notes
+    events     turn, type, x, y, radius, magnitude, description, effects (JSON)
+
+Formats:
+    arrow    Arrow IPC files  <table>.arrow        (needs pyarrow)
+    parquet  Parquet files    <table>.parquet      (needs pyarrow)
+    npz      NumPy archives   <table>-<part>.npz   (needs numpy; the fallback)
+             byte columns are stored as <col>__data (uint8) + <col>__offsets.
+
+close() writes manifest.json (format, seed, final turn, rows per table);
+load(directory) reads any format back as {table: {column: values}}.
+"""
+import json
+import zlib
+from array import array
+from pathlib import Path
+
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+FORMATS = ('arrow', 'parquet', 'npz')
+
+# table -> ((column, kind), ...); kinds map to NumPy / Arrow types below.
+TABLES = {
+    'nations': (('turn', 'i32'), ('nation', 'i16'), ('name', 'str'), ('alive', 'bool'),
+                ('territory', 'i32'), ('population', 'i32'), ('towns', 'i16'),
+                ('armies', 'i32'), ('army_strength', 'f64'),
+                *((RESOURCE_NAMES[r].lower(), 'f64') for r in range(NUM_RESOURCES))),
+    'ownership': (('turn', 'i32'), ('owners', 'bytes')),
+    'battles': (('turn', 'i32'), ('x', 'i16'), ('y', 'i16'), ('attacker', 'i16'),
+                ('defender', 'i16'), ('winner', 'i16'), ('atk_losses', 'i32'),
+                ('def_losses', 'i32'), ('notes', 'str')),
+    'events': (('turn', 'i32'), ('type', 'str'), ('x', 'i16'), ('y', 'i16'),
+               ('radius', 'i16'), ('magnitude', 'i16'), ('description', 'str'),
+               ('effects', 'str')),
+}
+
+_NP_TYPES = {'i16': 'int16', 'i32': 'int32', 'f64': 'float64', 'bool': 'bool', 'str': 'str'}
+
+
+def default_format():
+    if pa is not None:
+        return 'arrow'
+    if np is not None:
+        return 'npz'
+    return None
+
+
+def available(fmt):
+    return pa is not None if fmt in ('arrow', 'parquet') else np is not None
+
+
+def decode_owners(blob):
+    """Owner map (row-major, -1 = unowned) from an `owners` cell."""
+    return array('b', zlib.decompress(blob))
+
+
+class RunExporter:
+    """Collects a game's per-turn tables and writes them in batches."""
+
+    def __init__(self, game, directory, fmt=None, batch=50):
+        fmt = fmt or default_format()
+        if fmt not in FORMATS or not available(fmt):
+            raise RuntimeError(f'export format {fmt!r} needs '
+                               f'{"pyarrow" if fmt in ("arrow", "parquet") else "numpy"}')
+        self.game   = game
+        self.dir    = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.fmt    = fmt
+        self.batch  = max(1, batch)
+        self.rows   = dict.fromkeys(TABLES, 0)      # rows written per table
+        self._sinks = {name: _SINKS[fmt](self.dir, name, cols)
+                      for name, cols in TABLES.items()}
+        self._cols  = {name: {c: [] for c, _ in cols} for name, cols in TABLES.items()}
+        self._turns = 0
+        self._battle_pos = len(game.battles)
+        self._event_pos  = len(game.events_history)
+
+    def record(self):
+        """Buffer the current turn; writes a batch every `batch` turns."""
+        g, turn = self.game, self.game.turn
+        c = self._cols['nations']
+        for n in g.nations:
+            for key, v in (('turn', turn), ('nation', n.idx), ('name', n.name),
+                           ('alive', n.alive), ('territory', len(n.tiles)),
+                           ('population', int(n.total_population())),
+                           ('towns', len(n.towns)), ('armies', n.total_armies()),
+                           ('army_strength', float(n.army_strength()))):
+                c[key].append(v)
+            for r in range(NUM_RESOURCES):
+                c[RESOURCE_NAMES[r].lower()].append(float(n.res[r]))
+
+        owners = array('b', g.world.owners())
+        c = self._cols['ownership']
+        c['turn'].append(turn)
+        c['owners'].append(zlib.compress(owners.tobytes(), 6))
+
+        c = self._cols['battles']
+        for b in g.battles[self._battle_pos:]:
+            for key, v in (('turn', b.turn), ('x', b.x), ('y', b.y),
+                           ('attacker', b.atk_nation), ('defender', b.def_nation),
+                           ('winner', b.winner), ('atk_losses', b.atk_losses),
+                           ('def_losses', b.def_losses), ('notes', b.notes or '')):
+                c[key].append(v)
+        self._battle_pos = len(g.battles)
+
+        c = self._cols['events']
+        for e in g.events_history[self._event_pos:]:
+            for key, v in (('turn', e.turn), ('type', e.type), ('x', e.cx), ('y', e.cy),
+                           ('radius', e.radius), ('magnitude', e.magnitude),
+                           ('description', e.description),
+                           ('effects', json.dumps(e.effects, sort_keys=True))):
+                c[key].append(v)
+        self._event_pos = len(g.events_history)
+
+        self._turns += 1
+        if self._turns % self.batch == 0:
+            self.flush()
+
+    def flush(self):
+        for name, cols in self._cols.items():
+            n = len(next(iter(cols.values())))
+            if n:
+                self._sinks[name].write(cols)
+                self.rows[name] += n
+                for v in cols.values():
+                    v.clear()
+
+    def close(self):
+        """Write what is buffered, finish the files and write manifest.json;
+        returns the manifest."""
+        self.flush()
+        for sink in self._sinks.values():
+            sink.close()
+        manifest = {
+            'format':   self.fmt,
+            'seed':     self.game.world.seed,
+            'map_size': MAP_SIZE,
+            'turn':     self.game.turn,
+            'nations':  [n.name for n in self.game.nations],
+            'rows':     dict(self.rows),
+        }
+        (self.dir / 'manifest.json').write_text(json.dumps(manifest, indent=2) + '\n')
+        return manifest
+
+
+# ── sinks ─────────────────────────────────────────────────────────────────────
+
+class _ArrowSink:
+    _TYPES = None
+
+    def __init__(self, directory, name, cols, parquet=False):
+        if _ArrowSink._TYPES is None:
+            _ArrowSink._TYPES = {'i16': pa.int16(), 'i32': pa.int32(), 'f64': pa.float64(),
+                                 'bool': pa.bool_(), 'str': pa.string(), 'bytes': pa.binary()}
+        self.schema  = pa.schema([(c, self._TYPES[k]) for c, k in cols])
+        self.parquet = parquet
+        self.path    = directory / f'{name}.{"parquet" if parquet else "arrow"}'
+        self.writer  = (pq.ParquetWriter(self.path, self.schema, compression='zstd') if parquet
+                        else pa.ipc.new_file(str(self.path), self.schema))
+
+    def write(self, columns):
+        self.writer.write_table(pa.table(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class _NpzSink:
+    def __init__(self, directory, name, cols):
+        self.dir, self.name, self.cols = directory, name, cols
+        self.part = 0
+        for old in directory.glob(f'{name}-*.npz'):     # parts of an earlier export
+            old.unlink()
+
+    def write(self, columns):
+        arrays = {}
+        for c, kind in self.cols:
+            v = columns[c]
+            if kind == 'bytes':
+                arrays[f'{c}__offsets'] = np.cumsum([0] + [len(b) for b in v], dtype=np.int64)
+                arrays[f'{c}__data'] = np.frombuffer(b''.join(v), dtype=np.uint8)
+            else:
+                arrays[c] = np.array(v, dtype=_NP_TYPES[kind])
+        np.savez_compressed(self.dir / f'{self.name}-{self.part:05d}.npz', **arrays)
+        self.part += 1
+
+    def close(self):
+        pass
+
+
+_SINKS = {
+    'arrow':   _ArrowSink,
+    'parquet': lambda d, n, c: _ArrowSink(d, n, c, parquet=True),
+    'npz':     _NpzSink,
+}
+
+
+# ── reading back ──────────────────────────────────────────────────────────────
+
+def load(directory):
+    """{table: {column: values}} from an export directory (any format).
+
+    Arrow / Parquet columns come back as lists, npz columns as NumPy arrays
+    (byte columns as lists of bytes)."""
+    d = Path(directory)
+    fmt = json.loads((d / 'manifest.json').read_text())['format']
+    out = {}
+    for name, cols in TABLES.items():
+        if fmt == 'arrow':
+            with pa.memory_map(str(d / f'{name}.arrow')) as src:
+                out[name] = pa.ipc.open_file(src).read_all().to_pydict()
+        elif fmt == 'parquet':
+            out[name] = pq.read_table(d / f'{name}.parquet').to_pydict()
+        else:
+            out[name] = _load_npz(sorted(d.glob(f'{name}-*.npz')), cols)
+    return out
+
+
+def _load_npz(paths, cols):
+    parts = {c: [] for c, _ in cols}
+    for p in paths:
+        with np.load(p) as z:
+            for c, kind in cols:
+                if kind == 'bytes':
+                    data, offs = z[f'{c}__data'].tobytes(), z[f'{c}__offsets']
+                    parts[c].extend(data[offs[i]:offs[i + 1]] for i in range(len(offs) - 1))
+                else:
+                    parts[c].append(z[c])
+    return {c: parts[c] if kind == 'bytes' else
+               (np.concatenate(parts[c]) if parts[c] else np.array([], dtype=_NP_TYPES[kind]))
+            for c, kind in cols}
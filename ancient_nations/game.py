@@ -1,18 +1,24 @@
 """
 game.py – Central game state and turn processing.
 """
-import random
 import math
 from pathlib import Path
 from constants import *
 from world import World
-from nation import Nation
+from nation import Nation, TileSet
 from entities import Town, Army
 from ai import NationAI
 from combat import resolve_battle
 from events import EventSystem
 from loader import load_json5
 from namegen import NationNameGenerator
+from rng import RandomStreams
+from territory import TerritoryIndex
+from yields import YieldCache
+from logbook import LogBuffer
+from records import battle_log, event_log
+from targets import TargetMaps
+from pathfinding import PathService
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -24,6 +30,7 @@ class CombatManager:
                 atk_surge=False, tier4_def=False,
                 atk_trait_dice=0, def_trait_dice=0):
         return resolve_battle(attacker, defender, tile, turn, self.game.log,
+                              self.game.rng.combat,
                               atk_surge=atk_surge, tier4_def=tier4_def,
                               atk_trait_dice=atk_trait_dice,
                               def_trait_dice=def_trait_dice,
@@ -32,41 +39,70 @@ class CombatManager:
 
 # ─────────────────────────────────────────────────────────────────────────────
 class Game:
-    def __init__(self, seed=None, num_nations=NUM_NATIONS):
+    def __init__(self, seed=None, num_nations=NUM_NATIONS, grid='objects',
+                 world_cache=None, path_workers=0, log_text=True):
         self.turn     = 0
-        self.logs     = []          # list of (turn, msg, nation_idx|-1)
-        self.battles  = []          # list of Battle objects
+        self.logs     = LogBuffer(LOG_MAX, keep=log_text)   # reads as (turn, msg, nation_idx|-1)
+        self.battles  = battle_log()    # Battle objects, indexed by turn/nation/region
 
         # World
-        self.world    = World(seed)
+        self.world    = World(seed, grid=grid, cache=world_cache)
+
+        # Per-game random substreams (see rng.py) and entity id sequences
+        self.rng        = RandomStreams(self.world.seed)
+        self._town_ids  = 0
+        self._army_ids  = 0
 
         # Trait pool — shuffle so each run assigns traits differently
         _data = Path(__file__).parent / 'data'
         self.trait_list = load_json5(_data / 'traits.json5')['traits']
         self._trait_pool = self.trait_list[:]
-        random.shuffle(self._trait_pool)
+        self.rng.setup.shuffle(self._trait_pool)
 
         # Nations
         self.nations    : list[Nation] = []
         self.combat     = CombatManager(self)
-        self._namegen   = NationNameGenerator()
+        self._namegen   = NationNameGenerator(self.rng.names)
         self._spawn_nations(num_nations)
 
         # AI controllers
         self.ai = [NationAI(n, self.world, self) for n in self.nations]
 
+        # Town-coverage counts behind expansion and abandonment
+        self.territory  = TerritoryIndex(self)
+        self.yields     = YieldCache(self.world)
+        self.targets    = TargetMaps(self)
+        self.paths      = PathService(self.world)
+        self.profiler   = None      # profiler.TurnProfiler while one is attached
+        if path_workers:
+            self.paths.use_workers(path_workers)
+
         # Event system
         self.events              = EventSystem(self)
-        self.events_history      : list = []   # WorldEvent objects
+        self.events_history      = event_log()  # WorldEvent objects, indexed by turn
         self.pending_recoveries  : list = []   # [(turn, cx, cy, r, type)]
 
         self.log(0, f"=== ANCIENT NATIONS begins. Seed:{self.world.seed} ===")
         self.log(0, f"  {num_nations} nations on a {MAP_SIZE}x{MAP_SIZE} map")
 
+    # ── entity factories ───────────────────────────────────────────────────
+    def new_town(self, x, y, nation_idx, is_capital=False):
+        self._town_ids += 1
+        return Town(x, y, nation_idx, self._town_ids, self.rng.names, is_capital)
+
+    def new_army(self, x, y, nation_idx, level=1):
+        self._army_ids += 1
+        return Army(x, y, nation_idx, self._army_ids, level)
+
+    def _new_nation(self, i, x, y):
+        return Nation(i, self._namegen.generate(), NATION_COLORS[i],
+                      self.new_town(x, y, i, is_capital=True), self.world,
+                      self.rng.nations)
+
     # ── nation spawning ────────────────────────────────────────────────────
     def _spawn_nations(self, n):
         valid = self.world.valid_spawn_points()
-        random.shuffle(valid)
+        self.rng.setup.shuffle(valid)
         spawned = []
 
         for i in range(n):
@@ -75,8 +111,7 @@ class Game:
                 dist_ok = all(math.dist((x,y),(sx,sy)) >= MIN_NATION_DISTANCE
                                for sx,sy in spawned)
                 if dist_ok:
-                    nation = Nation(i, self._namegen.generate(), NATION_COLORS[i], x, y,
-                                    self.world)
+                    nation = self._new_nation(i, x, y)
                     nation.trait = self._trait_pool[i % len(self._trait_pool)]
                     self.nations.append(nation)
                     spawned.append((x,y))
@@ -94,8 +129,7 @@ class Game:
                              default=float('inf'))
                     if d > best_dist:
                         best_dist=d; bx,by=px,py
-                nation = Nation(i, self._namegen.generate(), NATION_COLORS[i], bx, by,
-                                self.world)
+                nation = self._new_nation(i, bx, by)
                 nation.trait = self._trait_pool[i % len(self._trait_pool)]
                 self.nations.append(nation)
                 spawned.append((bx,by))
@@ -105,25 +139,29 @@ class Game:
         self.turn += 1
         t = self.turn
         season_food = self._season_food_mul()
+        prof = self.profiler
+        if prof: prof.begin_turn()
 
         # 1. Resource collection
+        if prof: prof.phase('collection')
         for n in self.nations:
             if n.alive:
-                n.collect_resources(self.world, season_food)
+                n.collect_resources(self.world, season_food, self.yields)
 
         # 1b. Alliance trade dividends (Tier 1+)
+        if prof: prof.phase('dividends')
         self._apply_alliance_dividends(t)
 
         # 2. Population growth & town levelling
+        if prof: prof.phase('growth')
         for n in self.nations:
             if not n.alive: continue
             for town in n.towns:
                 food_surplus = max(0, n.res[RES_FOOD] - 50)
                 levelled = town.grow_population(food_surplus * 0.1)
                 if levelled:
-                    self.log(t,
-                        f"  {town.name} grew to {town.level_name()}!",
-                        n.idx)
+                    self.log(t, "  {} grew to {}!", n.idx,
+                             town.name, town.level_name())
                     # Update capital tracking
                     cap = n.capital
                     if cap:
@@ -131,30 +169,35 @@ class Game:
                             tw.is_capital = (tw is cap)
 
         # 3. AI decisions (movement, building, diplomacy)
+        if prof: prof.phase('ai')
         for ai in self.ai:
             if ai.n.alive:
                 ai.tick(t)
+        self.paths.settle()
 
         # 3b. Territory far from any town slowly reverts to neutral (carrying cost)
+        if prof: prof.phase('abandonment')
         self._tick_territory_abandonment(t)
 
         # 4. Pay upkeep
+        if prof: prof.phase('upkeep')
         for n in self.nations:
             if not n.alive: continue
             n.pay_upkeep()
             # If food runs out, armies starve
             if n.res[RES_FOOD] <= 0:
                 if n.armies:
-                    victim = random.choice(n.armies)
+                    victim = self.rng.turn.choice(n.armies)
                     victim.health = max(0, victim.health - 5)
                     if not victim.is_alive():
                         self.ai[n.idx]._remove_army(victim)
-                        self.log(t, f"  {n.name}'s army starved!", n.idx)
+                        self.log(t, "  {}'s army starved!", n.idx, n.name)
 
         # 4b. Famine: prolonged national food stress downgrades towns
         self._tick_famine_towns(t)
 
         # 5. World events
+        if prof: prof.phase('events')
         new_evts = self.events.tick(t)
         self.events_history.extend(new_evts)
 
@@ -162,6 +205,7 @@ class Game:
         self._process_recoveries(t)
 
         # 6. Eliminate bankrupt nations
+        if prof: prof.phase('eliminations')
         self._check_eliminations(t)
 
         # 6b. Tick rebellion cooldowns on absorbed nation slots
@@ -170,8 +214,10 @@ class Game:
                 n.rebellion_cooldown -= 1
 
         # 7. Snapshot for charts
+        if prof: prof.phase('snapshot')
         for n in self.nations:
             n.snapshot()
+        if prof: prof.end_turn()
 
     def _apply_alliance_dividends(self, t):
         """Bilateral resource bonus for Tier 1+ alliances.
@@ -201,8 +247,9 @@ class Game:
                 if rtype == 'flood':
                     for tile in self.world.tiles_in_radius(cx, cy, radius):
                         if tile.terrain == TERRAIN_RIVER and tile.entity is None:
-                            if random.random() < 0.6:
+                            if self.rng.turn.random() < 0.6:
                                 tile.terrain = TERRAIN_PLAIN
+                                self.world.touch(tile.x, tile.y)
                     self.log(t, f"[FLOOD] Waters recede near ({cx},{cy}).")
             else:
                 still_pending.append((due_turn, cx, cy, radius, rtype))
@@ -221,33 +268,20 @@ class Game:
         for n in self.nations:
             if not n.alive:
                 continue
-            covered = set()
-            bonus = n.trait_val('town_radius_bonus', 0)
-            for town in n.towns:
-                r = town.radius + bonus
-                for tile in self.world.tiles_in_radius(town.x, town.y, r):
-                    if tile.owner == n.idx:
-                        covered.add((tile.x, tile.y))
-            for xy in list(n.tiles):
-                tile = self.world.t(xy[0], xy[1])
-                if xy in covered:
-                    tile.territory_neglect = 0
-                    continue
-                tile.territory_neglect += 1
-                if tile.territory_neglect >= TERRITORY_NEGLECT_ABANDON_TURNS:
-                    self._abandon_tile_to_neutral(n, tile, t)
+            # Visits only tiles whose coverage, owner or neglect may have changed
+            # (territory.py); same order and outcome as scanning all of n.tiles.
+            self.territory.neglect_pass(
+                n, lambda tile: self._abandon_tile_to_neutral(n, tile, t))
 
     def _abandon_tile_to_neutral(self, nation, tile, t):
         nation.tiles.discard((tile.x, tile.y))
-        tile.owner = -1
-        tile.territory_neglect = 0
+        self.world.set_tile_owner(tile.x, tile.y, -1)
         tile.captured_turn = -1
         if tile.town is None and tile.entity is not None:
             tile.entity = None
         tile.road = False
-        self.log(t,
-            f"  {nation.name} lost control of distant land ({tile.x},{tile.y})",
-            nation.idx)
+        self.log(t, "  {} lost control of distant land ({},{})", nation.idx,
+                 nation.name, tile.x, tile.y)
 
     def _tick_famine_towns(self, t):
         """National food stress causes towns to lose levels over time."""
@@ -264,9 +298,8 @@ class Game:
                 if (town.food_deficit_turns >= FAMINE_DOWNGRADE_TURNS
                         and town.apply_famine_downgrade()):
                     any_downgrade = True
-                    self.log(t,
-                        f"  {town.name} shrank to {town.level_name()} (famine)",
-                        n.idx)
+                    self.log(t, "  {} shrank to {} (famine)", n.idx,
+                             town.name, town.level_name())
             if any_downgrade:
                 cap = n.capital
                 if cap:
@@ -292,7 +325,7 @@ class Game:
         for xy in list(smaller.tiles):
             self.world.set_tile_owner(xy[0], xy[1], larger.idx)
             larger.tiles.add(xy)
-        smaller.tiles = set()
+        smaller.tiles = TileSet()
 
         # Transfer towns
         for town in list(smaller.towns):
@@ -336,7 +369,7 @@ class Game:
         for xy in list(loser.tiles):
             self.world.set_tile_owner(xy[0], xy[1], winner.idx)
             winner.tiles.add(xy)
-        loser.tiles = set()
+        loser.tiles = TileSet()
 
         # Transfer towns
         for town in list(loser.towns):
@@ -347,9 +380,7 @@ class Game:
 
         # Disband armies
         for army in list(loser.armies):
-            t = self.world.t(army.x, army.y)
-            if army in t.armies: t.armies.remove(army)
-            if t.army == army:   t.army = t.armies[0] if t.armies else None
+            self.world.lift_army(army, army.x, army.y)
         loser.armies = []
 
         # Eliminate with cooldown (slot locked against rebellion)
@@ -383,7 +414,7 @@ class Game:
         sorted_tiles = sorted(parent.tiles,
                               key=lambda xy: -math.dist(xy, (cap.x, cap.y)))
         split_n      = max(10, int(len(parent.tiles) * split_fraction))
-        rebel_tiles  = set(sorted_tiles[:split_n])
+        rebel_tiles  = TileSet(sorted_tiles[:split_n])
 
         # Transfer tile ownership
         for xy in rebel_tiles:
@@ -431,19 +462,13 @@ class Game:
         slot.alliance_contradiction_turns = 0
         slot.name              = self._namegen.generate()
         slot.letter            = slot.name[0].upper()
-        slot.leader_aggression = random.uniform(0.55, 1.0)  # rebels lean hawk
+        slot.leader_aggression = self.rng.turn.uniform(0.55, 1.0)  # rebels lean hawk
         slot.leader_age        = 0
         used_ids    = {n.trait['id'] for n in self.nations if n.alive and n is not slot}
         available   = [t for t in self.trait_list if t['id'] not in used_ids]
-        slot.trait  = random.choice(available if available else self.trait_list)
+        slot.trait  = self.rng.turn.choice(available if available else self.trait_list)
         slot.trait_history = []
-        slot.history = {
-            'territory': [], 'population': [], 'gold': [],
-            'food': [], 'wood': [], 'metal': [],
-            'armies': [], 'army_strength': [],
-            'battles_won': 0, 'battles_lost': 0,
-            'trades_done': 0, 'alliances_formed': 0,
-        }
+        slot.reset_history()
 
         # Restart the AI for this slot
         self.ai[slot.idx] = NationAI(slot, self.world, self)
@@ -455,10 +480,10 @@ class Game:
         return slot
 
     # ── logging ───────────────────────────────────────────────────────────
-    def log(self, turn, msg, nation_idx=-1):
-        self.logs.append((turn, msg, nation_idx))
-        if len(self.logs) > LOG_MAX:
-            self.logs = self.logs[-LOG_MAX:]
+    def log(self, turn, msg, nation_idx=-1, *args):
+        """Add a log line.  With args, msg is a str.format template that is
+        only filled in if the line is ever read (see logbook)."""
+        self.logs.append(turn, msg, nation_idx, args)
 
     def recent_logs(self, n=30):
         return self.logs[-n:]
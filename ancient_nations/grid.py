@@ -0,0 +1,169 @@
+"""
+grid.py – Structure-of-arrays storage for the world map.
+
+WorldGrid keeps every per-tile scalar in one flat typed array, indexed by
+i = y*size + x.  Storage uses the stdlib `array` module so scalar reads
+return plain Python ints/floats (JSON-safe, no NumPy scalar overhead) and
+the grid works without NumPy installed.  When NumPy is available,
+WorldGrid.as_numpy() returns zero-copy ndarray views of the same buffers for
+whole-map vectorised passes.
+
+Per-tile object references (town, armies) cannot be packed; they sit in
+sparse dicts keyed by i, holding only the cells that have one.  Nothing is
+stored per cell as a Python object, so memory grows with the map's arrays
+alone.  world.TileView is the facade over one cell, made on demand; see
+World(grid='arrays').
+"""
+from array import array
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Entity codes stored in WorldGrid.entity.  Index 0 is "no building".
+ENTITY_NONE   = 0
+ENTITY_FARM   = 1
+ENTITY_MINE   = 2
+ENTITY_CASTLE = 3
+ENTITY_NAMES  = (None, 'farm', 'mine', 'castle')
+ENTITY_CODES  = {name: code for code, name in enumerate(ENTITY_NAMES)}
+
+# Array name → stdlib typecode.  deposits holds NUM_RESOURCES floats per tile.
+GRID_FIELDS = {
+    'terrain':   'b',
+    'owner':     'b',
+    'entity':    'B',
+    'road':      'B',
+    'elevation': 'd',
+    'moisture':  'd',
+    'neglect':   'i',
+    'captured':  'i',
+    'deposits':  'd',
+}
+
+# Fields written by map generation; the rest keep their defaults until play starts.
+GENERATED_FIELDS = ('terrain', 'elevation', 'moisture', 'deposits')
+
+# Value a fresh (pre-generation) tile starts with — mirrors world.Tile.__init__.
+_DEFAULTS = {
+    'terrain':   TERRAIN_PLAIN,
+    'owner':     -1,
+    'entity':    ENTITY_NONE,
+    'road':      0,
+    'elevation': 0.5,
+    'moisture':  0.5,
+    'neglect':   0,
+    'captured':  -1,
+    'deposits':  0.0,
+}
+
+
+class WorldGrid:
+    """Flat typed arrays for a size×size map, plus sparse object layers."""
+
+    def __init__(self, size=MAP_SIZE, buffers=None):
+        """buffers optionally supplies {field: writable typed buffer} to use in
+        place of fresh arrays — e.g. memoryviews over a mapped cache file."""
+        self.size = size
+        buffers = buffers or {}
+        for name, code in GRID_FIELDS.items():
+            count = self.field_len(name)
+            if name in buffers:
+                buf = buffers[name]
+                if len(buf) != count:
+                    raise ValueError(f'{name}: expected {count} items, got {len(buf)}')
+                setattr(self, name, buf)
+            else:
+                setattr(self, name, array(code, [_DEFAULTS[name]]) * count)
+        self.towns  = {}     # i -> Town
+        self.stacks = {}     # i -> [Army, ...], non-empty stacks only
+        self.tops   = {}     # i -> Army on top of the stack
+
+    def field_len(self, name):
+        n = self.size * self.size
+        return n * NUM_RESOURCES if name == 'deposits' else n
+
+    def idx(self, x, y):
+        return y * self.size + x
+
+    def arrays(self):
+        """Return {field: array} for every stored field."""
+        return {name: getattr(self, name) for name in GRID_FIELDS}
+
+    def as_numpy(self):
+        """Zero-copy NumPy views: 2-D (size, size) per field, deposits (size, size, 4).
+
+        Writes through the views mutate the grid.  Raises RuntimeError if NumPy
+        is not installed.
+        """
+        if np is None:
+            raise RuntimeError('NumPy is required for WorldGrid.as_numpy()')
+        S = self.size
+        out = {}
+        for name, arr in self.arrays().items():
+            view = np.frombuffer(arr, dtype=np.dtype(GRID_FIELDS[name]))
+            if name == 'deposits':
+                out[name] = view.reshape(S, S, NUM_RESOURCES)
+            else:
+                out[name] = view.reshape(S, S)
+        return out
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in self.arrays().values())
+
+    def __getstate__(self):
+        # Buffers may be memoryviews over a mapped cache file; pickle owned copies.
+        state = {'size': self.size, 'towns': self.towns, 'stacks': self.stacks,
+                 'tops': self.tops}
+        for name, buf in self.arrays().items():
+            if not isinstance(buf, array):
+                buf = array(GRID_FIELDS[name], buf.tobytes())
+            state[name] = buf
+        return state
+
+
+class DepositsView:
+    """Dict-like {RES_*: float} window onto one tile's slice of WorldGrid.deposits.
+
+    Not picklable on its own (the slice may be a memoryview); TileView
+    rebuilds it from its grid.
+    """
+
+    __slots__ = ('_a', '_o')
+
+    def __init__(self, deposits, offset):
+        self._a = deposits
+        self._o = offset
+
+    def __getitem__(self, r):
+        return self._a[self._o + r]
+
+    def __setitem__(self, r, value):
+        self._a[self._o + r] = value
+
+    def __iter__(self):
+        return iter(range(NUM_RESOURCES))
+
+    def __len__(self):
+        return NUM_RESOURCES
+
+    def keys(self):
+        return range(NUM_RESOURCES)
+
+    def values(self):
+        o = self._o
+        return self._a[o:o + NUM_RESOURCES].tolist()
+
+    def items(self):
+        return list(zip(range(NUM_RESOURCES), self.values()))
+
+    def get(self, r, default=None):
+        if 0 <= r < NUM_RESOURCES:
+            return self._a[self._o + r]
+        return default
+
+    def __repr__(self):
+        return repr(dict(self.items()))
@@ -0,0 +1,129 @@
+"""
+history.py – Per-nation chart series in fixed-size typed rings.
+
+Nation.snapshot records eight numbers a turn (SERIES).  SeriesStore keeps
+the newest `capacity` of each in one preallocated array('q') with a shared
+ring index, so recording a turn writes eight slots and allocates nothing.
+Nation.history[key] is a SeriesView onto one of those rings that reads like
+the list it replaces: len(), iteration, indexing (negative too) and slicing,
+oldest first.
+
+Optionally a store also keeps an archive of the whole run at reduced
+resolution: every `step`-th turn, at most `archive` points per series.  When
+the archive fills up every other point is dropped and `step` doubles, so it
+always spans turn 0 to now.
+"""
+from array import array
+
+SERIES = ('territory', 'population', 'gold', 'food', 'wood', 'metal',
+          'armies', 'army_strength')
+COUNTERS = ('battles_won', 'battles_lost', 'trades_done', 'alliances_formed')
+
+
+class SeriesStore:
+    """The SERIES rings (and archive) of one nation."""
+
+    def __init__(self, capacity, archive=0):
+        self.capacity = capacity
+        self.count    = 0                 # records ever made
+        self.head     = 0                 # ring slot the next record goes to
+        self.data     = array('q', bytes(8 * capacity * len(SERIES)))
+        self.archive  = archive
+        self.step     = 1                 # turns per archived point
+        self.archived = [array('q') for _ in SERIES] if archive else None
+
+    def record(self, *values):
+        """Append one value to each series, in SERIES order."""
+        cap, head, data = self.capacity, self.head, self.data
+        for k, v in enumerate(values):
+            data[k * cap + head] = v
+        if self.archived is not None and self.count % self.step == 0:
+            self._archive(values)
+        self.count += 1
+        self.head = head + 1 if head + 1 < cap else 0
+
+    def _archive(self, values):
+        arcs = self.archived
+        if len(arcs[0]) == self.archive:
+            half = (self.archive + 1) // 2
+            for a in arcs:
+                for i in range(1, half):
+                    a[i] = a[2 * i]
+                del a[half:]
+            self.step *= 2
+            if self.count % self.step:
+                return                    # this point falls between the new steps
+        for a, v in zip(arcs, values):
+            a.append(v)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def view(self, key):
+        return SeriesView(self, SERIES.index(key))
+
+
+class SeriesView:
+    """Read-only, oldest-first view of one series of a SeriesStore."""
+
+    __slots__ = ('store', 'k')
+
+    def __init__(self, store, k):
+        self.store = store
+        self.k     = k
+
+    def _at(self, i):
+        # i-th oldest retained value, 0 <= i < len
+        s = self.store
+        start = s.head if s.count >= s.capacity else 0
+        j = start + i
+        if j >= s.capacity:
+            j -= s.capacity
+        return s.data[self.k * s.capacity + j]
+
+    def __len__(self):
+        return len(self.store)
+
+    def __iter__(self):
+        s = self.store
+        base = self.k * s.capacity
+        if s.count < s.capacity:
+            return iter(s.data[base:base + s.count])
+        ring = s.data[base:base + s.capacity]
+        return iter(ring[s.head:] + ring[:s.head])
+
+    def __getitem__(self, i):
+        n = len(self)
+        if isinstance(i, slice):
+            return [self._at(j) for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('history index out of range')
+        return self._at(i)
+
+    def __eq__(self, other):
+        if isinstance(other, (SeriesView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f'SeriesView({SERIES[self.k]!r}, {list(self)})'
+
+    def tolist(self):
+        return list(self)
+
+    def archived(self):
+        """(step, values): the whole run, one value every `step` turns;
+        None when the store keeps no archive."""
+        s = self.store
+        if s.archived is None:
+            return None
+        return s.step, s.archived[self.k].tolist()
+
+
+def new_history(store):
+    """Nation.history: a SeriesView per series plus the event counters."""
+    h = {key: store.view(key) for key in SERIES}
+    h.update(dict.fromkeys(COUNTERS, 0))
+    return h
@@ -0,0 +1,54 @@
+"""
+logbook.py – The game log: a bounded ring of lazily formatted records.
+
+Game.log(turn, msg, nation_idx, *args) appends (turn, msg, args, nation)
+without building the text: when args are given, msg is a str.format
+template filled in only when the record is read.  Busy call sites (army
+training, battles, town growth, trades) pass templates; rare ones may pass
+finished strings.
+
+LogBuffer keeps the newest `maxlen` records (a deque, so overflowing costs
+O(1) instead of re-slicing the list) and reads like the old list of
+(turn, msg, nation_idx) tuples: len(), iteration, indexing and slicing.
+
+With keep=False (headless runs that never read the log) appends are
+dropped at once; `total` still counts them.
+"""
+from collections import deque
+from itertools import islice
+
+
+class LogBuffer:
+    """Newest-last ring of log records, read as (turn, msg, nation_idx)."""
+
+    def __init__(self, maxlen, keep=True):
+        self._records = deque(maxlen=maxlen)
+        self.keep  = keep
+        self.total = 0          # records ever appended, kept or not
+
+    def append(self, turn, msg, nation_idx=-1, args=()):
+        self.total += 1
+        if self.keep:
+            self._records.append((turn, msg, args, nation_idx))
+
+    @staticmethod
+    def _text(record):
+        turn, msg, args, nation_idx = record
+        return (turn, msg.format(*args) if args else msg, nation_idx)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return map(self._text, self._records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self._records))
+            if step != 1:
+                return [self._text(r) for r in list(self._records)[i]]
+            return [self._text(r) for r in islice(self._records, start, max(start, stop))]
+        return self._text(self._records[i])
+
+    def clear(self):
+        self._records.clear()
@@ -10,10 +10,18 @@ Controls:
   C            Charts view
   B            Battles view
   Q  /  Esc    Quit
+
+Input, turns and drawing are separate asyncio tasks: turns run in a worker
+thread (driver.SessionDriver), keys are handled as they arrive, and the
+screen is redrawn only after a turn or a key, so a slow turn never holds up
+input.  No frame is drawn while a turn is half-applied; the turn's end
+draws the next one.
 """
 
+import asyncio
 import sys
 import os
+import threading
 import time
 
 # Ensure UTF-8 output on Windows
@@ -43,29 +51,59 @@ if sys.platform == 'win32':
             }.get(ch2, None)
         return ch
 else:
-    import tty, termios, select
-    def _kbhit():
-        return select.select([sys.stdin], [], [], 0)[0] != []
-    def _getch():
-        fd = sys.stdin.fileno()
-        old = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1)
-            if ch == '\x1b':
+    import tty, termios
+    _ARROWS = {'\x1b[A': 'UP', '\x1b[B': 'DOWN', '\x1b[C': 'RIGHT', '\x1b[D': 'LEFT'}
+    def _split_keys(data):
+        """Keys in a chunk of terminal input: arrow sequences (Esc [ A..D)
+        become 'UP' etc., other Esc [ x sequences are passed whole, and any
+        other Esc is the Esc key itself, so the key after it is kept."""
+        i = 0
+        while i < len(data):
+            if data.startswith('\x1b[', i) and i + 2 < len(data):
+                seq = data[i:i + 3]
+                yield _ARROWS.get(seq, seq)
+                i += 3
+            else:
+                yield data[i]
+                i += 1
+
+
+def _watch_keys(loop, keys):
+    """Feed key presses into asyncio.Queue keys; returns a function that stops."""
+    if sys.platform == 'win32':
+        # The console has no readiness handle for the loop: poll on a thread.
+        stop = threading.Event()
+
+        def pump():
+            while not stop.is_set():
                 if _kbhit():
-                    more = sys.stdin.read(2)
-                    seq = ch + more
-                    return {'\x1b[A':'UP','\x1b[B':'DOWN',
-                            '\x1b[C':'RIGHT','\x1b[D':'LEFT'}.get(seq, seq)
-            return ch
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old)
+                    loop.call_soon_threadsafe(keys.put_nowait, _getch())
+                else:
+                    time.sleep(0.02)
+        threading.Thread(target=pump, name='keys', daemon=True).start()
+        return stop.set
+
+    # Unbuffered, unechoed input for the whole session, so keys arrive as
+    # pressed; read straight from the descriptor whenever it is readable.
+    fd = sys.stdin.fileno()
+    old = termios.tcgetattr(fd)
+    tty.setcbreak(fd, termios.TCSANOW)
+
+    def ready():
+        for ch in _split_keys(os.read(fd, 64).decode('utf-8', 'replace')):
+            keys.put_nowait(ch)
+    loop.add_reader(fd, ready)
+
+    def stop():
+        loop.remove_reader(fd)
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+    return stop
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 from constants import *
 from engine import GameSession
+from driver import SessionDriver
 from renderer import (Renderer, VIEW_WORLD, VIEW_REGION,
                       VIEW_LOG, VIEW_CHARTS, VIEW_BATTLES)
 
@@ -107,27 +145,39 @@ class App:
             print('Thanks for watching Ancient Nations!')
 
     def _loop(self):
-        last_turn = time.time()
-
-        while self.running:
-            now = time.time()
-
-            # Process input (drain all pending keys)
-            while _kbhit():
-                ch = _getch()
-                self._handle_key(ch)
-                if not self.running:
-                    break
-
-            # Advance game turn
-            s = self.session
-            if not s.paused and (now - last_turn >= s.speed):
-                s.step()
-                last_turn = now
-
-            # Render frame
-            self.renderer.render()
-            time.sleep(0.03)
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self.driver = SessionDriver(self.session)
+        keys  = asyncio.Queue()
+        stop  = _watch_keys(asyncio.get_running_loop(), keys)
+        turns = asyncio.create_task(self.driver.run())
+        draw  = asyncio.create_task(self._draw_loop())
+        try:
+            while self.running:
+                self._handle_key(await keys.get())
+                self.driver.wake()          # pause / speed may have changed
+                self.driver.notify()
+        finally:
+            stop()
+            for t in (turns, draw):
+                t.cancel()
+            await asyncio.gather(turns, draw, return_exceptions=True)
+            self.driver.close()
+
+    async def _draw_loop(self):
+        self._draw()
+        while True:
+            await self.driver.wait_changed()
+            self._draw()
+
+    def _draw(self):
+        # While a turn runs in the worker thread the game is half-applied:
+        # skip the frame.  The end of the turn sets `changed`, and `stepping`
+        # is only ever flipped on this thread, so every drawn frame is whole.
+        if self.driver.stepping:
+            return
+        self.renderer.render()
 
     def _handle_key(self, ch):
         if ch is None:
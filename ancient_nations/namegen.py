@@ -2,16 +2,14 @@
 namegen.py — Procedural nation-name generator for Ancient Nations.
 
 Names are formed by combining a PREFIX stem with a SUFFIX ending.  The
-generator uses the global random module (seeded by World.__init__) so
-output is fully deterministic for a given game seed.
+generator draws from the game's 'names' stream (see rng.py), so output is
+fully deterministic for a given game seed.
 
 Uniqueness is tracked across the entire game — including civil-war respawns —
 so the same name can never appear twice in one run.  First-letter uniqueness
 is also maintained where possible so ASCII map markers stay distinct.
 """
 
-import random
-
 
 # ── Word parts ────────────────────────────────────────────────────────────────
 
@@ -51,11 +49,12 @@ class NationNameGenerator:
     """
     Generates unique nation names for one game run.
 
-    Uses the global random module, which is seeded before Game.__init__
-    runs, so names are reproducible for a given world seed.
+    rng is the game's 'names' stream, so names are reproducible for a given
+    world seed.
     """
 
-    def __init__(self):
+    def __init__(self, rng):
+        self._rng = rng
         self._used_names:   set[str] = set()
         self._used_letters: set[str] = set()
 
@@ -67,7 +66,7 @@ class NationNameGenerator:
         """
         # Primary: unique name AND unique first letter
         for _ in range(300):
-            name   = random.choice(PREFIXES) + random.choice(SUFFIXES)
+            name   = self._rng.choice(PREFIXES) + self._rng.choice(SUFFIXES)
             letter = name[0].upper()
             if name not in self._used_names and letter not in self._used_letters:
                 self._used_names.add(name)
@@ -76,7 +75,7 @@ class NationNameGenerator:
 
         # Fallback: unique name only (letters may collide)
         for _ in range(300):
-            name = random.choice(PREFIXES) + random.choice(SUFFIXES)
+            name = self._rng.choice(PREFIXES) + self._rng.choice(SUFFIXES)
             if name not in self._used_names:
                 self._used_names.add(name)
                 return name
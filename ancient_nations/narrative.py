@@ -9,6 +9,7 @@ objects, no network.  Call it on any source of game-state JSON.
     text = narrative.render(state_dict)
 """
 
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, Counter
 import math
 
@@ -59,12 +60,19 @@ def _resource_character(resource_values: dict) -> str:
     return ' but '.join(parts)
 
 
-def _battles_in(battles: list, lo: int, hi: int) -> list:
-    return [b for b in battles if lo <= b['turn'] <= hi]
+def _turn_keys(records: list) -> list | None:
+    """Turns of records when they are in turn order (as exported), else None."""
+    turns = [r['turn'] for r in records]
+    if all(a <= b for a, b in zip(turns, turns[1:])):
+        return turns
+    return None
 
 
-def _events_in(events: list, lo: int, hi: int) -> list:
-    return [e for e in events if lo <= e['turn'] <= hi]
+def _in_turns(records: list, lo: int, hi: int, turns: list | None = None) -> list:
+    """Records with lo <= turn <= hi; a slice when `turns` (from _turn_keys) is given."""
+    if turns is None:
+        return [r for r in records if lo <= r['turn'] <= hi]
+    return records[bisect_left(turns, lo):bisect_right(turns, hi)]
 
 
 def _death_info(nation: dict, battles: list) -> tuple[int | None, str | None]:
@@ -322,9 +330,11 @@ def _describe_era_events(era_events: list) -> str:
 
 def _era_paragraph(era_idx: int, lo: int, hi: int,
                    state: dict, battles: list, events: list,
-                   used_names: dict | None = None) -> str:
-    era_bat = _battles_in(battles, lo, hi)
-    era_evt = _events_in(events, lo, hi)
+                   used_names: dict | None = None,
+                   battle_turns: list | None = None,
+                   event_turns: list | None = None) -> str:
+    era_bat = _in_turns(battles, lo, hi, battle_turns)
+    era_evt = _in_turns(events, lo, hi, event_turns)
 
     base_name = _era_name(era_idx, era_bat, era_evt, state['turn'])
     if used_names is not None:
@@ -386,13 +396,18 @@ def _chronicle(state: dict) -> str:
     era_size = max(50, (turns // 6 // 50) * 50) if turns > 200 else 100
     era_size  = min(era_size, 200)
 
+    # Era slices by bisection instead of a scan per era
+    battle_turns = _turn_keys(battles)
+    event_turns  = _turn_keys(events)
+
     eras      = []
     used_names: dict[str, int] = {}
     lo   = 1
     idx  = 0
     while lo <= turns:
         hi = min(lo + era_size - 1, turns)
-        eras.append(_era_paragraph(idx, lo, hi, state, battles, events, used_names))
+        eras.append(_era_paragraph(idx, lo, hi, state, battles, events, used_names,
+                                   battle_turns, event_turns))
         lo  += era_size
         idx += 1
 
@@ -1,9 +1,13 @@
 """
 nation.py – Nation state, resource management, diplomacy tracking.
 """
-import random
+from functools import reduce
+from itertools import repeat
+from operator import add, mul
+
 from constants import *
 from entities import Town, Army
+from history import SeriesStore, new_history
 
 
 _LEADER_EPITHETS = [
@@ -16,6 +20,33 @@ _LEADER_EPITHETS = [
 ]
 
 
+class TileSet(dict):
+    """Insertion-ordered set of (x, y) tuples.
+
+    The AI samples and scans territory in iteration order, so that order is
+    simulation state.  A set's order depends on its hash-table history and
+    cannot be rebuilt after a checkpoint; a dict's can.  Each value is the
+    tile's position in that order (increasing, not dense), which lets
+    TerritoryIndex visit a few tiles in iteration order without a full scan.
+    """
+    __slots__ = ()
+
+    def __init__(self, items=()):
+        super().__init__()
+        for xy in items:
+            self.add(xy)
+
+    def add(self, xy):
+        if xy not in self:
+            self[xy] = next(reversed(self.values()), -1) + 1
+
+    def discard(self, xy):
+        self.pop(xy, None)
+
+    def __repr__(self):
+        return f'TileSet({list(self)!r})'
+
+
 class DiplomaticStatus:
     PEACE    = 'peace'
     WAR      = 'war'
@@ -24,7 +55,9 @@ class DiplomaticStatus:
 
 
 class Nation:
-    def __init__(self, idx, name, color, capital_x, capital_y, world):
+    def __init__(self, idx, name, color, capital, world, rng):
+        """capital: the Town founding the nation (from Game.new_town).
+        rng: the game's 'nations' stream, drawn for leader personalities."""
         self.idx        = idx
         self.name       = name
         self.color      = color
@@ -46,7 +79,7 @@ class Nation:
         self.armies : list[Army] = []
 
         # Territory
-        self.tiles  : set        = set()   # set of (x,y)
+        self.tiles  : TileSet    = TileSet()   # ordered set of (x,y)
 
         # Diplomacy  {other_idx: DiplomaticStatus}
         self.diplomacy      = {}
@@ -69,7 +102,8 @@ class Nation:
         self.rebellion_cooldown = 0
 
         # Leader personality: 0 = dove, 1 = hawk.  Affects war/peace thresholds.
-        self.leader_aggression = random.uniform(0.2, 0.8)
+        self._rng              = rng
+        self.leader_aggression = rng.uniform(0.2, 0.8)
         self.leader_age        = 0   # turns the current ruler has been in power
 
         # Allied to two nations who are at war with each other — builds until break.
@@ -80,16 +114,11 @@ class Nation:
         self.slot_revivals = 0
 
         # Stats history (for charts)
-        self.history = {
-            'territory': [], 'population': [], 'gold': [],
-            'food': [], 'wood': [], 'metal': [],
-            'armies': [], 'army_strength': [],
-            'battles_won': 0, 'battles_lost': 0,
-            'trades_done': 0, 'alliances_formed': 0,
-        }
+        self.reset_history()
 
         # Place capital
-        cap = Town(capital_x, capital_y, idx, is_capital=True)
+        cap = capital
+        capital_x, capital_y = cap.x, cap.y
         cap.level = 2
         cap.population = 80
         cap.gold_local = 80
@@ -127,12 +156,12 @@ class Nation:
         """Install a new ruler.  Crisis successions skew toward extremes."""
         if crisis:
             # Overthrow / assassination: 60 % chance of a hawk, else a dove
-            if random.random() < 0.60:
-                self.leader_aggression = random.uniform(0.65, 1.0)
+            if self._rng.random() < 0.60:
+                self.leader_aggression = self._rng.uniform(0.65, 1.0)
             else:
-                self.leader_aggression = random.uniform(0.0, 0.35)
+                self.leader_aggression = self._rng.uniform(0.0, 0.35)
         else:
-            self.leader_aggression = random.uniform(0.1, 0.9)
+            self.leader_aggression = self._rng.uniform(0.1, 0.9)
         self.leader_age = 0
 
     # ── capitals / cities ──────────────────────────────────────────────────
@@ -278,51 +307,71 @@ class Nation:
         return {RES_FOOD: ARMY_UPKEEP_FOOD * n}
 
     # ── resource collection ────────────────────────────────────────────────
-    def collect_resources(self, world, season_food_mul=1.0):
+    def collect_resources(self, world, season_food_mul=1.0, yields=None):
         """Gather resources from tiles in gathering radius of each town.
         Owned tiles: full yield. Neutral tiles in radius: 40%.
         Allied tiles in radius: 60% (access granted by ally).
-        Enemy tiles: blocked."""
+        Enemy tiles: blocked.
+
+        yields is an optional yields.YieldCache holding each town's
+        town_yields() table; without one the tables are built on the spot."""
+        muls = {RES_FOOD: self.trait_val('food_yield_mul', 1.0) * season_food_mul,
+                RES_GOLD: self.trait_val('gold_income_mul', 1.0)}
+        res = self.res
         for town in self.towns:
-            r = town.radius + self.trait_val('town_radius_bonus', 0)
-            for tile in world.tiles_in_radius(town.x, town.y, r):
-                owned = (tile.owner == self.idx)
-                allied_owner = (tile.owner >= 0
-                                and not owned
-                                and self.allied_with(tile.owner))
-                neutral = (tile.owner == -1)
-
-                if tile.owner >= 0 and not owned and not allied_owner:
+            table = (yields.table(self, town) if yields is not None
+                     else self.town_yields(world, town)[0])
+            for k, terms in table.items():
+                m = muls.get(k)
+                if m is not None:
+                    terms = map(mul, terms, repeat(m))
+                # One addition per term, in tile order: the same float result
+                # as accumulating tile by tile.
+                res[k] = reduce(add, terms, res[k])
+
+    def town_yields(self, world, town):
+        """Yield terms of one town's gathering radius, in tile order.
+
+        Returns ({res: [term, ...]}, foreign) where foreign is the set of
+        other nations owning tiles in the radius (their tiles count only while
+        allied).  Food terms are still to be multiplied by the food multiplier
+        and gold terms by gold_income_mul; wood and metal terms are final.
+        """
+        r = town.radius + self.trait_val('town_radius_bonus', 0)
+        food, wood, metal, gold = [], [], [], []
+        foreign = set()
+        for tile in world.tiles_in_radius(town.x, town.y, r):
+            owner = tile.owner
+            owned = (owner == self.idx)
+            if owned:
+                eff = 1.0
+            elif owner == -1:
+                eff = 0.4
+            else:
+                foreign.add(owner)
+                if not self.allied_with(owner):
                     continue  # enemy tile — no access
-
-                if owned:
-                    eff = 1.0
-                elif allied_owner:
-                    eff = 0.6
-                else:  # neutral
-                    eff = 0.4
-
-                d = tile.deposits
-                gold_mul = self.trait_val('gold_income_mul', 1.0)
-                food_mul = self.trait_val('food_yield_mul', 1.0) * season_food_mul
-                if tile.entity == 'farm' and owned:
-                    self.res[RES_FOOD] += PROD_FARM * food_mul
-                elif tile.terrain == TERRAIN_RIVER and tile.entity != 'mine':
-                    self.res[RES_FOOD] += d[RES_FOOD] * 0.5 * eff * food_mul
-                if tile.entity == 'mine' and owned:
-                    self.res[RES_METAL] += PROD_MINE
-                elif tile.terrain == TERRAIN_FOREST:
-                    self.res[RES_WOOD] += d[RES_WOOD] * 0.4 * eff
-                # Natural deposits (all terrain types)
-                for res in (RES_FOOD, RES_WOOD, RES_METAL, RES_GOLD):
-                    if d[res] > 0 and tile.entity is None:
-                        if res == RES_GOLD:
-                            mul = gold_mul
-                        elif res == RES_FOOD:
-                            mul = food_mul
-                        else:
-                            mul = 1.0
-                        self.res[res] += d[res] * 0.2 * eff * mul
+                eff = 0.6
+
+            d = tile.deposits
+            entity = tile.entity
+            if entity == 'farm' and owned:
+                food.append(PROD_FARM)
+            elif tile.terrain == TERRAIN_RIVER and entity != 'mine':
+                food.append(d[RES_FOOD] * 0.5 * eff)
+            if entity == 'mine' and owned:
+                metal.append(PROD_MINE)
+            elif tile.terrain == TERRAIN_FOREST:
+                wood.append(d[RES_WOOD] * 0.4 * eff)
+            # Natural deposits (all terrain types)
+            if entity is None:
+                for res, terms in ((RES_FOOD, food), (RES_WOOD, wood),
+                                   (RES_METAL, metal), (RES_GOLD, gold)):
+                    if d[res] > 0:
+                        terms.append(d[res] * 0.2 * eff)
+        table = {k: v for k, v in ((RES_FOOD, food), (RES_WOOD, wood),
+                                   (RES_METAL, metal), (RES_GOLD, gold)) if v}
+        return table, foreign
 
     def pay_upkeep(self):
         cost = self.army_upkeep_cost()
@@ -331,17 +380,16 @@ class Nation:
         return True
 
     # ── snapshot for charts ───────────────────────────────────────────────
+    def reset_history(self):
+        self.series  = SeriesStore(CHART_HISTORY, HISTORY_ARCHIVE)
+        self.history = new_history(self.series)
+
     def snapshot(self):
-        h = self.history
-        h['territory'].append(len(self.tiles))
-        h['population'].append(int(self.total_population()))
-        h['gold'].append(int(self.res[RES_GOLD]))
-        h['food'].append(int(self.res[RES_FOOD]))
-        h['wood'].append(int(self.res[RES_WOOD]))
-        h['metal'].append(int(self.res[RES_METAL]))
-        h['armies'].append(self.total_armies())
-        h['army_strength'].append(int(self.army_strength()))
-        for k in ('territory', 'population', 'gold', 'food', 'wood', 'metal',
-                  'armies', 'army_strength'):
-            if len(h[k]) > CHART_HISTORY:
-                h[k] = h[k][-CHART_HISTORY:]
+        self.series.record(len(self.tiles),
+                           int(self.total_population()),
+                           int(self.res[RES_GOLD]),
+                           int(self.res[RES_FOOD]),
+                           int(self.res[RES_WOOD]),
+                           int(self.res[RES_METAL]),
+                           self.total_armies(),
+                           int(self.army_strength()))
@@ -2,6 +2,7 @@
 pathfinding.py – A* pathfinding for army movement.
 """
 import heapq
+from array import array
 from constants import *
 
 # Precompute move costs once so the inner loop does no division or max() calls.
@@ -98,3 +99,561 @@ def find_path(world, sx, sy, tx, ty, nation_idx=None, allow_ocean=True,
                 came_from[key] = (cx, cy)
 
     return []   # unreachable
+
+
+# ── engine: cost grids, flat A*, region layer ─────────────────────────────────
+#
+# find_path above stays the reference.  PathService runs the same search on
+# flat integer-indexed arrays: a CostGrid per cost profile (allow_ocean,
+# road_allied) holds every tile's step cost and is patched as tiles change,
+# and heap entries are single ints packed so they order exactly like
+# find_path's (f, x, y) tuples.  Inside the usual box the result is
+# identical to find_path.  When that result has to climb a mountain (or
+# finds nothing), a second search may leave the box along a corridor of
+# outer regions chosen by a coarse Dijkstra over per-region costs.
+
+_XY_BITS = (MAP_SIZE * MAP_SIZE).bit_length()
+_XY_MASK = (1 << _XY_BITS) - 1
+_REGIONS = OUTER_SIZE * OUTER_SIZE
+_STALE   = -1
+# _NEIGHBOURS with each step's offset in a row-major flat index.
+_STEPS   = tuple((dx, dy, dy * MAP_SIZE + dx) for dx, dy in _NEIGHBOURS)
+
+
+def _search_box(sx, sy, tx, ty):
+    """The (x0, x1, y0, y1) box find_path searches for these endpoints."""
+    return (max(0,        min(sx, tx) - _BOX_MARGIN),
+            min(MAP_SIZE, max(sx, tx) + _BOX_MARGIN + 1),
+            max(0,        min(sy, ty) - _BOX_MARGIN),
+            min(MAP_SIZE, max(sy, ty) + _BOX_MARGIN + 1))
+
+
+def _box_regions(box):
+    x0, x1, y0, y1 = box
+    return [(ox, oy)
+            for oy in range(y0 // INNER_SIZE, (y1 - 1) // INNER_SIZE + 1)
+            for ox in range(x0 // INNER_SIZE, (x1 - 1) // INNER_SIZE + 1)]
+
+
+def _step_cost(t, allow_ocean, road_allied):
+    """find_path's cost of entering tile t; 0 if it may not be entered."""
+    terrain = t.terrain
+    if terrain == TERRAIN_MOUNTAIN:
+        return _COST_MOUNTAIN
+    if terrain == TERRAIN_OCEAN:
+        return _COST_OCEAN if allow_ocean else 0
+    if terrain == TERRAIN_RIVER:
+        return _COST_RIVER
+    if t.road or (t.owner in road_allied):
+        return _COST_ROAD
+    return _COST_PLAIN
+
+
+def _grid_costs(grid, allow_ocean, road_allied):
+    """_step_cost of every cell, read straight from a WorldGrid's arrays."""
+    ocean = _COST_OCEAN if allow_ocean else 0
+    fixed = {TERRAIN_MOUNTAIN: _COST_MOUNTAIN, TERRAIN_OCEAN: ocean, TERRAIN_RIVER: _COST_RIVER}
+    return array('H', [fixed[terrain] if terrain in fixed
+                       else _COST_ROAD if road or owner in road_allied
+                       else _COST_PLAIN
+                       for terrain, road, owner in zip(grid.terrain, grid.road, grid.owner)])
+
+
+class CostGrid:
+    """Step cost of entering every tile under one profile (0 = impassable)."""
+
+    def __init__(self, world, allow_ocean=True, road_allied=frozenset()):
+        self.allow_ocean = allow_ocean
+        self.road_allied = road_allied
+        if world.grid is not None:
+            self.cost = _grid_costs(world.grid, allow_ocean, road_allied)
+        else:
+            self.cost = array('H', [_step_cost(t, allow_ocean, road_allied)
+                                    for row in world.tiles for t in row])
+        self.version = 0          # bumped whenever a cost changes
+        self._region_cost = [_STALE] * _REGIONS
+
+    @classmethod
+    def from_costs(cls, cost, allow_ocean=True, road_allied=frozenset()):
+        """A detached grid over an array of costs (used by batch workers)."""
+        grid = cls.__new__(cls)
+        grid.allow_ocean = allow_ocean
+        grid.road_allied = road_allied
+        grid.cost    = cost
+        grid.version = 0
+        grid._region_cost = [_STALE] * _REGIONS
+        return grid
+
+    def refresh(self, world, x, y):
+        """Re-derive (x, y)'s cost; True if it changed."""
+        c = _step_cost(world.t(x, y), self.allow_ocean, self.road_allied)
+        i = y * MAP_SIZE + x
+        if c == self.cost[i]:
+            return False
+        self.cost[i] = c
+        self.version += 1
+        self._region_cost[(y // INNER_SIZE) * OUTER_SIZE + x // INNER_SIZE] = _STALE
+        return True
+
+    def region_cost(self, r):
+        """Typical cost of a step through outer region r (median passable
+        tile), or None if nothing in it can be entered."""
+        c = self._region_cost[r]
+        if c == _STALE:
+            oy, ox = divmod(r, OUTER_SIZE)
+            costs = sorted(v for y in range(oy * INNER_SIZE, (oy + 1) * INNER_SIZE)
+                           for v in self.cost[y * MAP_SIZE + ox * INNER_SIZE:
+                                              y * MAP_SIZE + (ox + 1) * INNER_SIZE]
+                           if v)
+            c = self._region_cost[r] = costs[len(costs) // 2] if costs else None
+        return c
+
+    def corridor(self, sx, sy, tx, ty):
+        """Regions (a bytearray flag per outer region) along the cheapest
+        region-level route from start to goal, widened by one region on every
+        side; None if the goal's region cannot be reached."""
+        start = (sy // INNER_SIZE) * OUTER_SIZE + sx // INNER_SIZE
+        goal  = (ty // INNER_SIZE) * OUTER_SIZE + tx // INNER_SIZE
+        dist, prev = {start: 0}, {}
+        heap = [(0, start)]
+        while heap:
+            d, r = heapq.heappop(heap)
+            if r == goal:
+                break
+            if d != dist[r]:
+                continue
+            oy, ox = divmod(r, OUTER_SIZE)
+            for dx, dy in _NEIGHBOURS:
+                nx, ny = ox + dx, oy + dy
+                if 0 <= nx < OUTER_SIZE and 0 <= ny < OUTER_SIZE:
+                    q = ny * OUTER_SIZE + nx
+                    c = self.region_cost(q)
+                    if c is None:
+                        continue
+                    nd = d + c * INNER_SIZE
+                    if nd < dist.get(q, nd + 1):
+                        dist[q] = nd
+                        prev[q] = r
+                        heapq.heappush(heap, (nd, q))
+        if goal not in dist:
+            return None
+        flags = bytearray(_REGIONS)
+        r = goal
+        while True:
+            oy, ox = divmod(r, OUTER_SIZE)
+            for ny in range(max(0, oy - 1), min(OUTER_SIZE, oy + 2)):
+                for nx in range(max(0, ox - 1), min(OUTER_SIZE, ox + 2)):
+                    flags[ny * OUTER_SIZE + nx] = 1
+            if r == start:
+                return flags
+            r = prev[r]
+
+
+class SearchBuffers:
+    """Reusable per-tile scratch arrays for A* over a CostGrid.
+
+    Generation stamps mark which entries belong to the current search, so
+    nothing is cleared between searches.
+    """
+
+    def __init__(self):
+        n = MAP_SIZE * MAP_SIZE
+        self.g      = array('l', [0]) * n
+        self.came   = array('l', [0]) * n
+        self.seen   = array('L', [0]) * n
+        self.closed = array('L', [0]) * n
+        self.gen    = 0
+
+    def search(self, cost, sx, sy, tx, ty, box, regions=None):
+        """A* from (sx, sy) to (tx, ty) over cost, inside box (and, if given,
+        any outer region flagged in regions).  Returns (path, total cost) —
+        path excludes the start — or ([], None) if the goal is unreachable.
+        Inside a box alone, the path is exactly find_path's.
+        """
+        if sx == tx and sy == ty:
+            return [], 0
+        self.gen += 1
+        gen = self.gen
+        g, came, seen, closed = self.g, self.came, self.seen, self.closed
+        x0, x1, y0, y1 = box
+        goal  = ty * MAP_SIZE + tx
+        start = sy * MAP_SIZE + sx
+        g[start]    = 0
+        seen[start] = gen
+        heap = [sx * MAP_SIZE + sy]          # f = 0
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            xy = pop(heap) & _XY_MASK
+            cx, cy = divmod(xy, MAP_SIZE)
+            i = cy * MAP_SIZE + cx
+            if closed[i] == gen:
+                continue
+            closed[i] = gen
+            if i == goal:
+                path = []
+                while i != start:
+                    path.append((i % MAP_SIZE, i // MAP_SIZE))
+                    i = came[i]
+                path.reverse()
+                return path, g[goal]
+            cur_g = g[i]
+            for dx, dy, di in _STEPS:
+                nx, ny = cx + dx, cy + dy
+                if nx < x0 or nx >= x1 or ny < y0 or ny >= y1:
+                    if (regions is None or nx < 0 or nx >= MAP_SIZE
+                            or ny < 0 or ny >= MAP_SIZE
+                            or not regions[(ny // INNER_SIZE) * OUTER_SIZE
+                                           + nx // INNER_SIZE]):
+                        continue
+                j = i + di
+                c = cost[j]
+                if not c or closed[j] == gen:
+                    continue
+                new_g = cur_g + c
+                if seen[j] != gen or new_g < g[j]:
+                    g[j]    = new_g
+                    seen[j] = gen
+                    came[j] = i
+                    f = new_g + (nx - tx if nx > tx else tx - nx) + (ny - ty if ny > ty else ty - ny)
+                    push(heap, (f << _XY_BITS) | (nx * MAP_SIZE + ny))
+        return [], None
+
+
+class FlowField:
+    """Cost-to-goal for tiles around one goal (reverse Dijkstra).
+
+    Any number of armies can then walk to the goal without searching: each
+    step goes to the first neighbour (in _NEIGHBOURS order) on a cheapest
+    route.  Paths are optimal under the CostGrid but, unlike find_path, not
+    confined to a box around the endpoints.
+
+    The Dijkstra runs lazily: it stops as soon as every start asked about
+    so far is settled and resumes for the next one.  Since settling a start
+    settles everything cheaper, paths are the same as from a full field.
+    """
+    __slots__ = ('goal', 'dist', 'cost', 'settled', '_heap')
+
+    def __init__(self, cost, tx, ty):
+        goal = ty * MAP_SIZE + tx
+        self.goal    = (tx, ty)
+        self.dist    = [None] * (MAP_SIZE * MAP_SIZE)
+        self.dist[goal] = 0
+        self.cost    = cost
+        self.settled = bytearray(MAP_SIZE * MAP_SIZE)
+        self._heap   = [(0, goal)]
+
+    def expand(self, starts=None):
+        """Run the Dijkstra until every index in starts is settled (all if None)."""
+        dist, cost, settled, heap = self.dist, self.cost, self.settled, self._heap
+        left = None if starts is None else {i for i in starts if not settled[i]}
+        while heap and (left is None or left):
+            d, i = heapq.heappop(heap)
+            if d != dist[i] or settled[i]:
+                continue
+            settled[i] = 1
+            if left is not None:
+                left.discard(i)
+            c = cost[i]
+            if not c:
+                continue              # impassable: nothing routes through it
+            x, y = i % MAP_SIZE, i // MAP_SIZE
+            nd = d + c                # moving from a neighbour onto i costs cost[i]
+            for dx, dy in _NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < MAP_SIZE and 0 <= ny < MAP_SIZE:
+                    j = ny * MAP_SIZE + nx
+                    if dist[j] is None or nd < dist[j]:
+                        dist[j] = nd
+                        heapq.heappush(heap, (nd, j))
+
+    def path_from(self, sx, sy):
+        """Steps from (sx, sy) to the goal, not including the start; [] if unreachable."""
+        dist, cost = self.dist, self.cost
+        i = sy * MAP_SIZE + sx
+        if not self.settled[i]:
+            self.expand((i,))
+        if not self.settled[i] or (sx, sy) == self.goal:
+            return []
+        path = []
+        x, y = sx, sy
+        while dist[i]:
+            for dx, dy in _NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < MAP_SIZE and 0 <= ny < MAP_SIZE:
+                    j = ny * MAP_SIZE + nx
+                    if cost[j] and dist[j] is not None and cost[j] + dist[j] == dist[i]:
+                        break
+            x, y, i = nx, ny, j
+            path.append((x, y))
+        return path
+
+
+def _route(grid, buffers, sx, sy, tx, ty):
+    """PathService's search: (path, box it depended on), box None when the
+    region corridor was consulted."""
+    cost = grid.cost
+    box  = _search_box(sx, sy, tx, ty)
+    path, total = buffers.search(cost, sx, sy, tx, ty, box)
+    if total is not None and all(
+            cost[y * MAP_SIZE + x] < _COST_MOUNTAIN for x, y in path):
+        return path, box
+    regions = grid.corridor(sx, sy, tx, ty)
+    if regions is not None:
+        wide, wide_total = buffers.search(cost, sx, sy, tx, ty, box, regions)
+        if wide_total is not None and (total is None or wide_total < total):
+            path = wide
+    return path, None
+
+
+def _route_batch(costs, jobs):
+    """Worker side of PathService.submit: route every (sx, sy, tx, ty, profile)
+    job over detached copies of the profiles' cost arrays."""
+    buffers = SearchBuffers()
+    grids = {profile: CostGrid.from_costs(cost, *profile)
+             for profile, cost in costs.items()}
+    return [_route(grids[job[4]], buffers, *job[:4]) for job in jobs]
+
+
+class PathRequest:
+    """One path wanted in a batch (see PathService.submit)."""
+    __slots__ = ('sx', 'sy', 'tx', 'ty', 'allow_ocean', 'road_allied', 'shared')
+
+    def __init__(self, sx, sy, tx, ty, allow_ocean=True, road_allied=None,
+                 shared=False):
+        self.sx, self.sy, self.tx, self.ty = sx, sy, tx, ty
+        self.allow_ocean = allow_ocean
+        self.road_allied = road_allied
+        self.shared      = shared      # goal many armies share: use toward()
+
+
+def find_paths_batch(world, requests, service=None):
+    """Paths for a list of PathRequests, in order.
+
+    All requests share one PathService — its cost grids, search buffers and
+    result cache — and requests flagged shared with the same goal share one
+    FlowField.  Pass the world's service (game.paths) to reuse its cache; by
+    default a temporary one is built and detached again.
+    """
+    own = service is None
+    if own:
+        service = PathService(world)
+    out = []
+    try:
+        service.submit(requests, out.extend)
+        service.settle()
+    finally:
+        if own:
+            service.detach()
+    return out
+
+
+# ── path service ──────────────────────────────────────────────────────────────
+
+class PathService:
+    """Pathfinding for one world: cost grids, cached results, flow fields.
+
+    path() searches like find_path on the flat engine, except that a route
+    which has to climb a mountain (or fails) inside the box may be replaced
+    by a strictly cheaper one through a wider region corridor.  Results are
+    cached until a tile they could have used changes cost: anything in the
+    box for ordinary results, anything at all for corridor-checked ones.
+    toward() is for goals many armies share (enemy capitals): once a goal
+    has been asked for FIELD_MIN_REQUESTS times without its costs changing,
+    it is served from a single FlowField instead of one search per army.
+
+    submit() takes a whole batch of PathRequests.  With workers enabled
+    (use_workers) its uncached searches run on a snapshot of the cost grids
+    in a thread or process pool, and the results are delivered by the next
+    settle(); they are the same paths a synchronous search would return.
+    """
+
+    CACHE_SIZE = 4096
+    MAX_FIELDS = 16
+    FIELD_MIN_REQUESTS = 8
+
+    def __init__(self, world):
+        self.world = world
+        self._changed = set()
+        world.tile_watchers.append(self._changed)
+        self._grids     = {}   # profile -> CostGrid
+        self._buffers   = SearchBuffers()
+        self._paths     = {}   # (sx, sy, tx, ty, profile) -> (path tuple, box or None)
+        self._by_region = {}   # (ox, oy) -> boxed keys whose box overlaps it
+        self._wide      = {}   # profile -> keys that depend on the whole map
+        self._fields    = {}   # ((tx, ty), profile) -> FlowField
+        self._demand    = {}   # ((tx, ty), profile) -> toward() calls since last change
+        self._pending   = []   # submitted batches awaiting settle()
+        self.executor   = None
+        self.hits = self.misses = 0
+
+    def use_workers(self, workers, kind='process'):
+        """Search submitted batches in a pool of `workers` threads or
+        processes; 0 turns workers off again."""
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        self.settle()
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.executor = None
+        if workers > 0:
+            pool = ProcessPoolExecutor if kind == 'process' else ThreadPoolExecutor
+            self.executor = pool(max_workers=workers)
+
+    def detach(self):
+        """Stop following world changes (for throwaway services)."""
+        self.settle()
+        self.world.unwatch(self._changed)
+
+    def __getstate__(self):
+        # Pools and scratch buffers are not simulation state.
+        self.settle()
+        state = self.__dict__.copy()
+        state['executor'] = None
+        del state['_buffers']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._buffers = SearchBuffers()
+
+    def grid(self, allow_ocean=True, road_allied=None):
+        """The up-to-date CostGrid for a profile."""
+        if self._changed:
+            self._flush()
+        return self._grid((allow_ocean, frozenset(road_allied or ())))
+
+    def _grid(self, profile):
+        grid = self._grids.get(profile)
+        if grid is None:
+            grid = self._grids[profile] = CostGrid(self.world, *profile)
+        return grid
+
+    # ── queries ───────────────────────────────────────────────────────────
+    def path(self, sx, sy, tx, ty, nation_idx=None, allow_ocean=True,
+             road_allied=None):
+        """Same arguments and result shape as find_path (see class docstring)."""
+        if sx == tx and sy == ty:
+            return []
+        if self._changed:
+            self._flush()
+        profile = (allow_ocean, frozenset(road_allied or ()))
+        key = (sx, sy, tx, ty, profile)
+        hit = self._paths.pop(key, None)
+        if hit is not None:
+            self._paths[key] = hit           # most recently used last
+            self.hits += 1
+            return list(hit[0])
+        self.misses += 1
+        path, box = _route(self._grid(profile), self._buffers, sx, sy, tx, ty)
+        self._store(key, path, box)
+        return path
+
+    def _store(self, key, path, box):
+        self._paths[key] = (tuple(path), box)
+        if box is None:
+            self._wide.setdefault(key[4], set()).add(key)
+        else:
+            for region in _box_regions(box):
+                self._by_region.setdefault(region, set()).add(key)
+        if len(self._paths) > self.CACHE_SIZE:
+            self._drop_path(next(iter(self._paths)))
+
+    def toward(self, sx, sy, tx, ty, allow_ocean=True, road_allied=None):
+        """Path to a goal many armies share; a FlowField once it is popular."""
+        if self._changed:
+            self._flush()
+        profile = (allow_ocean, frozenset(road_allied or ()))
+        key = ((tx, ty), profile)
+        field = self._fields.pop(key, None)
+        if field is None:
+            demand = self._demand[key] = self._demand.get(key, 0) + 1
+            if demand < self.FIELD_MIN_REQUESTS:
+                return self.path(sx, sy, tx, ty, None, allow_ocean, road_allied)
+            field = FlowField(self._grid(profile).cost, tx, ty)
+            if len(self._fields) >= self.MAX_FIELDS:
+                del self._fields[next(iter(self._fields))]
+        self._fields[key] = field
+        return field.path_from(sx, sy)
+
+    # ── batches ───────────────────────────────────────────────────────────
+    def submit(self, requests, done):
+        """Route a batch of PathRequests; done(paths) receives the paths in
+        request order.
+
+        Shared requests and cache hits are answered at once.  Without an
+        executor the remaining searches run here and done is called before
+        submit returns; otherwise they run in the pool over a snapshot of
+        today's costs and done is called by settle().
+        """
+        if self._changed:
+            self._flush()
+        paths = [None] * len(requests)
+        jobs  = {}                       # uncached key -> request indices
+        for i, r in enumerate(requests):
+            if r.shared:
+                paths[i] = self.toward(r.sx, r.sy, r.tx, r.ty,
+                                       r.allow_ocean, r.road_allied)
+                continue
+            profile = (r.allow_ocean, frozenset(r.road_allied or ()))
+            key = (r.sx, r.sy, r.tx, r.ty, profile)
+            if self.executor is None or key in self._paths or (r.sx, r.sy) == (r.tx, r.ty):
+                paths[i] = self.path(r.sx, r.sy, r.tx, r.ty, None,
+                                     r.allow_ocean, r.road_allied)
+            else:
+                jobs.setdefault(key, []).append(i)
+        if not jobs:
+            done(paths)
+            return
+        grids = {key[4]: self._grid(key[4]) for key in jobs}
+        costs = {profile: grid.cost[:] for profile, grid in grids.items()}
+        versions = {profile: grid.version for profile, grid in grids.items()}
+        future = self.executor.submit(_route_batch, costs, list(jobs))
+        self._pending.append((future, versions, jobs, paths, done))
+
+    def settle(self):
+        """Deliver every submitted batch, in submission order."""
+        pending, self._pending = self._pending, []
+        if pending and self._changed:
+            self._flush()
+        for future, versions, jobs, paths, done in pending:
+            for key, (path, box) in zip(jobs, future.result()):
+                self.misses += 1
+                # Cache it unless the profile's costs moved on meanwhile.
+                if self._grids[key[4]].version == versions[key[4]]:
+                    self._store(key, path, box)
+                for i in jobs[key]:
+                    paths[i] = list(path)
+            done(paths)
+
+    # ── invalidation ──────────────────────────────────────────────────────
+    def _flush(self):
+        world = self.world
+        for x, y in self._changed:
+            for profile, grid in self._grids.items():
+                if grid.refresh(world, x, y):
+                    self._invalidate(profile, x, y)
+        self._changed.clear()
+
+    def _invalidate(self, profile, x, y):
+        """Forget profile's results that could have used tile (x, y)."""
+        region = (x // INNER_SIZE, y // INNER_SIZE)
+        for key in list(self._by_region.get(region, ())):
+            x0, x1, y0, y1 = self._paths[key][1]
+            if key[4] == profile and x0 <= x < x1 and y0 <= y < y1:
+                self._drop_path(key)
+        for key in list(self._wide.get(profile, ())):
+            self._drop_path(key)
+        for key in [k for k in self._fields if k[1] == profile]:
+            del self._fields[key]
+        for key in [k for k in self._demand if k[1] == profile]:
+            del self._demand[key]
+
+    def _drop_path(self, key):
+        _, box = self._paths.pop(key)
+        if box is None:
+            self._wide[key[4]].discard(key)
+            return
+        for region in _box_regions(box):
+            keys = self._by_region[region]
+            keys.discard(key)
+            if not keys:
+                del self._by_region[region]
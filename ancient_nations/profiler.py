@@ -0,0 +1,159 @@
+"""
+profiler.py – Where a turn's time goes.
+
+TurnProfiler records wall time per turn phase (the numbered steps of
+Game.process_turn), per nation and per step of NationAI.tick, plus call
+counts for the hot helpers and the net number of allocated memory blocks
+per phase.
+
+Instrumentation is opt-in: Game.process_turn and NationAI.tick only test
+`game.profiler` at phase boundaries (a dozen times a turn), and the call
+counters are wrappers installed by attach() and removed by detach().  With
+no profiler attached nothing is wrapped and nothing is timed.
+
+Time is kept per stack of labels, e.g. ('ai', 'Akkad', 'armies'), as self
+time — so folded() is directly usable by flamegraph.pl / speedscope, and
+summary() adds it up into per-phase and per-nation totals.
+
+    prof = TurnProfiler().attach(game)
+    for _ in range(100):
+        game.process_turn()
+    prof.detach()
+    prof.summary()
+"""
+import sys
+import time
+from collections import Counter
+
+import pathfinding
+
+# Process-turn phases, in order (see Game.process_turn).
+PHASES = ('collection', 'dividends', 'growth', 'ai', 'abandonment', 'upkeep',
+          'events', 'eliminations', 'snapshot')
+
+
+class TurnProfiler:
+    """Phase timer and call counter for one Game."""
+
+    def __init__(self):
+        self.self_time = Counter()   # label stack -> seconds spent there itself
+        self.allocs    = Counter()   # label stack -> net allocated blocks
+        self.calls     = Counter()   # helper name -> calls
+        self.turns     = 0
+        self.last_turn = {}          # phase -> seconds, for the latest turn
+        self._stack    = ()
+        self._t        = 0.0
+        self._blocks   = 0
+        self._game     = None
+        self._undo     = []
+
+    # ── wiring ────────────────────────────────────────────────────────────
+    def attach(self, game):
+        """Start profiling game; returns self."""
+        self._game = game
+        game.profiler = self
+        calls = self.calls
+
+        def count(name, fn):
+            def wrapper(*args, **kwargs):
+                calls[name] += 1
+                return fn(*args, **kwargs)
+            return wrapper
+
+        world, combat = game.world, game.combat
+        self._patch(world, 'tiles_in_radius', count('tiles_in_radius', world.tiles_in_radius))
+        self._patch(combat, 'resolve', count('resolve_battle', combat.resolve))
+        # find_path is the reference search; PathService runs the same search
+        # through _route, so both count as searches.
+        self._patch(pathfinding, 'find_path', count('find_path', pathfinding.find_path))
+        self._patch(pathfinding, '_route', count('path_search', pathfinding._route))
+        return self
+
+    def _patch(self, owner, name, value):
+        had = name in vars(owner)
+        self._undo.append((owner, name, vars(owner).get(name), had))
+        setattr(owner, name, value)
+
+    def detach(self):
+        """Stop profiling and remove every wrapper."""
+        for owner, name, old, had in reversed(self._undo):
+            if had:
+                setattr(owner, name, old)
+            else:
+                delattr(owner, name)
+        self._undo.clear()
+        if self._game is not None and self._game.profiler is self:
+            self._game.profiler = None
+        self._game = None
+
+    # ── markers (called by Game.process_turn and NationAI.tick) ──────────
+    def begin_turn(self):
+        self.last_turn = {}
+        self._t = time.perf_counter()
+        self._blocks = sys.getallocatedblocks()
+        self._stack = ()
+
+    def phase(self, name):
+        """Enter top-level phase name (ends the previous one)."""
+        self._switch((name,))
+
+    def push(self, *labels):
+        self._switch(self._stack + labels)
+
+    def step(self, label):
+        """Replace the innermost label (next step at the same depth)."""
+        self._switch(self._stack[:-1] + (label,))
+
+    def pop(self, depth=1):
+        self._switch(self._stack[:-depth])
+
+    def end_turn(self):
+        self._switch(())
+        self.turns += 1
+
+    def _switch(self, stack):
+        now, blocks = time.perf_counter(), sys.getallocatedblocks()
+        if self._stack:
+            dt = now - self._t
+            self.self_time[self._stack] += dt
+            self.allocs[self._stack] += blocks - self._blocks
+            top = self._stack[0]
+            self.last_turn[top] = self.last_turn.get(top, 0.0) + dt
+        self._t, self._blocks, self._stack = now, blocks, stack
+
+    # ── reports ───────────────────────────────────────────────────────────
+    def turn_dict(self):
+        """Milliseconds per phase for the latest turn (NDJSON stream field)."""
+        return {k: round(v * 1000, 3) for k, v in self.last_turn.items()}
+
+    def summary(self):
+        """JSON-safe totals: per phase, per nation and AI step, helper calls."""
+        phases, nations = {}, {}
+        for stack, secs in self.self_time.items():
+            p = phases.setdefault(stack[0], {'ms': 0.0, 'alloc_blocks': 0})
+            p['ms'] += secs * 1000
+            p['alloc_blocks'] += self.allocs[stack]
+            if stack[0] == 'ai' and len(stack) > 1:
+                nat = nations.setdefault(stack[1], {'ms': 0.0, 'steps': {}})
+                nat['ms'] += secs * 1000
+                if len(stack) > 2:
+                    nat['steps'][stack[2]] = nat['steps'].get(stack[2], 0.0) + secs * 1000
+        total = sum(self.self_time.values()) * 1000
+
+        def rnd(d):
+            return {k: round(v, 3) if isinstance(v, float) else v for k, v in d.items()}
+
+        return {
+            'turns':    self.turns,
+            'total_ms': round(total, 3),
+            'ms_per_turn': round(total / self.turns, 3) if self.turns else 0.0,
+            'phases':   {k: rnd(phases[k]) for k in PHASES if k in phases},
+            'nations':  {k: {'ms': round(v['ms'], 3), 'steps': rnd(v['steps'])}
+                         for k, v in sorted(nations.items(), key=lambda kv: -kv[1]['ms'])},
+            'calls':    dict(sorted(self.calls.items())),
+        }
+
+    def folded(self):
+        """Collapsed stacks ("turn;ai;Akkad;armies <microseconds>" per line)."""
+        return ''.join(f"turn;{';'.join(stack)} {round(secs * 1e6)}\n"
+                       for stack, secs in sorted(self.self_time.items()) if secs > 0)
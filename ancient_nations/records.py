@@ -0,0 +1,120 @@
+"""
+records.py – Append-only, turn-indexed stores for battles and world events.
+
+game.battles and game.events_history only ever grow, a turn at a time, so
+each is a TurnLog: the records in order plus an offset table giving, for
+every turn, the position of its first record.  The records of one turn or
+a range of turns are then a slice — turn_summary (every streamed line) and
+`--from` filters cost O(records returned) instead of a scan of the whole
+history.  Optional per-nation and per-outer-region position lists answer
+nation and location queries the same way.
+
+A TurnLog reads like the list it replaces (len, iteration, indexing,
+slicing).  Records must be appended in non-decreasing turn order.
+"""
+from bisect import bisect_left
+from itertools import islice
+
+from constants import *
+
+
+class TurnLog:
+    """Records with a `turn` attribute, indexed by turn (and optionally by
+    nation and outer region).
+
+    nations(rec) -> iterable of nation indices a record involves;
+    where(rec)   -> its (x, y) tile.  Both must be module-level functions so
+    the log pickles with the game.
+    """
+
+    def __init__(self, nations=None, where=None):
+        self._items   = []
+        self._first   = [0]       # turn -> position of its first record
+        self._nations = nations
+        self._where   = where
+        self._by_nation = {}      # nation idx -> positions
+        self._by_region = {}      # (ox, oy)   -> positions
+
+    # ── writing ───────────────────────────────────────────────────────────
+    def append(self, rec):
+        turn, first, pos = rec.turn, self._first, len(self._items)
+        if turn < len(first) - 1:
+            raise ValueError(f'record for turn {turn} after turn {len(first) - 1}')
+        while len(first) <= turn:
+            first.append(pos)
+        self._items.append(rec)
+        if self._nations is not None:
+            for idx in set(self._nations(rec)):
+                self._by_nation.setdefault(idx, []).append(pos)
+        if self._where is not None:
+            x, y = self._where(rec)
+            self._by_region.setdefault((x // INNER_SIZE, y // INNER_SIZE), []).append(pos)
+
+    def extend(self, recs):
+        for rec in recs:
+            self.append(rec)
+
+    # ── list protocol ─────────────────────────────────────────────────────
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    # ── queries ───────────────────────────────────────────────────────────
+    def index(self, turn):
+        """Position of the first record with turn >= `turn`."""
+        if turn <= 0:
+            return 0
+        return self._first[turn] if turn < len(self._first) else len(self._items)
+
+    def between(self, lo=None, hi=None):
+        """Records with lo <= turn <= hi (either bound may be None)."""
+        start = 0 if lo is None else self.index(lo)
+        stop  = len(self._items) if hi is None else self.index(hi + 1)
+        return self._items[start:stop]
+
+    def turn(self, t):
+        """Records of turn t."""
+        return self.between(t, t)
+
+    def since(self, t):
+        """Records with turn >= t."""
+        return self._items[self.index(t):]
+
+    def _pick(self, positions, lo, hi):
+        start = bisect_left(positions, 0 if lo is None else self.index(lo))
+        stop  = len(positions) if hi is None else bisect_left(positions, self.index(hi + 1))
+        items = self._items
+        return [items[p] for p in islice(positions, start, stop)]
+
+    def for_nation(self, idx, lo=None, hi=None):
+        """Records involving nation idx, optionally within a turn range."""
+        return self._pick(self._by_nation.get(idx, ()), lo, hi)
+
+    def in_region(self, ox, oy, lo=None, hi=None):
+        """Records located in outer region (ox, oy), optionally within a turn range."""
+        return self._pick(self._by_region.get((ox, oy), ()), lo, hi)
+
+
+def battle_nations(b):
+    return (b.atk_nation, b.def_nation) if b.def_nation >= 0 else (b.atk_nation,)
+
+
+def battle_where(b):
+    return b.x, b.y
+
+
+def event_where(e):
+    return e.cx, e.cy
+
+
+def battle_log():
+    return TurnLog(nations=battle_nations, where=battle_where)
+
+
+def event_log():
+    return TurnLog(where=event_where)
@@ -0,0 +1,51 @@
+"""
+rng.py – Per-game random streams.
+
+Every Game owns a RandomStreams: one random.Random per subsystem, each seeded
+from the world seed and the subsystem's name.  Nothing in the simulation
+touches the global random module, so any number of sessions can run in one
+process (or in threads) and each stays reproducible from its seed alone.
+Separate streams also keep subsystems independent: changing how often the
+AI draws does not reshuffle event or combat rolls.
+
+branch(label) reseeds every stream from its own state and the label, in
+place (nations, the AI and the event manager keep references to the
+streams), so a forked game diverges from its parent but stays reproducible.
+
+World owns its own random.Random(seed) for map generation, which draws
+exactly what random.seed(seed) used to, so maps are unchanged.
+"""
+import random
+
+# Subsystem → what draws from it.
+STREAMS = {
+    'setup':   'trait pool and spawn-point shuffles',
+    'names':   'nation and town names',
+    'nations': 'leader personalities',
+    'ai':      'NationAI decisions',
+    'combat':  'battle dice',
+    'events':  'world events',
+    'turn':    'Game turn processing (rebels, famine, upkeep)',
+}
+
+
+class RandomStreams:
+    """Independent, named random.Random substreams for one game."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        for name in STREAMS:
+            # String seeds hash via SHA-512: stable across runs and platforms.
+            setattr(self, name, random.Random(f'{seed}/{name}'))
+
+    def getstate(self):
+        return {name: getattr(self, name).getstate() for name in STREAMS}
+
+    def setstate(self, state):
+        for name in STREAMS:
+            getattr(self, name).setstate(state[name])
+
+    def branch(self, label):
+        for name in STREAMS:
+            r = getattr(self, name)
+            r.seed(f'{self.seed}/{name}/{label}/{r.getrandbits(64)}')
@@ -0,0 +1,183 @@
+"""
+serialize.py – Streaming output for large CLI responses.
+
+`cli.py run` over a long game prints tens of thousands of battle records;
+building them all as dicts and then one json.dumps string holds three
+copies of the output in memory.  write() instead walks the top-level dict
+and writes each value as it goes; a value wrapped in Rows(items, fn) is
+converted a small batch of records at a time while it is written, so the
+whole list never exists as dicts at once.
+
+Backends (all optional except json):
+    json     stdlib; output is byte-for-byte json.dumps(obj) (or indent=2)
+    orjson   faster JSON; compact separators, same indent=2 layout
+    msgpack  binary MessagePack of the same structure
+
+Pick one with `--encoder` on run / query / battles.
+"""
+import json
+from itertools import batched
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ENCODERS = ('json', 'orjson', 'msgpack')
+_CHUNK = 1 << 16
+_BATCH = 256
+
+
+class Rows:
+    """fn(item) for each of items, produced lazily while being written."""
+
+    __slots__ = ('items', 'fn')
+
+    def __init__(self, items, fn):
+        self.items = items
+        self.fn    = fn
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return map(self.fn, self.items)
+
+
+def _default(o):
+    # Rows nested below the top level are written as plain lists.
+    if isinstance(o, Rows):
+        return list(o)
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def available(encoder):
+    return {'json': True, 'orjson': orjson is not None,
+            'msgpack': msgpack is not None}[encoder]
+
+
+def write(out, obj, encoder='json', pretty=False):
+    """Write obj to binary stream out, streaming its top level and any Rows."""
+    if not available(encoder):
+        raise RuntimeError(f'{encoder} is not installed')
+    if encoder == 'msgpack':
+        _MsgpackWriter(out).value(obj)
+    else:
+        _JSONWriter(out, encoder, pretty).document(obj)
+
+
+class _Buffered:
+    def __init__(self, out):
+        self.out   = out
+        self.parts = []
+        self.size  = 0
+
+    def put(self, b):
+        self.parts.append(b)
+        self.size += len(b)
+        if self.size >= _CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.out.write(b''.join(self.parts))
+            self.parts.clear()
+            self.size = 0
+
+
+class _JSONWriter(_Buffered):
+    def __init__(self, out, encoder, pretty):
+        super().__init__(out)
+        self.pretty = pretty
+        if encoder == 'orjson':
+            opt = orjson.OPT_INDENT_2 if pretty else 0
+            self.dumps = lambda v: orjson.dumps(v, default=_default, option=opt)
+            self.item_sep, self.key_sep = b',', b':'
+        else:
+            # One encoder for the whole document (json.dumps builds one per call).
+            encode = json.JSONEncoder(indent=2 if pretty else None, default=_default).encode
+            self.dumps = lambda v: encode(v).encode()
+            self.item_sep, self.key_sep = b', ', b': '
+        if pretty:
+            self.item_sep, self.key_sep = b',', b': '
+
+    def document(self, obj):
+        self.value(obj, 0, top=True)
+        self.put(b'\n')
+        self.flush()
+
+    def _newline(self, depth):
+        return b'\n' + b'  ' * depth if self.pretty else b''
+
+    def value(self, v, depth, top=False):
+        if top and isinstance(v, dict):
+            self._items(((self.dumps(k) + self.key_sep, x) for k, x in v.items()),
+                        depth, b'{', b'}')
+        elif isinstance(v, Rows):
+            self._rows(v, depth)
+        else:
+            self.put(self._indented(self.dumps(v), depth))
+
+    def _indented(self, text, depth):
+        if self.pretty and depth:
+            text = text.replace(b'\n', b'\n' + b'  ' * depth)
+        return text
+
+    def _rows(self, rows, depth):
+        # Rows are encoded _BATCH at a time as a list, minus its brackets:
+        # far fewer encoder calls, still only _BATCH records alive at once.
+        self.put(b'[')
+        first = True
+        for batch in batched(rows, _BATCH):
+            text = self.dumps(list(batch))[1:-1]
+            if self.pretty:
+                text = text[:-1]                # the newline before ']'
+            if not first:
+                self.put(self.item_sep)
+            self.put(self._indented(text, depth))
+            first = False
+        if not first:
+            self.put(self._newline(depth))
+        self.put(b']')
+
+    def _items(self, pairs, depth, open_, close):
+        self.put(open_)
+        first = True
+        for prefix, x in pairs:
+            if not first:
+                self.put(self.item_sep)
+            self.put(self._newline(depth + 1) + prefix)
+            self.value(x, depth + 1)
+            first = False
+        if not first:
+            self.put(self._newline(depth))
+        self.put(close)
+
+
+class _MsgpackWriter(_Buffered):
+    def __init__(self, out):
+        super().__init__(out)
+        self.packer = msgpack.Packer(default=_default)
+
+    def value(self, obj):
+        self._value(obj, top=True)
+        self.flush()
+
+    def _value(self, v, top=False):
+        pk = self.packer
+        if top and isinstance(v, dict):
+            self.put(pk.pack_map_header(len(v)))
+            for k, x in v.items():
+                self.put(pk.pack(k))
+                self._value(x)
+        elif isinstance(v, Rows):
+            self.put(pk.pack_array_header(len(v)))
+            for x in v:
+                self.put(pk.pack(x))
+        else:
+            self.put(pk.pack(v))
@@ -0,0 +1,326 @@
+"""
+server.py – Resident GameSessions behind a local JSON-RPC 2.0 API (`cli.py serve`).
+
+Each cli.py call pays interpreter start-up, data loading, world generation
+(or a cache read) and a checkpoint restore or replay before answering.  The
+server keeps sessions in memory instead, so a client asking many questions
+of the same game pays that once.
+
+Transports (one per server):
+    HTTP         POST a request (or a batch list) to any path on --port
+    Unix socket  newline-delimited requests and responses on --socket
+
+Methods (params by name; `session` is the id returned by open / fork):
+    open       seed, turns=0, nations, grid, no_events  -> {session, seed, turn}
+    step       session                                  -> turn_summary
+    run_turns  session, n                               -> {turn}
+    query      session, one of tile=[x, y] | nation=prefix | region=[ox, oy]
+               | events=true (with from=T)              -> as `cli.py query`
+    snapshot   session, log_limit=50, battles=false     -> game_summary
+    fork       session, branch=None                     -> {session, seed, turn}
+    close      session                                  -> {closed}
+    sessions                                            -> [{session, seed, turn, idle_s}]
+
+Sessions are kept in LRU order, at most --max-sessions of them; one unused
+for --idle seconds is dropped.  Read-only answers (query, snapshot) are
+cached per session as encoded JSON until the session next advances, so a
+repeated query costs a dict lookup.
+"""
+import itertools
+import json
+import socketserver
+import time
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from constants import *
+from snapshot import (QueryError, battle_dict, events_query, nation_query, region_query,
+                      tile_query)
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR, INVALID_REQUEST, METHOD_NOT_FOUND, INVALID_PARAMS = -32700, -32600, -32601, -32602
+INTERNAL_ERROR, SERVER_ERROR = -32603, -32000
+
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class _Entry:
+    __slots__ = ('session', 'used', 'answers')
+
+    def __init__(self, session):
+        self.session = session
+        self.used    = time.monotonic()
+        self.answers = {}            # (method, params) -> encoded result, this turn
+
+
+class SessionPool:
+    """Live sessions by id, LRU-capped and evicted when idle."""
+
+    def __init__(self, max_sessions=8, idle=600.0, cache=True):
+        self.max_sessions = max(1, max_sessions)
+        self.idle  = idle
+        self.cache = cache            # on-disk world cache and checkpoints
+        self._entries = OrderedDict()
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, session):
+        sid = f's{next(self._ids)}'
+        self._entries[sid] = _Entry(session)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+        return sid
+
+    def entry(self, sid):
+        try:
+            e = self._entries[sid]
+        except KeyError:
+            raise RPCError(SERVER_ERROR, f'unknown session {sid!r}') from None
+        self._entries.move_to_end(sid)
+        e.used = time.monotonic()
+        return e
+
+    def close(self, sid):
+        return self._entries.pop(sid, None) is not None
+
+    def evict_idle(self, now=None):
+        now = time.monotonic() if now is None else now
+        for sid in [sid for sid, e in self._entries.items() if now - e.used > self.idle]:
+            del self._entries[sid]
+
+    def describe(self):
+        now = time.monotonic()
+        return [{'session': sid, 'seed': e.session.game.world.seed,
+                 'turn': e.session.game.turn, 'idle_s': round(now - e.used, 1)}
+                for sid, e in self._entries.items()]
+
+    def open(self, seed=None, turns=0, nations=NUM_NATIONS, grid='objects', no_events=False):
+        """A session at `turns`, resumed from an on-disk checkpoint when one fits."""
+        from checkpoint import CheckpointStore
+        from engine import GameSession
+        from worldcache import WorldCache
+
+        def fresh():
+            cache = WorldCache() if self.cache and seed is not None else None
+            s = GameSession(seed=seed, num_nations=nations, grid=grid, world_cache=cache)
+            if no_events:
+                s.disable_random_events()
+            return s
+
+        if seed is None or not self.cache or turns <= 0:
+            s = fresh()
+            s.run_turns(turns)
+        else:
+            options = {'nations': nations, 'grid': grid, 'no_events': bool(no_events)}
+            s = CheckpointStore().advance(seed, turns, options, fresh)
+        return self.add(s)
+
+
+# ── methods ───────────────────────────────────────────────────────────────────
+
+def _info(pool, sid):
+    g = pool.entry(sid).session.game
+    return {'session': sid, 'seed': g.world.seed, 'turn': g.turn}
+
+
+def rpc_open(pool, seed=None, turns=0, nations=NUM_NATIONS, grid='objects', no_events=False):
+    return _info(pool, pool.open(seed, turns, nations, grid, no_events))
+
+
+def rpc_step(pool, session):
+    e = pool.entry(session)
+    e.answers.clear()
+    e.session.step()
+    return e.session.turn_snapshot()
+
+
+def rpc_run_turns(pool, session, n):
+    e = pool.entry(session)
+    e.answers.clear()
+    e.session.run_turns(n)
+    return {'turn': e.session.game.turn}
+
+
+def rpc_query(pool, session, tile=None, nation=None, region=None, events=False, from_=None):
+    g = pool.entry(session).session.game
+    if tile is not None:
+        return tile_query(g, *tile)
+    if nation is not None:
+        return nation_query(g, nation)
+    if region is not None:
+        return region_query(g, *region)
+    if events:
+        return events_query(g, from_)
+    raise RPCError(INVALID_PARAMS, 'query needs one of tile, nation, region, events')
+
+
+def rpc_snapshot(pool, session, log_limit=50, battles=False):
+    s = pool.entry(session).session
+    out = s.snapshot(log_limit=log_limit)
+    if battles:
+        names = [n.name for n in s.game.nations]
+        out['battles'] = [battle_dict(b, names) for b in s.game.battles]
+    return out
+
+
+def rpc_fork(pool, session, branch=None):
+    return _info(pool, pool.add(pool.entry(session).session.fork(branch)))
+
+
+def rpc_close(pool, session):
+    return {'closed': pool.close(session)}
+
+
+def rpc_sessions(pool):
+    return pool.describe()
+
+
+METHODS = {
+    'open':      rpc_open,
+    'step':      rpc_step,
+    'run_turns': rpc_run_turns,
+    'query':     rpc_query,
+    'snapshot':  rpc_snapshot,
+    'fork':      rpc_fork,
+    'close':     rpc_close,
+    'sessions':  rpc_sessions,
+}
+CACHED = frozenset({'query', 'snapshot'})   # answers that only change when the turn does
+
+
+def handle(pool, text):
+    """Answer one JSON-RPC request or batch (str); returns the response text,
+    or None when nothing is owed (notifications only)."""
+    try:
+        req = json.loads(text)
+    except ValueError as e:
+        return _error(None, PARSE_ERROR, f'parse error: {e}')
+    if isinstance(req, list):
+        if not req:
+            return _error(None, INVALID_REQUEST, 'invalid request: empty batch')
+        out = [r for r in (_one(pool, x) for x in req) if r is not None]
+        return f'[{", ".join(out)}]' if out else None
+    return _one(pool, req)
+
+
+def _one(pool, req):
+    if not isinstance(req, dict) or not isinstance(req.get('method'), str):
+        return _error(None, INVALID_REQUEST, 'invalid request')
+    rid, method = req.get('id'), req['method']
+    params = req.get('params') or {}
+    fn = METHODS.get(method)
+    try:
+        if fn is None:
+            raise RPCError(METHOD_NOT_FOUND, f'method not found: {method}')
+        if not isinstance(params, dict):
+            raise RPCError(INVALID_PARAMS, 'params must be an object')
+        result = _call(pool, method, fn, params)
+    except RPCError as e:
+        return _error(rid, e.code, str(e))
+    except QueryError as e:
+        return _error(rid, SERVER_ERROR, str(e))
+    except TypeError as e:
+        return _error(rid, INVALID_PARAMS, str(e))
+    except Exception as e:
+        # Anything else still gets an answer; the connection stays up.
+        return _error(rid, INTERNAL_ERROR, f'{type(e).__name__}: {e}')
+    if 'id' not in req:
+        return None                      # notification
+    return f'{{"jsonrpc": "2.0", "id": {json.dumps(rid)}, "result": {result}}}'
+
+
+def _call(pool, method, fn, params):
+    """Encoded result of fn, from the session's answer cache when possible."""
+    kwargs = {_KEYWORDS.get(k, k): v for k, v in params.items()}
+    if method not in CACHED:
+        return json.dumps(fn(pool, **kwargs))
+    entry = pool.entry(params.get('session'))
+    key = (method, json.dumps(params, sort_keys=True))
+    text = entry.answers.get(key)
+    if text is None:
+        text = entry.answers[key] = json.dumps(fn(pool, **kwargs))
+    return text
+
+
+_KEYWORDS = {'from': 'from_'}   # params that are Python keywords
+
+
+def _error(rid, code, message):
+    return json.dumps({'jsonrpc': '2.0', 'id': rid, 'error': {'code': code, 'message': message}})
+
+
+# ── transports ────────────────────────────────────────────────────────────────
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        out = handle(self.server.pool, body.decode('utf-8'))
+        data = (out or '').encode()
+        self.send_response(200 if out else 204)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            out = handle(self.server.pool, line.decode('utf-8'))
+            if out is not None:
+                self.wfile.write(out.encode() + b'\n')
+                self.wfile.flush()
+
+
+class _Evicting:
+    """Mixin: drop idle sessions between requests."""
+
+    def service_actions(self):
+        self.pool.evict_idle()
+
+
+class HTTPRPCServer(_Evicting, HTTPServer):
+    def __init__(self, address, pool):
+        self.pool = pool
+        super().__init__(address, _HTTPHandler)
+
+
+class UnixRPCServer(_Evicting, socketserver.UnixStreamServer):
+    def __init__(self, path, pool):
+        self.pool = pool
+        super().__init__(path, _LineHandler)
+
+
+# ── client ────────────────────────────────────────────────────────────────────
+
+def call(address, method, **params):
+    """Call method on a server at 'http://host:port' or 'unix:/path'; returns
+    the result or raises RPCError."""
+    req = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params})
+    if address.startswith('unix:'):
+        import socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(address[len('unix:'):])
+            sock.sendall(req.encode() + b'\n')
+            with sock.makefile('rb') as f:
+                resp = json.loads(f.readline())
+    else:
+        http = urllib.request.Request(address, data=req.encode(),
+                                      headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(http) as f:
+            resp = json.loads(f.read())
+    if 'error' in resp:
+        raise RPCError(resp['error']['code'], resp['error']['message'])
+    return resp['result']
@@ -7,6 +7,7 @@ Pure functions over a Game instance; no simulation side effects.
 from __future__ import annotations
 
 from constants import *
+from serialize import Rows
 
 
 def nation_dict(n, turn=0):
@@ -40,6 +41,24 @@ def nation_dict(n, turn=0):
     }
 
 
+def history_dict(n):
+    """Chart series as lists (plus counters) for JSON; when the nation keeps a
+    whole-run archive it is added as history['archive'][key] = {step, values}."""
+    out = {}
+    archive = {}
+    for key, v in n.history.items():
+        if isinstance(v, int):
+            out[key] = v
+            continue
+        out[key] = list(v)
+        arc = v.archived()
+        if arc is not None:
+            archive[key] = {'step': arc[0], 'values': arc[1]}
+    if archive:
+        out['archive'] = archive
+    return out
+
+
 def town_dict(t):
     return {
         'name':       t.name,
@@ -68,8 +87,10 @@ def army_dict(a, nation_names):
     }
 
 
-def tile_dict(t, game):
-    owner = game.nations[t.owner].name if t.owner >= 0 else 'Neutral'
+def tile_dict(t, game, nation_names=None):
+    if nation_names is None:
+        nation_names = [n.name for n in game.nations]
+    owner = nation_names[t.owner] if t.owner >= 0 else 'Neutral'
     return {
         'x':        t.x,
         'y':        t.y,
@@ -81,7 +102,7 @@ def tile_dict(t, game):
         'moisture':  round(t.moisture, 3),
         'deposits': {RESOURCE_NAMES[r]: round(t.deposits[r], 2) for r in range(NUM_RESOURCES)},
         'town':     town_dict(t.town) if t.town else None,
-        'armies':   [army_dict(a, [n.name for n in game.nations]) for a in t.armies],
+        'armies':   [army_dict(a, nation_names) for a in t.armies],
     }
 
 
@@ -98,8 +119,69 @@ def battle_dict(b, nation_names):
     }
 
 
-def game_summary(game, log_limit=50):
-    """Full snapshot of game state at current turn."""
+class QueryError(ValueError):
+    """A query named a tile, nation or region that does not exist."""
+
+
+def tile_query(game, x, y):
+    if not game.world.in_bounds(x, y):
+        raise QueryError(f'Tile ({x},{y}) out of bounds')
+    return tile_dict(game.world.t(x, y), game)
+
+
+def nation_query(game, prefix):
+    """Nation (first name match for prefix) with wars, chart history and armies."""
+    match = [n for n in game.nations if n.name.lower().startswith(prefix.lower())]
+    if not match:
+        raise QueryError(f'Nation "{prefix}" not found')
+    n     = match[0]
+    names = [o.name for o in game.nations]
+    out = nation_dict(n, game.turn)
+    out['wars_with'] = [o.name for o in game.nations
+                        if o.idx != n.idx and n.at_war_with(o.idx)]
+    out['history'] = history_dict(n)
+    out['army_details'] = [army_dict(a, names) for a in n.armies if a.is_alive()]
+    return out
+
+
+def region_query(game, ox, oy, lazy=False):
+    """Ownership, terrain, towns, armies and every tile of outer region (ox, oy)."""
+    if not (0 <= ox < OUTER_SIZE and 0 <= oy < OUTER_SIZE):
+        raise QueryError(f'Region ({ox},{oy}) out of bounds (0-{OUTER_SIZE-1})')
+    names = [n.name for n in game.nations]
+    tiles = game.world.outer_region(ox, oy)
+    owner_counts = {}
+    terrain_counts = {}
+    for t in tiles:
+        owner = names[t.owner] if t.owner >= 0 else 'Neutral'
+        owner_counts[owner] = owner_counts.get(owner, 0) + 1
+        tn = TERRAIN_NAMES[t.terrain]
+        terrain_counts[tn] = terrain_counts.get(tn, 0) + 1
+    occupied = sorted(game.world.army_index.in_region(ox, oy), key=lambda t: (t.y, t.x))
+    return {
+        'region':        [ox, oy],
+        'turn':          game.turn,
+        'ownership':     owner_counts,
+        'terrain_types': terrain_counts,
+        'towns':         [tile_dict(t, game, names) for t in tiles if t.town],
+        'armies':        [army_dict(a, names) for t in occupied for a in t.armies],
+        'tile_details':  _rows(tiles, lambda t: tile_dict(t, game, names), lazy),
+    }
+
+
+def events_query(game, from_turn=None, lazy=False):
+    ev = game.events_history
+    if from_turn is not None:
+        ev = ev.since(from_turn)
+    return {'turn': game.turn, 'events': _rows(ev, _event_dict, lazy)}
+
+
+def game_summary(game, log_limit=50, lazy=False):
+    """Full snapshot of game state at current turn.
+
+    With lazy=True the events and logs are serialize.Rows, converted only
+    as serialize.write streams them out.
+    """
     # Attach war / alliance lists
     nations_out = []
     for n in game.nations:
@@ -117,14 +199,26 @@ def game_summary(game, log_limit=50):
         'nations':        nations_out,
         'battles_total':  len(game.battles),
         'events_total':   len(game.events_history),
-        'events':         [e.to_dict() for e in game.events_history],
+        'events':         _rows(game.events_history, _event_dict, lazy),
         'resource_values': {RESOURCE_NAMES[r]: round(game.world.resource_values[r], 2)
                             for r in range(NUM_RESOURCES)},
-        'logs':           [{'turn': t, 'msg': m, 'nation': n}
-                           for t, m, n in game.logs[-log_limit:]],
+        'logs':           _rows(game.logs[-log_limit:] if log_limit > 0 else [], _log_dict, lazy),
     }
 
 
+def _event_dict(e):
+    return e.to_dict()
+
+
+def _log_dict(record):
+    t, m, n = record
+    return {'turn': t, 'msg': m, 'nation': n}
+
+
+def _rows(items, fn, lazy):
+    return Rows(items, fn) if lazy else [fn(x) for x in items]
+
+
 def turn_summary(game):
     """Lightweight per-turn snapshot for NDJSON streaming.
 
@@ -153,10 +247,9 @@ def turn_summary(game):
         'nations': [_nation_row(n) for n in game.nations],
         'battles_this_turn': [
             battle_dict(b, [n.name for n in game.nations])
-            for b in game.battles if b.turn == game.turn
+            for b in game.battles.turn(game.turn)
         ],
         'events_this_turn': [
-            e.to_dict() for e in game.events_history
-            if e.turn == game.turn
+            e.to_dict() for e in game.events_history.turn(game.turn)
         ],
     }
@@ -0,0 +1,219 @@
+"""
+sweep.py – Run many seeds in parallel and aggregate balance statistics.
+
+Backs `cli.py sweep`.  Each seed is a full headless game run in a worker
+process; the worker returns its snapshot.game_summary as one NDJSON line plus
+a small stats record, and the parent folds the records into distributions:
+
+    survival_turn      – turn each nation slot died (or the final turn if alive)
+    territory_share    – each surviving nation's share of owned land at the end
+    leader_share       – the largest nation's share, per seed
+    battles_per_turn   – battles_total / turns, per seed
+    traits             – per trait: games it ended in, wins (largest nation), win_rate
+
+Output files are resumable: the first line records the sweep parameters,
+then one line per finished seed.  Re-running the same sweep with the same
+--out skips seeds already present; a line cut short by a kill is dropped.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import multiprocessing
+import os
+from pathlib import Path
+
+
+# ── seeds ─────────────────────────────────────────────────────────────────────
+
+def parse_seeds(spec: str) -> list[int]:
+    """'1-5000', '3,7,9' or a mix ('1-10,20') → sorted unique seeds."""
+    seeds = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition('-')
+        if sep:
+            lo, hi = int(lo), int(hi)
+            if hi < lo:
+                raise ValueError(f'empty seed range {part!r}')
+            seeds.update(range(lo, hi + 1))
+        else:
+            seeds.add(int(part))
+    return sorted(seeds)
+
+
+# ── worker ────────────────────────────────────────────────────────────────────
+
+def run_seed(seed, params):
+    """Play one game.  Returns (seed, NDJSON line, stats record)."""
+    from engine import GameSession
+    from worldcache import WorldCache
+
+    cache = None if params.get('no_cache') else WorldCache()
+    # Summaries without logs never read them: skip keeping them at all.
+    s = GameSession(seed=seed, num_nations=params['nations'], grid=params['grid'],
+                    world_cache=cache, headless=not params['log_limit'])
+    if params['no_events']:
+        s.disable_random_events()
+    s.run_turns(params['turns'])
+    summary = s.snapshot(log_limit=params['log_limit'])
+    return seed, json.dumps(summary), seed_stats(summary)
+
+
+def _run_seed_task(task):
+    return run_seed(*task)
+
+
+def seed_stats(summary) -> dict:
+    """Reduce a game_summary to what aggregate() needs (kept small for 5000-seed sweeps)."""
+    turn = summary['turn']
+    rows = summary['nations']
+    alive = [n for n in rows if n['alive']]
+    land = sum(n['territory'] for n in alive)
+    leader = max(alive, key=lambda n: n['territory']) if alive else None
+    return {
+        'turn':      turn,
+        'survival':  [n['death_turn'] if not n['alive'] and n['death_turn'] is not None
+                      else turn for n in rows],
+        'alive':     len(alive),
+        'shares':    [n['territory'] / land for n in alive] if land else [],
+        'leader_share': leader['territory'] / land if land else 0.0,
+        'traits':    sorted({n['trait_id'] for n in rows if n['trait_id']}),
+        'winner_trait': leader['trait_id'] if leader else None,
+        'battles':   summary['battles_total'],
+    }
+
+
+# ── aggregation ───────────────────────────────────────────────────────────────
+
+def distribution(values) -> dict:
+    """count / mean / min / p10 / p25 / median / p75 / p90 / max of numeric values."""
+    xs = sorted(values)
+    if not xs:
+        return {'count': 0}
+
+    def q(p):
+        # Linear interpolation between closest ranks.
+        k = (len(xs) - 1) * p
+        lo, hi = math.floor(k), math.ceil(k)
+        return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+    return {
+        'count':  len(xs),
+        'mean':   round(sum(xs) / len(xs), 4),
+        'min':    round(xs[0], 4),
+        'p10':    round(q(0.10), 4),
+        'p25':    round(q(0.25), 4),
+        'median': round(q(0.50), 4),
+        'p75':    round(q(0.75), 4),
+        'p90':    round(q(0.90), 4),
+        'max':    round(xs[-1], 4),
+    }
+
+
+def aggregate(records) -> dict:
+    """Fold seed_stats records into distributions and per-trait win rates."""
+    survival, shares, leader, bpt, nations_alive = [], [], [], [], []
+    traits = {}
+    seeds = 0
+    for r in records:
+        seeds += 1
+        survival.extend(r['survival'])
+        shares.extend(r['shares'])
+        leader.append(r['leader_share'])
+        nations_alive.append(r['alive'])
+        bpt.append(r['battles'] / r['turn'] if r['turn'] else 0.0)
+        for tid in r['traits']:
+            traits.setdefault(tid, {'games': 0, 'wins': 0})['games'] += 1
+        if r['winner_trait']:
+            traits.setdefault(r['winner_trait'], {'games': 0, 'wins': 0})['wins'] += 1
+    for t in traits.values():
+        t['win_rate'] = round(t['wins'] / t['games'], 4) if t['games'] else 0.0
+    return {
+        'seeds':            seeds,
+        'survival_turn':    distribution(survival),
+        'nations_alive':    distribution(nations_alive),
+        'territory_share':  distribution(shares),
+        'leader_share':     distribution(leader),
+        'battles_per_turn': distribution(bpt),
+        'traits':           dict(sorted(traits.items(), key=lambda kv: -kv[1]['wins'])),
+    }
+
+
+# ── resumable output ──────────────────────────────────────────────────────────
+
+def _read_existing(path: Path, header):
+    """Return {seed: stats} already recorded in path; drop a torn final line.
+
+    Raises ValueError if path belongs to a sweep with different parameters.
+    """
+    done = {}
+    if not path.exists():
+        return done
+    with open(path, 'r+b') as fh:
+        data = fh.read()
+        end = data.rfind(b'\n') + 1
+        if end != len(data):          # killed mid-write: truncate the partial line
+            fh.truncate(end)
+    lines = data[:end].splitlines()
+    if not lines:
+        return done
+    first = json.loads(lines[0])
+    if first.get('sweep') != header['sweep']:
+        raise ValueError(f'{path} holds a different sweep: {first.get("sweep")}')
+    for line in lines[1:]:
+        summary = json.loads(line)
+        done[summary['seed']] = seed_stats(summary)
+    return done
+
+
+def run_sweep(seeds, params, workers=None, out=None, emit=None):
+    """Play every seed, streaming summary lines; return the aggregate dict.
+
+    params: turns, nations, grid, no_events, log_limit, no_cache.
+    out:    optional path; lines are appended there (and the sweep resumes
+            from it), otherwise passed to emit(line).
+    """
+    header = {'sweep': {k: params[k] for k in ('turns', 'nations', 'grid', 'no_events')}}
+    records = {}
+    fh = None
+    if out is not None:
+        out = Path(out)
+        records = _read_existing(out, header)
+        fresh = not out.exists() or out.stat().st_size == 0
+        fh = open(out, 'a', encoding='utf-8')
+        if fresh:
+            fh.write(json.dumps(header) + '\n')
+            fh.flush()
+
+    wanted = set(seeds)
+    records = {s: r for s, r in records.items() if s in wanted}
+    todo = [s for s in seeds if s not in records]
+    workers = workers or os.cpu_count() or 1
+
+    def _consume(results):
+        for seed, line, stats in results:
+            records[seed] = stats
+            if fh is not None:
+                fh.write(line + '\n')
+                fh.flush()
+            elif emit is not None:
+                emit(line)
+
+    try:
+        tasks = ((s, params) for s in todo)
+        if workers <= 1 or len(todo) <= 1:
+            _consume(map(_run_seed_task, tasks))
+        else:
+            with multiprocessing.Pool(min(workers, len(todo))) as pool:
+                _consume(pool.imap_unordered(_run_seed_task, tasks))
+    finally:
+        if fh is not None:
+            fh.close()
+
+    result = aggregate(records[s] for s in sorted(records))
+    result['resumed'] = len(seeds) - len(todo)
+    return result
@@ -0,0 +1,193 @@
+"""
+targets.py – Desirability maps behind army target selection.
+
+NationAI._find_attack_target and _find_expansion_target pick, among the
+tiles within radius 18 of an army, the one maximising
+
+    (3 * deposits[needed] + sum(deposits)) / (manhattan distance + 1)
+
+over tiles the army may take (the first such tile in tiles_in_radius order
+wins ties).  TargetMaps caches the numerator per tile for each resource
+that can be `needed`, and a mask per (nation, kind of target) of the tiles
+that nation may take.  A target pick is then an argmax over a window of
+those maps: vectorised when NumPy is installed, a plain loop over the same
+window otherwise.  Choices are identical to the scan.
+
+Maps follow the world's tile journal (World.set_tile_owner, World.touch),
+and a mask is rebuilt when the set of owners its nation may take from
+changes (war, peace), so they stay exact mid-turn as armies conquer.
+"""
+from constants import *
+from world import _get_radius_offsets
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SEARCH_RADIUS = 18
+ATTACK, EXPAND = 'attack', 'expand'
+
+
+def deposit_value(deposits, needed):
+    """Score numerator for a tile, summed exactly as the AI always has."""
+    score = 0
+    score += deposits[needed] * 3
+    for r in range(NUM_RESOURCES):
+        score += deposits[r]
+    return score
+
+
+class TargetMaps:
+    """Deposit values and per-nation target masks for one game."""
+
+    def __init__(self, game, vectorized=None):
+        self.game  = game
+        self.world = game.world
+        self.vectorized = (np is not None) if vectorized is None else vectorized
+        self.dirty = set()
+        self.world.tile_watchers.append(self.dirty)
+        self._reset()
+
+    _DERIVED = ('_owner', '_land', '_value', '_masks', '_offsets', '_inside', '_div')
+
+    def _reset(self):
+        self._owner  = None                    # per tile, built on first use
+        self._land   = None
+        self._value  = [None] * NUM_RESOURCES  # needed -> per-tile numerators
+        self._masks  = {}                      # (nation idx, kind) -> (allowed, mask)
+        r = SEARCH_RADIUS
+        # Window geometry, in tiles_in_radius (row-major) order.
+        self._offsets = [(dx, dy, 1 + abs(dx) + abs(dy))
+                         for dx, dy in _get_radius_offsets(r)]
+        if self.vectorized:
+            ys, xs = np.mgrid[-r:r + 1, -r:r + 1]
+            self._inside = (xs * xs + ys * ys) <= r * r
+            self._div    = (1 + np.abs(xs) + np.abs(ys)).astype(np.float64)
+
+    def __getstate__(self):
+        # Only the configuration is kept; the maps are rebuilt from the world.
+        state = self.__dict__.copy()
+        for k in self._DERIVED:
+            state.pop(k, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    # ── queries ───────────────────────────────────────────────────────────
+    def best(self, n, kind, needed, cx, cy):
+        """(x, y) of the best tile for nation n to attack (kind=ATTACK) or
+        expand into (EXPAND) from (cx, cy); None if there is none."""
+        allowed = {o.idx for o in self.game.nations
+                   if o.idx != n.idx and n.at_war_with(o.idx)}
+        if kind == EXPAND:
+            allowed.add(-1)
+        mask   = self._mask(n.idx, kind, frozenset(allowed))
+        values = self._values(needed)
+        if self.vectorized:
+            return self._best_np(values, mask, cx, cy)
+        return self._best_py(values, mask, cx, cy)
+
+    def _best_py(self, values, mask, cx, cy):
+        best_score = -1
+        best_tile  = None
+        for dx, dy, div in self._offsets:
+            x, y = cx + dx, cy + dy
+            if 0 <= x < MAP_SIZE and 0 <= y < MAP_SIZE:
+                i = y * MAP_SIZE + x
+                if mask[i]:
+                    score = values[i] / div
+                    if score > best_score:
+                        best_score = score
+                        best_tile  = (x, y)
+        return best_tile
+
+    def _best_np(self, values, mask, cx, cy):
+        r = SEARCH_RADIUS
+        x0, x1 = max(0, cx - r), min(MAP_SIZE, cx + r + 1)
+        y0, y1 = max(0, cy - r), min(MAP_SIZE, cy + r + 1)
+        wy = slice(y0 - cy + r, y1 - cy + r)
+        wx = slice(x0 - cx + r, x1 - cx + r)
+        ok = self._inside[wy, wx] & mask[y0:y1, x0:x1]
+        if not ok.any():
+            return None
+        score = np.where(ok, values[y0:y1, x0:x1] / self._div[wy, wx], -1.0)
+        i = int(score.argmax())             # first maximum in row-major order
+        return (x0 + i % (x1 - x0), y0 + i // (x1 - x0))
+
+    # ── maps ──────────────────────────────────────────────────────────────
+    def _tiles(self):
+        return [t for row in self.world.tiles for t in row]
+
+    def _values(self, needed):
+        if self.dirty:
+            self._flush()
+        v = self._value[needed]
+        if v is None:
+            grid = self.world.grid
+            if grid is not None and self.vectorized:
+                # deposit_value's additions, in its order, over the whole map at once.
+                d = grid.as_numpy()['deposits']
+                v = d[:, :, needed] * 3
+                for r in range(NUM_RESOURCES):
+                    v = v + d[:, :, r]
+            elif grid is not None:
+                deps = grid.deposits
+                v = [deposit_value(deps[o:o + NUM_RESOURCES], needed)
+                     for o in range(0, len(deps), NUM_RESOURCES)]
+            else:
+                v = [deposit_value(t.deposits, needed) for t in self._tiles()]
+                if self.vectorized:
+                    v = np.array(v, dtype=np.float64).reshape(MAP_SIZE, MAP_SIZE)
+            self._value[needed] = v
+        return v
+
+    def _mask(self, idx, kind, allowed):
+        if self.dirty:
+            self._flush()
+        if self._owner is None:
+            grid = self.world.grid
+            if grid is not None and self.vectorized:
+                views = grid.as_numpy()
+                self._owner = views['owner'].astype(np.int16)
+                self._land  = views['terrain'] != TERRAIN_OCEAN
+            elif grid is not None:
+                self._owner = grid.owner.tolist()
+                self._land  = [t != TERRAIN_OCEAN for t in grid.terrain]
+            else:
+                tiles = self._tiles()
+                self._owner = [t.owner for t in tiles]
+                self._land  = [t.is_land() for t in tiles]
+                if self.vectorized:
+                    self._owner = np.array(self._owner, dtype=np.int16).reshape(MAP_SIZE, MAP_SIZE)
+                    self._land  = np.array(self._land, dtype=bool).reshape(MAP_SIZE, MAP_SIZE)
+        held = self._masks.get((idx, kind))
+        if held is not None and held[0] == allowed:
+            return held[1]
+        if self.vectorized:
+            mask = self._land & np.isin(self._owner, list(allowed))
+        else:
+            mask = bytearray(o in allowed and land
+                             for o, land in zip(self._owner, self._land))
+        self._masks[(idx, kind)] = (allowed, mask)
+        return mask
+
+    def _flush(self):
+        rows = self.world.tiles
+        vec  = self.vectorized
+        for x, y in self.dirty:
+            t = rows[y][x]
+            at = (y, x) if vec else y * MAP_SIZE + x
+            for needed, values in enumerate(self._value):
+                if values is not None:
+                    values[at] = deposit_value(t.deposits, needed)
+            if self._owner is None:
+                continue
+            owner, land = t.owner, t.is_land()
+            self._owner[at] = owner
+            self._land[at]  = land
+            for allowed, mask in self._masks.values():
+                mask[at] = land and owner in allowed
+        self.dirty.clear()
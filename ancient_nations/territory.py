@@ -0,0 +1,245 @@
+"""
+territory.py – Incrementally maintained town-coverage and border index.
+
+For every nation, TerritoryIndex keeps a per-tile count of how many of its
+town gathering discs (town.radius + trait 'town_radius_bonus') cover the
+tile.  Counts change only when a nation's set of discs changes (town
+founded, captured, transferred, levelled, or a trait swap), detected by
+comparing each nation's disc multiset on use, so no call site has to
+report town changes.
+
+On top of the counts the index tracks, per nation, candidate sets that are
+supersets of what the two per-turn territory passes must visit:
+
+    neglect  – owned tiles that may be uncovered (or need their neglect reset)
+    claim    – covered tiles that may be neutral land
+
+Candidates are re-added whenever coverage or ownership of a tile changes
+(World.set_tile_owner reports into `dirty`), and pruned when checked, so a
+pass costs O(changed tiles) rather than O(empire).  Both passes visit
+their tiles in exactly the order the original full rescans did, so results
+are identical.
+
+Borders: for every ordered pair of nations (a, b) the index keeps the tiles
+of a.tiles with a 4-neighbour in b.tiles.  Only the tiles around an
+ownership change (and all tiles of a replaced Nation.tiles object) are
+re-examined, so adjacency is a dictionary lookup.  Membership is read from
+Nation.tiles, not tile.owner, matching the scans it replaces.
+"""
+from array import array
+from collections import Counter
+
+from constants import *
+from world import _get_radius_offsets
+
+
+class _NationCoverage:
+    __slots__ = ('count', 'discs', 'tiles', 'neglect', 'claim')
+
+    def __init__(self):
+        self.count   = array('H', [0]) * (MAP_SIZE * MAP_SIZE)
+        self.discs   = Counter()   # {(x, y, r): n} currently applied to count
+        self.tiles   = None        # the Nation.tiles object the sets were built for
+        self.neglect = set()
+        self.claim   = set()
+
+
+class TerritoryIndex:
+    """Coverage counts and candidate sets for every nation in a Game."""
+
+    def __init__(self, game):
+        self.world = game.world
+        self._cov  = [_NationCoverage() for _ in game.nations]
+        # Tiles whose owner changed since the last flush (filled by World).
+        self.dirty = set()
+        # Tiles whose territory_neglect may be non-zero.
+        self._neglected = set()
+        self.world.owner_watchers.append(self.dirty)
+
+        # Borders: tiles to re-examine, and the Nation.tiles objects seen.
+        self._nations      = game.nations
+        self._border_dirty = set()
+        self._border_sets  = [None] * len(game.nations)
+        self._member   = {}   # (x, y) -> idxs of nations whose tiles hold it
+        self._pairs    = {}   # (a, b) -> tiles of a touching b
+        self._pairs_at = {}   # (x, y) -> {(a, b)} it currently belongs to
+
+    # ── queries ───────────────────────────────────────────────────────────
+    def covered(self, n, x, y):
+        """True if any of n's town discs reaches (x, y) (ownership not considered)."""
+        self._sync(n)
+        return self._cov[n.idx].count[y * MAP_SIZE + x] > 0
+
+    def adjacent(self, a, b):
+        """True if some tile of a.tiles has a 4-neighbour in b.tiles."""
+        self._sync_borders()
+        return bool(self._pairs.get((a.idx, b.idx)))
+
+    def border_tiles(self, a, b=None):
+        """Tiles of a touching b's territory (any other nation's if b is None)."""
+        self._sync_borders()
+        if b is not None:
+            return set(self._pairs.get((a.idx, b.idx), ()))
+        out = set()
+        for (i, _), tiles in self._pairs.items():
+            if i == a.idx:
+                out |= tiles
+        return out
+
+    # ── maintenance ───────────────────────────────────────────────────────
+    def _discs(self, n):
+        bonus = n.trait_val('town_radius_bonus', 0)
+        return Counter((t.x, t.y, t.radius + bonus) for t in n.towns)
+
+    def _sync(self, n):
+        """Bring n's counts and candidate sets up to date."""
+        self._flush()
+        c = self._cov[n.idx]
+        if c.tiles is not n.tiles:
+            # Territory object replaced (union, surrender, rebellion): start over.
+            c.tiles   = n.tiles
+            c.neglect = set(n.tiles)
+        discs = self._discs(n)
+        if discs != c.discs:
+            for disc, k in (c.discs - discs).items():
+                for _ in range(k):
+                    self._apply(c, disc, -1)
+            for disc, k in (discs - c.discs).items():
+                for _ in range(k):
+                    self._apply(c, disc, +1)
+            c.discs = discs
+
+    def _apply(self, c, disc, delta):
+        cx, cy, r = disc
+        count = c.count
+        for dx, dy in _get_radius_offsets(r):
+            x, y = cx + dx, cy + dy
+            if 0 <= x < MAP_SIZE and 0 <= y < MAP_SIZE:
+                i = y * MAP_SIZE + x
+                count[i] += delta
+                if delta > 0 and count[i] == 1:
+                    c.claim.add((x, y))
+                    c.neglect.add((x, y))     # may need its neglect reset
+                elif delta < 0 and count[i] == 0:
+                    c.neglect.add((x, y))
+
+    def _flush(self):
+        """Route ownership changes to every nation's candidate sets."""
+        if not self.dirty:
+            return
+        world = self.world
+        self._border_dirty |= self.dirty
+        for xy in self.dirty:
+            neutral = world.t(xy[0], xy[1]).owner == -1
+            i = xy[1] * MAP_SIZE + xy[0]
+            for c in self._cov:
+                c.neglect.add(xy)
+                if neutral and c.count[i]:
+                    c.claim.add(xy)
+        self.dirty.clear()
+
+    def _sync_borders(self):
+        """Re-examine tiles whose membership may have changed, and their neighbours."""
+        self._flush()
+        changed = self._border_dirty
+        for i, n in enumerate(self._nations):
+            seen = self._border_sets[i]
+            if seen is not n.tiles:
+                # Territory object replaced: every tile of the old and new one.
+                if seen is not None:
+                    changed.update(seen)
+                changed.update(n.tiles)
+                self._border_sets[i] = n.tiles
+        if not changed:
+            return
+        nations, member = self._nations, self._member
+        recheck = set()
+        for xy in changed:
+            held = tuple(n.idx for n in nations if xy in n.tiles)
+            if held:
+                member[xy] = held
+            else:
+                member.pop(xy, None)
+            x, y = xy
+            recheck.update((xy, (x+1, y), (x-1, y), (x, y+1), (x, y-1)))
+        for xy in recheck:
+            self._recheck_border(xy)
+        changed.clear()
+
+    def _recheck_border(self, xy):
+        pairs, pairs_at = self._pairs, self._pairs_at
+        for key in pairs_at.pop(xy, ()):
+            pairs[key].discard(xy)
+            if not pairs[key]:
+                del pairs[key]
+        mine = self._member.get(xy)
+        if not mine:
+            return
+        x, y = xy
+        member = self._member
+        theirs = set()
+        for nb in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)):
+            theirs.update(member.get(nb, ()))
+        keys = {(a, b) for a in mine for b in theirs if a != b}
+        if keys:
+            pairs_at[xy] = keys
+            for key in keys:
+                pairs.setdefault(key, set()).add(xy)
+
+    # ── passes ────────────────────────────────────────────────────────────
+    def neglect_pass(self, n, abandon):
+        """One turn of territory neglect for n (see Game._tick_territory_abandonment).
+
+        Owned tiles covered by a town of n get neglect 0; the rest count up
+        and abandon(tile) is called at TERRITORY_NEGLECT_ABANDON_TURNS.
+        """
+        self._sync(n)
+        c = self._cov[n.idx]
+        tiles = n.tiles
+        cands = c.neglect
+        cands |= {xy for xy in self._neglected if xy in tiles}
+        order = sorted((xy for xy in cands if xy in tiles), key=tiles.__getitem__)
+        c.neglect = set()
+        count, world, idx = c.count, self.world, n.idx
+        for xy in order:
+            tile = world.t(xy[0], xy[1])
+            if count[xy[1] * MAP_SIZE + xy[0]] and tile.owner == idx:
+                tile.territory_neglect = 0
+                self._neglected.discard(xy)
+                continue
+            c.neglect.add(xy)
+            tile.territory_neglect += 1
+            self._neglected.add(xy)
+            if tile.territory_neglect >= TERRITORY_NEGLECT_ABANDON_TURNS:
+                abandon(tile)
+                self._neglected.discard(xy)
+
+    def claimable(self, n):
+        """Neutral land tiles covered by n's towns, in town-scan order.
+
+        The order matches scanning n.towns and each town's disc row by row,
+        claiming first encounters (NationAI._expansion_decisions).
+        """
+        self._sync(n)
+        c = self._cov[n.idx]
+        world, count = self.world, c.count
+        found = []
+        for xy in c.claim:
+            tile = world.t(xy[0], xy[1])
+            if tile.owner == -1 and count[xy[1] * MAP_SIZE + xy[0]] and tile.is_land():
+                found.append(xy)
+        c.claim = set(found)
+        if not found:
+            return []
+        bonus = n.trait_val('town_radius_bonus', 0)
+        discs = [(t.x, t.y, t.radius + bonus) for t in n.towns]
+
+        def key(xy):
+            x, y = xy
+            for k, (tx, ty, r) in enumerate(discs):
+                dx, dy = x - tx, y - ty
+                if dx * dx + dy * dy <= r * r:
+                    return (k, y, x)
+            return (len(discs), y, x)   # unreachable: count > 0 means some disc covers it
+
+        return sorted(found, key=key)
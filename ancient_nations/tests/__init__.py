@@ -0,0 +1,14 @@
+"""
+Every test run gets a throwaway cache root, so CLI subprocesses and sessions
+that cache by default never write to ~/.cache/ancient_nations.
+test_world_cache and test_checkpoint use their own directories.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+CACHE_DIR = tempfile.mkdtemp(prefix='an-test-cache-')
+os.environ['ANCIENT_NATIONS_CACHE_DIR'] = CACHE_DIR
+atexit.register(shutil.rmtree, CACHE_DIR, ignore_errors=True)
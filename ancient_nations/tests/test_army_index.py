@@ -0,0 +1,55 @@
+"""
+ArmyIndex: occupied-tile index must match the map, and queries built on it
+must answer exactly like the full scans they replaced.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_army_index
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from constants import MAP_SIZE
+from game import Game
+
+
+def _scan_defense_target(ai):
+    rows = ai.world.tiles
+    for x, y in ai.n.tiles:
+        for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
+            nx, ny = x+dx, y+dy
+            if 0 <= nx < MAP_SIZE and 0 <= ny < MAP_SIZE:
+                nb = rows[ny][nx]
+                if nb.armies and nb.armies[0].nation != ai.n.idx:
+                    return (x, y)
+    return None
+
+
+class TestArmyIndex(unittest.TestCase):
+
+    def test_index_and_defense_targets_match_scan(self):
+        for grid in ('objects', 'arrays'):
+            with self.subTest(grid=grid):
+                g = Game(seed=42, grid=grid)
+                checked = 0
+                for _ in range(200):
+                    g.process_turn()
+                    if g.turn % 20:
+                        continue
+                    w = g.world
+                    occupied = {(t.x, t.y) for row in w.tiles for t in row if t.armies}
+                    self.assertEqual({(t.x, t.y) for t in w.army_index.tiles()}, occupied)
+                    self.assertEqual(len(w.army_index), len(occupied))
+                    for ai in g.ai:
+                        if ai.n.alive:
+                            want = _scan_defense_target(ai)
+                            self.assertEqual(ai._find_defense_target(None), want)
+                            checked += want is not None
+                self.assertGreater(checked, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
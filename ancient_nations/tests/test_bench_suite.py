@@ -0,0 +1,67 @@
+"""
+Benchmark suite: regression gating must flag only metrics that got worse
+beyond the threshold, in the right direction, and `run` must produce a
+well-formed results document.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_bench_suite
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+sys.path.insert(0, str(ROOT))
+
+import suite
+
+
+def _doc(**values):
+    better = {'turns': 'higher'}
+    return {'metrics': {k: {'value': v, 'unit': 'x', 'better': better.get(k, 'lower')}
+                        for k, v in values.items()}}
+
+
+class TestCompare(unittest.TestCase):
+
+    def test_threshold_and_direction(self):
+        base = _doc(turns=100.0, summary_ms=10.0, paths=50.0)
+        new  = _doc(turns=70.0, summary_ms=11.0, paths=80.0, extra=1.0)
+        rows = suite.compare(base, new, threshold=0.2)
+        self.assertTrue(rows['turns']['regressed'])        # 30% fewer turns/s
+        self.assertFalse(rows['summary_ms']['regressed'])  # 10% slower: within threshold
+        self.assertTrue(rows['paths']['regressed'])
+        self.assertNotIn('extra', rows)                    # no baseline to compare with
+        faster = suite.compare(base, _doc(turns=200.0, summary_ms=1.0, paths=1.0))
+        self.assertFalse(any(r['regressed'] for r in faster.values()))
+
+    def test_run_and_gate_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / 'now.json'
+            cmd = [sys.executable, str(ROOT / 'benchmarks' / 'suite.py'), 'run',
+                   '--only', 'summary,collect', '--quick', '--repeat', '1', '--out', str(out)]
+            res = subprocess.run(cmd, capture_output=True, text=True)
+            self.assertEqual(res.returncode, 0, res.stderr)
+            doc = json.loads(out.read_text())
+            self.assertEqual(set(doc['metrics']),
+                             {'summary_ms', 'collect_cached_us', 'collect_uncached_us'})
+            # A baseline 100x faster than reality must fail the gate.
+            fast = json.loads(out.read_text())
+            for m in fast['metrics'].values():
+                m['value'] /= 100
+            base = Path(tmp) / 'fast.json'
+            base.write_text(json.dumps(fast))
+            res = subprocess.run([sys.executable, str(ROOT / 'benchmarks' / 'suite.py'),
+                                  'compare', str(base), str(out)],
+                                 capture_output=True, text=True)
+            self.assertEqual(res.returncode, 1)
+            self.assertEqual(len(json.loads(res.stdout)['regressed']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
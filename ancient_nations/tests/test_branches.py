@@ -0,0 +1,86 @@
+"""
+Forks and what-if branches: an unlabelled fork must replay its parent's
+future exactly, a labelled one must diverge reproducibly, and branches run
+in a process pool must match the same branches run in-process.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_branches
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import branches
+from engine import GameSession
+
+
+def played(s, turns):
+    s.run_turns(turns)
+    return json.dumps(s.snapshot(log_limit=100))
+
+
+class TestFork(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.base = GameSession(seed=11)
+        cls.base.run_turns(60)
+
+    def test_unlabelled_fork_continues(self):
+        a, b = self.base.fork(), self.base.fork()
+        self.assertEqual(played(a, 40), played(b, 40))
+        self.assertEqual(self.base.game.turn, 60)
+        self.assertEqual(b.options, self.base.options)
+
+    def test_fork_matches_uninterrupted_run(self):
+        ref = GameSession(seed=11)
+        ref.run_turns(60)
+        self.assertEqual(played(self.base.fork(), 30), played(ref, 30))
+
+    def test_labelled_forks(self):
+        a, again, b = (self.base.fork(label) for label in ('a', 'a', 'b'))
+        self.assertEqual(a.options['branch'], [[60, 'a']])
+        self.assertNotIn('branch', self.base.options)
+        ta, tb = played(a, 80), played(b, 80)
+        self.assertEqual(ta, played(again, 80))
+        self.assertNotEqual(ta, tb)
+        self.assertNotEqual(ta, played(self.base.fork(), 80))
+
+    def test_variant(self):
+        s = self.base.fork('war')
+        n0, n1 = s.game.nations[0], s.game.nations[1]
+        n1.diplomacy.pop(n0.idx, None)
+        n0.diplomacy.pop(n1.idx, None)
+        branches.apply_variant(s, {'branch': 'war', 'no_events': True,
+                                   'trait': {'0': 'zealot'}, 'war': [[0, n1.name]]})
+        self.assertTrue(n0.at_war_with(n1.idx) and n1.at_war_with(n0.idx))
+        self.assertEqual(n0.trait['id'], 'zealot')
+        self.assertEqual(n0.trait_history[-1]['turn'], 60)
+        self.assertTrue(s.options['no_events'])
+        self.assertEqual(s.options['what_if'][0][0], 60)
+        s.run_turns(5)
+        self.assertEqual(self.base.game.turn, 60)
+
+    def test_bad_variants(self):
+        for v in ({'bogus': 1}, {'trait': {'0': 'nope'}}, {'war': [[0, 0]]},
+                  {'war': [['Zzz', 0]]}):
+            with self.assertRaises(ValueError):
+                branches.run_branches(self.base, [v], 1, workers=1)
+
+    def test_pool_matches_in_process(self):
+        variants = [{'branch': 'x'}, {'branch': 'y', 'no_events': True}, {}]
+        lines = {1: [], 2: []}
+        for workers in lines:
+            done = branches.run_branches(self.base, variants, 15, workers=workers,
+                                         emit=lines[workers].append)
+            self.assertEqual(sorted(done), ['', 'x', 'y'])
+        self.assertEqual(sorted(lines[1]), sorted(lines[2]))
+        self.assertEqual(self.base.game.turn, 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Checkpoints: a restored session must continue exactly like the original.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_checkpoint
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import checkpoint
+from checkpoint import CheckpointError, CheckpointStore
+from engine import GameSession
+from worldcache import WorldCache
+
+
+def _run_and_record(s, turns):
+    """Step s, returning every per-turn summary plus the final full snapshot."""
+    lines = []
+    for _ in range(turns):
+        s.step()
+        lines.append(json.dumps(s.turn_snapshot()))
+    return lines, s.snapshot(log_limit=500)
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_restore_continues_identically(self):
+        for grid in ('objects', 'arrays'):
+            with self.subTest(grid=grid):
+                s = GameSession(seed=11, grid=grid)
+                s.run_turns(60)
+                path = Path(self.dir) / f'{grid}.ckpt'
+                s.checkpoint(path)
+                expected = _run_and_record(s, 60)
+
+                r = GameSession.restore(path)
+                self.assertEqual(r.game.turn, 60)
+                self.assertEqual(r.options['grid'], grid)
+                self.assertEqual(_run_and_record(r, 60), expected)
+
+    def test_restore_from_mapped_world_cache(self):
+        cache = WorldCache(Path(self.dir) / 'worlds')
+        GameSession(seed=12, grid='arrays', world_cache=cache)   # populate
+        s = GameSession(seed=12, grid='arrays', world_cache=cache)
+        s.run_turns(20)
+        data = s.checkpoint()
+        expected = _run_and_record(s, 20)
+        self.assertEqual(_run_and_record(GameSession.from_checkpoint(data), 20), expected)
+
+    def test_rejects_foreign_and_stale_files(self):
+        s = GameSession(seed=13)
+        data = s.checkpoint()
+        with self.assertRaises(CheckpointError):
+            GameSession.from_checkpoint(b'not a checkpoint at all')
+        with self.assertRaises(CheckpointError):
+            GameSession.from_checkpoint(data[:-100])
+        stale = data.replace(checkpoint.code_digest().encode(), b'0' * 64)
+        with self.assertRaises(CheckpointError):
+            GameSession.from_checkpoint(stale)
+
+    def test_store_resumes_from_nearest_checkpoint(self):
+        store = CheckpointStore(self.dir)
+        opts = {'nations': 6, 'grid': 'objects', 'no_events': True}
+
+        def fresh():
+            s = GameSession(seed=14, num_nations=6)
+            s.disable_random_events()
+            return s
+
+        a = store.advance(14, 130, opts, fresh)
+        self.assertEqual(store.turns(14, opts), [100, 130])
+        expected = a.snapshot(log_limit=500)
+
+        self.assertIsNone(store.nearest(14, 99, opts))
+        b = store.nearest(14, 120, opts)
+        self.assertEqual(b.game.turn, 100)
+        self.assertTrue(b.options['no_events'])
+        b.run_turns(30)
+        self.assertEqual(b.snapshot(log_limit=500), expected)
+
+        # Different options never match; a damaged file is dropped and skipped.
+        self.assertIsNone(store.nearest(14, 130, dict(opts, no_events=False)))
+        store._file(14, opts, 130).write_bytes(b'garbage')
+        self.assertEqual(store.nearest(14, 130, opts).game.turn, 100)
+        self.assertEqual(store.turns(14, opts), [100])
+
+
+if __name__ == '__main__':
+    unittest.main()
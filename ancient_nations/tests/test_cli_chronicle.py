@@ -21,7 +21,7 @@ PYTHON = sys.executable  # the uv-managed interpreter running these tests
 def run_cli(*args):
     """Run cli.py with given args; return (returncode, stdout_text)."""
     result = subprocess.run(
-        [PYTHON, str(CLI)] + list(args),
+        [PYTHON, str(CLI)] + list(args) + ['--no-cache'],   # plain replay, no checkpoints
         capture_output=True,
         text=True,
     )
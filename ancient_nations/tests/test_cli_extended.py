@@ -20,7 +20,7 @@ PYTHON = sys.executable
 def run_cli(*args):
     """Run cli.py with given args; return (returncode, stdout_text, stderr_text)."""
     result = subprocess.run(
-        [PYTHON, str(CLI)] + list(args),
+        [PYTHON, str(CLI)] + list(args) + ['--no-cache'],   # plain replay, no checkpoints
         capture_output=True,
         text=True,
     )
@@ -0,0 +1,116 @@
+"""
+Async session driver: turns played through the worker thread must be the
+turns a plain loop plays, playback must follow pause / speed, and the event
+loop must keep running while a turn is computed.  The TUI must not draw a
+half-applied turn, and must split terminal input into keys.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_driver
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main
+from driver import SessionDriver
+from engine import GameSession
+
+
+class TestDriver(unittest.TestCase):
+
+    def drive(self, coro_fn, session):
+        d = SessionDriver(session)
+        try:
+            return asyncio.run(coro_fn(d))
+        finally:
+            d.close()
+
+    def test_same_turns_as_plain_loop(self):
+        s = GameSession(seed=9)
+        s.paused, s.speed = False, 0.0
+
+        async def play(d):
+            task = asyncio.create_task(d.run())
+            while s.game.turn < 30:
+                await d.wait_changed()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.drive(play, s)
+        ref = GameSession(seed=9)
+        ref.run_turns(s.game.turn)
+        self.assertEqual(json.dumps(s.snapshot()), json.dumps(ref.snapshot()))
+
+    def test_pause_and_wake(self):
+        s = GameSession(seed=9)
+        s.speed = 0.0
+
+        async def play(d):
+            task = asyncio.create_task(d.run())
+            await asyncio.sleep(0.1)
+            self.assertEqual(s.game.turn, 0)           # paused
+            s.paused = False
+            d.wake()
+            await d.wait_changed()
+            self.assertGreaterEqual(s.game.turn, 1)
+            s.paused, s.speed = False, 60.0            # next turn a minute away
+            d.wake()
+            await asyncio.sleep(0.1)
+            turn = s.game.turn
+            await asyncio.sleep(0.2)
+            self.assertEqual(s.game.turn, turn)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.drive(play, s)
+
+    def test_loop_runs_during_turn(self):
+        s = GameSession(seed=9)
+        s.run_turns(150)                               # later turns are slower
+
+        async def play(d):
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+            hb = asyncio.create_task(heartbeat())
+            await d.step()
+            hb.cancel()
+            await asyncio.gather(hb, return_exceptions=True)
+            return ticks
+        self.assertGreater(self.drive(play, s), 1)
+        self.assertEqual(s.game.turn, 151)
+
+
+class TestTUI(unittest.TestCase):
+
+    def test_no_frame_while_stepping(self):
+        app = main.App.__new__(main.App)        # no banner, no session
+        frames = []
+        app.renderer = SimpleNamespace(render=lambda: frames.append(1))
+        app.driver = SimpleNamespace(stepping=True)
+        app._draw()
+        self.assertEqual(frames, [])
+        app.driver.stepping = False
+        app._draw()
+        self.assertEqual(frames, [1])
+
+    @unittest.skipUnless(hasattr(main, '_split_keys'), 'POSIX terminal input only')
+    def test_split_keys(self):
+        def keys(data):
+            return list(main._split_keys(data))
+        self.assertEqual(keys('\x1bq'), ['\x1b', 'q'])            # Esc, then q: both kept
+        self.assertEqual(keys('\x1b\x1b[B'), ['\x1b', 'DOWN'])
+        self.assertEqual(keys('a\x1b[A\x1b[Z'), ['a', 'UP', '\x1b[Z'])
+        self.assertEqual(keys('\x1b['), ['\x1b', '['])              # cut short: not a sequence
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Columnar export: every table read back must match the game it came from,
+whatever the batch size.  Arrow / Parquet are checked when pyarrow is
+installed, the npz fallback when NumPy is.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_export
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import export
+from constants import RES_GOLD
+from engine import GameSession
+
+ROOT = Path(__file__).parent.parent
+
+
+def exported(fmt, turns=60, batch=25, seed=6):
+    d = tempfile.mkdtemp()
+    s = GameSession(seed=seed)
+    exp = export.RunExporter(s.game, d, fmt, batch=batch)
+    for _ in range(turns):
+        s.step()
+        exp.record()
+    manifest = exp.close()
+    return s.game, manifest, export.load(d), Path(d)
+
+
+class TestExport(unittest.TestCase):
+
+    def check(self, fmt):
+        g, manifest, t, d = exported(fmt)
+        self.addCleanup(shutil.rmtree, d)
+        self.assertEqual(manifest['format'], fmt)
+        self.assertEqual(manifest['rows'], {name: len(t[name]['turn']) for name in export.TABLES})
+        nations = t['nations']
+        self.assertEqual(len(nations['turn']), 60 * len(g.nations))
+        last = [i for i, turn in enumerate(nations['turn']) if turn == g.turn]
+        for i, n in zip(last, g.nations):
+            self.assertEqual(int(nations['nation'][i]), n.idx)
+            self.assertEqual(int(nations['territory'][i]), len(n.tiles))
+            self.assertAlmostEqual(float(nations['gold'][i]), n.res[RES_GOLD])
+        owners = export.decode_owners(t['ownership']['owners'][-1])
+        self.assertEqual(list(owners), [tile.owner for row in g.world.tiles for tile in row])
+        self.assertEqual([int(x) for x in t['ownership']['turn']], list(range(1, 61)))
+        b = t['battles']
+        self.assertEqual([(int(b['turn'][i]), int(b['x'][i]), int(b['attacker'][i]))
+                          for i in range(len(b['turn']))],
+                         [(x.turn, x.x, x.atk_nation) for x in g.battles])
+        ev = t['events']
+        self.assertEqual([str(x) for x in ev['type']], [e.type for e in g.events_history])
+        if len(ev['effects']):
+            self.assertEqual(json.loads(str(ev['effects'][0])), g.events_history[0].effects)
+        return d
+
+    @unittest.skipUnless(export.np, 'numpy not installed')
+    def test_npz(self):
+        d = self.check('npz')
+        self.assertEqual(len(list(d.glob('ownership-*.npz'))), 3)    # 60 turns / batch 25
+
+    @unittest.skipUnless(export.pa, 'pyarrow not installed')
+    def test_arrow(self):
+        self.check('arrow')
+
+    @unittest.skipUnless(export.pa, 'pyarrow not installed')
+    def test_parquet(self):
+        self.check('parquet')
+
+    @unittest.skipUnless(export.default_format(), 'neither numpy nor pyarrow installed')
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as d:
+            out = subprocess.run([sys.executable, 'cli.py', 'export', '--seed', '2',
+                                  '--turns', '30', '--no-cache', '--out', d],
+                                 cwd=ROOT, capture_output=True, text=True, check=True)
+            manifest = json.loads(out.stdout)
+            self.assertEqual(manifest['turn'], 30)
+            self.assertEqual(manifest['rows']['ownership'], 30)
+            self.assertEqual(json.loads((Path(d) / 'manifest.json').read_text())['rows'],
+                             manifest['rows'])
+
+
+if __name__ == '__main__':
+    unittest.main()
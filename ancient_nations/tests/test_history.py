@@ -0,0 +1,79 @@
+"""
+History rings: each series must read exactly like the old list trimmed to
+CHART_HISTORY, and the archive must cover the whole run at a uniform step.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_history
+"""
+
+import json
+import pickle
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from constants import CHART_HISTORY
+from engine import GameSession
+from history import SERIES, SeriesStore, new_history
+from snapshot import history_dict
+
+
+class TestSeriesStore(unittest.TestCase):
+
+    def test_reads_like_trimmed_list(self):
+        store = SeriesStore(7)
+        h = new_history(store)
+        ref = {k: [] for k in SERIES}
+        for i in range(25):
+            values = [i * (k + 1) - 3 for k in range(len(SERIES))]
+            store.record(*values)
+            for k, v in zip(SERIES, values):
+                ref[k] = (ref[k] + [v])[-7:]
+            for k in SERIES:
+                self.assertEqual(len(h[k]), len(ref[k]))
+                self.assertEqual(list(h[k]), ref[k])
+                self.assertEqual(h[k][-1], ref[k][-1])
+                self.assertEqual(h[k][0], ref[k][0])
+                for sl in (slice(-5, None), slice(1, 3), slice(None, None, 2), slice(-50, None)):
+                    self.assertEqual(h[k][sl], ref[k][sl])
+        self.assertEqual(h['battles_won'], 0)
+        with self.assertRaises(IndexError):
+            h['gold'][7]
+
+    def test_archive_spans_the_run(self):
+        store = SeriesStore(4, archive=8)
+        view = store.view('territory')
+        self.assertIsNone(SeriesStore(4).view('territory').archived())
+        for n in range(1, 100):
+            store.record(*([n - 1] * len(SERIES)))
+            step, values = view.archived()
+            self.assertLessEqual(len(values), 8)
+            self.assertEqual(values, list(range(0, n, step)))
+
+
+class TestNationHistory(unittest.TestCase):
+
+    def test_game_history(self):
+        s = GameSession(seed=11)
+        s.run_turns(CHART_HISTORY + 30)
+        g = s.game
+        n = next(n for n in g.nations if n.alive)
+        terr = n.history['territory']
+        self.assertEqual(len(terr), CHART_HISTORY)
+        self.assertEqual(terr[-1], len(n.tiles))
+        # Survives a pickle round trip (checkpoints) with the views still shared.
+        n2 = pickle.loads(pickle.dumps(n))
+        self.assertEqual(list(n2.history['territory']), list(terr))
+        n2.snapshot()
+        self.assertEqual(n2.history['territory'][-1], len(n2.tiles))
+        out = json.loads(json.dumps(history_dict(n)))
+        self.assertEqual(out['territory'], list(terr))
+        self.assertIn('battles_won', out)
+        step, values = terr.archived()
+        self.assertEqual(out['archive']['territory'], {'step': step, 'values': values})
+
+
+if __name__ == '__main__':
+    unittest.main()
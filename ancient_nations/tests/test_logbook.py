@@ -0,0 +1,62 @@
+"""
+LogBuffer and headless sessions: the ring must read exactly like the old
+trimmed list of (turn, msg, nation_idx) tuples, and headless runs must
+simulate identically while keeping no log text.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_logbook
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine import GameSession
+from logbook import LogBuffer
+
+
+class TestLogBuffer(unittest.TestCase):
+
+    def test_reads_like_trimmed_list(self):
+        buf, ref = LogBuffer(5), []
+        for i in range(12):
+            if i % 2:
+                buf.append(i, 'army {} at ({},{})', i % 3, (i, i + 1, i + 2))
+                ref.append((i, f'army {i} at ({i + 1},{i + 2})', i % 3))
+            else:
+                buf.append(i, f'plain {i}')
+                ref.append((i, f'plain {i}', -1))
+            ref = ref[-5:]
+            self.assertEqual(len(buf), len(ref))
+            self.assertEqual(list(buf), ref)
+            for sl in (slice(-3, None), slice(1, 3), slice(None, None, 2), slice(-50, None)):
+                self.assertEqual(buf[sl], ref[sl])
+            self.assertEqual(buf[-1], ref[-1])
+        self.assertEqual(buf.total, 12)
+
+    def test_dropping_text(self):
+        buf = LogBuffer(5, keep=False)
+        buf.append(1, 'x {}', -1, (1,))
+        self.assertEqual((len(buf), list(buf), buf.total), (0, [], 1))
+
+
+class TestHeadless(unittest.TestCase):
+
+    def test_headless_simulates_identically(self):
+        full, fast = GameSession(seed=13), GameSession(seed=13, headless=True)
+        full.run_turns(120)
+        fast.run_turns(120)
+        self.assertEqual(json.dumps(full.snapshot(log_limit=0)),
+                         json.dumps(fast.snapshot(log_limit=0)))
+        self.assertEqual(len(fast.game.logs), 0)
+        self.assertEqual(fast.game.logs.total, full.game.logs.total)
+        self.assertGreater(len(full.game.logs), 0)
+        self.assertTrue(fast.options['headless'])
+        self.assertNotIn('headless', full.options)
+
+
+if __name__ == '__main__':
+    unittest.main()
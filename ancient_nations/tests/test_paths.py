@@ -0,0 +1,191 @@
+"""
+PathService: the flat search must equal find_path inside its box, cached
+paths must equal fresh searches, the region corridor must get round walls
+the box cannot, and flow-field paths must be valid and as cheap as the best
+route.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_paths
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from constants import MAP_SIZE, TERRAIN_MOUNTAIN, TERRAIN_PLAIN
+from game import Game
+from pathfinding import (FlowField, PathRequest, PathService, SearchBuffers,
+                         _search_box, _step_cost, find_path, find_paths_batch)
+
+
+def _cost(world, path, road_allied=frozenset()):
+    return sum(_step_cost(world.t(x, y), True, road_allied) for x, y in path)
+
+
+def _steps_ok(test, start, path):
+    prev = start
+    for step in path:
+        test.assertEqual(abs(step[0] - prev[0]) + abs(step[1] - prev[1]), 1)
+        prev = step
+
+
+class TestPathService(unittest.TestCase):
+
+    def test_flat_search_matches_find_path(self):
+        g = Game(seed=123)
+        for _ in range(60):
+            g.process_turn()
+        w = g.world
+        paths = PathService(w)
+        buffers = SearchBuffers()
+        rnd = random.Random(3)
+        for i in range(300):
+            sx, sy, tx, ty = (rnd.randrange(MAP_SIZE) for _ in range(4))
+            ocean, allied = bool(i % 3), {rnd.randrange(5)} if i % 2 else None
+            cost = paths.grid(ocean, allied).cost
+            path, _ = buffers.search(cost, sx, sy, tx, ty, _search_box(sx, sy, tx, ty))
+            self.assertEqual(path, find_path(w, sx, sy, tx, ty, None, ocean, allied))
+
+    def test_cached_paths_track_world_changes(self):
+        g = Game(seed=42)
+        paths = g.paths
+        rnd = random.Random(1)
+        for _ in range(120):
+            g.process_turn()
+            if g.turn % 15:
+                continue
+            # Every live cache entry must still be what a fresh search returns.
+            self._check_cache(g.world, paths)
+            # Change some costs directly and check again.
+            for _ in range(20):
+                x, y = rnd.randrange(MAP_SIZE), rnd.randrange(MAP_SIZE)
+                t = g.world.t(x, y)
+                t.road = not t.road
+                g.world.touch(x, y)
+        self.assertGreater(paths.hits, 0)
+        self._check_cache(g.world, paths)
+
+    def _check_cache(self, w, paths):
+        fresh = PathService(w)
+        for key, (_, box) in list(paths._paths.items()):
+            sx, sy, tx, ty, (ocean, allied) = key
+            want = fresh.path(sx, sy, tx, ty, None, ocean, allied)
+            self.assertEqual(paths.path(sx, sy, tx, ty, None, ocean, allied), want)
+            if box is not None:
+                self.assertEqual(want, find_path(w, sx, sy, tx, ty, None, ocean, allied))
+
+    def test_corridor_routes_round_mountain_ranges(self):
+        g = Game(seed=5)
+        w = g.world
+        for row in w.tiles:
+            for t in row:
+                t.terrain, t.road = TERRAIN_PLAIN, False
+                if 40 <= t.x < 60 and t.y >= 10:
+                    t.terrain = TERRAIN_MOUNTAIN
+        paths = PathService(w)
+        boxed = find_path(w, 35, 80, 65, 80)
+        path = paths.path(35, 80, 65, 80)
+        self.assertEqual(path[-1], (65, 80))
+        _steps_ok(self, (35, 80), path)
+        self.assertLess(min(y for _, y in path), 10)
+        self.assertLess(_cost(w, path), _cost(w, boxed))
+        # Opening a pass invalidates the detour.
+        for x in range(40, 60):
+            w.t(x, 80).terrain = TERRAIN_PLAIN
+            w.touch(x, 80)
+        self.assertEqual(paths.path(35, 80, 65, 80), find_path(w, 35, 80, 65, 80))
+
+    def test_owner_changes_only_matter_to_road_allied_profiles(self):
+        g = Game(seed=5)
+        w = g.world
+        paths = PathService(w)
+        x, y = next((x, 50) for x in range(MAP_SIZE)
+                    if w.t(x, 50).terrain == TERRAIN_PLAIN and not w.t(x, 50).road)
+        sx, tx = max(0, x - 10), min(MAP_SIZE - 1, x + 10)
+        paths.path(sx, 50, tx, 50)
+        paths.path(sx, 50, tx, 50, road_allied={3})
+        w.set_tile_owner(x, 50, 3)
+        paths.path(sx, 50, tx, 50)
+        self.assertEqual(paths.hits, 1)
+        self.assertEqual(paths.path(sx, 50, tx, 50, road_allied={3}),
+                         find_path(w, sx, 50, tx, 50, road_allied={3}))
+        self.assertEqual(paths.misses, 3)
+
+    def test_flow_field_paths_are_optimal(self):
+        g = Game(seed=9)
+        w = g.world
+        cap = g.nations[0].capital
+        field = FlowField(PathService(w).grid().cost, cap.x, cap.y)
+        rnd = random.Random(2)
+        for _ in range(30):
+            sx = min(MAP_SIZE - 1, max(0, cap.x + rnd.randint(-20, 20)))
+            sy = min(MAP_SIZE - 1, max(0, cap.y + rnd.randint(-20, 20)))
+            path = field.path_from(sx, sy)
+            if (sx, sy) == (cap.x, cap.y):
+                self.assertEqual(path, [])
+                continue
+            self.assertEqual(path[-1], (cap.x, cap.y))
+            _steps_ok(self, (sx, sy), path)
+            self.assertEqual(_cost(w, path), field.dist[sy * MAP_SIZE + sx])
+            # Never dearer than the box-bounded A* route.
+            self.assertLessEqual(_cost(w, path), _cost(w, find_path(w, sx, sy, cap.x, cap.y)))
+
+        # Lazily expanded distances agree with a full expansion.
+        full = FlowField(field.cost, cap.x, cap.y)
+        full.expand()
+        for i, done in enumerate(field.settled):
+            if done:
+                self.assertEqual(field.dist[i], full.dist[i])
+
+
+class TestBatches(unittest.TestCase):
+
+    def test_batch_matches_single_requests(self):
+        g = Game(seed=8)
+        for _ in range(30):
+            g.process_turn()
+        w = g.world
+        rnd = random.Random(4)
+        cap = g.nations[1].capital
+        requests = []
+        for i in range(60):
+            sx, sy = rnd.randrange(MAP_SIZE), rnd.randrange(MAP_SIZE)
+            if i % 3 == 0:
+                requests.append(PathRequest(sx, sy, cap.x, cap.y, shared=True))
+            else:
+                requests.append(PathRequest(sx, sy, rnd.randrange(MAP_SIZE),
+                                            rnd.randrange(MAP_SIZE),
+                                            road_allied={i % 5}))
+        single = PathService(w)
+        want = [single.toward(r.sx, r.sy, r.tx, r.ty, r.allow_ocean, r.road_allied)
+                if r.shared else
+                single.path(r.sx, r.sy, r.tx, r.ty, None, r.allow_ocean, r.road_allied)
+                for r in requests]
+        watchers = len(w.tile_watchers)
+        self.assertEqual(find_paths_batch(w, requests), want)
+        self.assertEqual(len(w.tile_watchers), watchers)   # temporary service detached
+        for kind in ('thread', 'process'):
+            with self.subTest(kind=kind):
+                paths = PathService(w)
+                paths.use_workers(1, kind)
+                self.assertEqual(find_paths_batch(w, requests, paths), want)
+                paths.use_workers(0)
+                paths.detach()
+
+    def test_workers_do_not_change_the_game(self):
+        def run(workers):
+            g = Game(seed=21)
+            if workers:
+                g.paths.use_workers(1, 'thread')
+            for _ in range(60):
+                g.process_turn()
+            g.paths.use_workers(0)
+            return [(n.name, n.alive, dict(n.tiles), dict(n.res)) for n in g.nations]
+        self.assertEqual(run(True), run(False))
+
+
+if __name__ == '__main__':
+    unittest.main()
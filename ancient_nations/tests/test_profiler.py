@@ -0,0 +1,75 @@
+"""
+TurnProfiler: profiling must not change the simulation, must leave nothing
+wrapped after detach(), and must be reachable from the CLI.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_profiler
+"""
+
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pathfinding
+from game import Game
+from profiler import PHASES, TurnProfiler
+
+CLI = Path(__file__).parent.parent / 'cli.py'
+
+
+def _state(g):
+    return [(n.name, n.alive, dict(n.tiles), dict(n.res)) for n in g.nations]
+
+
+class TestTurnProfiler(unittest.TestCase):
+
+    def test_profiled_game_is_unchanged(self):
+        plain, profiled = Game(seed=11), Game(seed=11)
+        route, find = pathfinding._route, pathfinding.find_path
+        prof = TurnProfiler().attach(profiled)
+        for _ in range(40):
+            plain.process_turn()
+            profiled.process_turn()
+            self.assertEqual(set(prof.turn_dict()), set(PHASES))
+        prof.detach()
+        self.assertEqual(_state(plain), _state(profiled))
+        self.assertIsNone(profiled.profiler)
+        self.assertNotIn('tiles_in_radius', vars(profiled.world))
+        self.assertNotIn('resolve', vars(profiled.combat))
+        self.assertIs(pathfinding._route, route)
+        self.assertIs(pathfinding.find_path, find)
+
+        out = prof.summary()
+        self.assertEqual(out['turns'], 40)
+        self.assertEqual(list(out['phases']), list(PHASES))
+        self.assertGreaterEqual(len(out['nations']), sum(1 for n in profiled.nations if n.alive))
+        self.assertGreater(out['calls']['tiles_in_radius'], 0)
+        for line in prof.folded().splitlines():
+            stack, micros = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('turn;'))
+            self.assertGreater(int(micros), 0)
+
+    def test_cli(self):
+        res = subprocess.run([sys.executable, str(CLI), 'profile', '--seed', '3',
+                              '--turns', '10', '--no-cache'],
+                             capture_output=True, text=True)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        out = json.loads(res.stdout)
+        self.assertEqual(out['turns'], 10)
+        self.assertIn('ai', out['phases'])
+
+        res = subprocess.run([sys.executable, str(CLI), 'stream', '--seed', '3',
+                              '--turns', '3', '--no-cache', '--profile'],
+                             capture_output=True, text=True)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        lines = [json.loads(l) for l in res.stdout.splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(set(l['profile']) == set(PHASES) for l in lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Turn-indexed battle and event stores: every query must return exactly what
+a scan of the plain list returns, in the same order.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_records
+"""
+
+import json
+import pickle
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import narrative
+from constants import INNER_SIZE
+from engine import GameSession
+from records import TurnLog
+from snapshot import battle_dict
+
+ROOT = Path(__file__).parent.parent
+
+
+class Rec:
+    def __init__(self, turn, x, y, a, d):
+        self.turn, self.x, self.y, self.atk_nation, self.def_nation = turn, x, y, a, d
+
+
+class TestTurnLog(unittest.TestCase):
+
+    def test_queries_match_scans(self):
+        s = GameSession(seed=5)
+        s.run_turns(250)
+        g = s.game
+        battles, events = list(g.battles), list(g.events_history)
+        self.assertTrue(battles and events)
+        for lo, hi in ((None, None), (0, 40), (100, 100), (120, 500), (251, 300), (None, 80)):
+            a, b = lo if lo is not None else -1, hi if hi is not None else 10 ** 9
+            self.assertEqual(g.battles.between(lo, hi), [x for x in battles if a <= x.turn <= b])
+            self.assertEqual(g.events_history.between(lo, hi), [x for x in events if a <= x.turn <= b])
+            for n in g.nations:
+                self.assertEqual(g.battles.for_nation(n.idx, lo, hi),
+                                 [x for x in battles if a <= x.turn <= b
+                                  and n.idx in (x.atk_nation, x.def_nation)])
+            for ox, oy in ((0, 0), (3, 4), (9, 9)):
+                self.assertEqual(g.battles.in_region(ox, oy, lo, hi),
+                                 [x for x in battles if a <= x.turn <= b
+                                  and (x.x // INNER_SIZE, x.y // INNER_SIZE) == (ox, oy)])
+        for t in (1, 50, 250):
+            self.assertEqual(g.battles.turn(t), [x for x in battles if x.turn == t])
+            self.assertEqual(g.events_history.since(t), [x for x in events if x.turn >= t])
+        # Indexes survive checkpoint pickling.
+        g2 = pickle.loads(pickle.dumps(g.battles))
+        self.assertEqual(len(g2.for_nation(0)), len(g.battles.for_nation(0)))
+
+    def test_order_enforced(self):
+        log = TurnLog()
+        log.append(Rec(3, 0, 0, 0, -1))
+        log.append(Rec(3, 0, 0, 0, -1))
+        with self.assertRaises(ValueError):
+            log.append(Rec(2, 0, 0, 0, -1))
+        self.assertEqual(log.turn(1), [])
+        self.assertEqual(len(log.turn(3)), 2)
+        self.assertEqual(log.index(4), 2)
+
+
+class TestConsumers(unittest.TestCase):
+
+    def test_narrative_unsorted_input(self):
+        # Sorted exports take the bisect path; shuffled ones the scan; same prose.
+        s = GameSession(seed=9)
+        s.run_turns(300)
+        state = s.snapshot(log_limit=0)
+        state['battles'] = [battle_dict(b, [n.name for n in s.game.nations])
+                            for b in s.game.battles]
+        text = narrative.render(state)
+        shuffled = dict(state, battles=state['battles'][::2] + state['battles'][1::2])
+        self.assertEqual(narrative._in_turns(shuffled['battles'], 100, 150),
+                         [b for b in shuffled['battles'] if 100 <= b['turn'] <= 150])
+        self.assertIn('Turns 1–', text)
+
+    def test_cli_battles_filters(self):
+        def run(*extra):
+            out = subprocess.run([sys.executable, 'cli.py', 'battles', '--seed', '4',
+                                  '--turns', '120', '--no-cache', *extra],
+                                 cwd=ROOT, capture_output=True, text=True, check=True)
+            return json.loads(out.stdout)
+        full = run()['battles']
+        some = run('--from', '60', '--to', '90')
+        self.assertEqual(some['battles'], [b for b in full if 60 <= b['turn'] <= 90])
+        self.assertEqual(some['count'], len(some['battles']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Per-game random streams: sessions in one process must not affect each other.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_rng_isolation
+"""
+
+import random
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine import GameSession
+from rng import RandomStreams
+
+
+def _solo(seed, turns):
+    s = GameSession(seed=seed)
+    s.run_turns(turns)
+    return s.snapshot(log_limit=300)
+
+
+class TestRngIsolation(unittest.TestCase):
+
+    def test_interleaved_sessions_match_solo_runs(self):
+        expected = {seed: _solo(seed, 40) for seed in (21, 22)}
+        a, b = GameSession(seed=21), GameSession(seed=22)
+        for _ in range(40):
+            a.step()
+            b.step()
+        self.assertEqual(a.snapshot(log_limit=300), expected[21])
+        self.assertEqual(b.snapshot(log_limit=300), expected[22])
+
+    def test_threaded_sessions_are_reproducible(self):
+        seeds = (31, 32, 33)
+        expected = {seed: _solo(seed, 25) for seed in seeds}
+        results = {}
+        threads = [threading.Thread(target=lambda s=seed: results.__setitem__(s, _solo(s, 25)))
+                   for seed in seeds]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, expected)
+
+    def test_global_random_untouched(self):
+        random.seed(1234)
+        before = random.getstate()
+        _solo(41, 10)
+        self.assertEqual(random.getstate(), before)
+
+    def test_streams_are_independent_and_seeded(self):
+        a, b = RandomStreams(7), RandomStreams(7)
+        self.assertEqual(a.ai.random(), b.ai.random())
+        a.combat.random()                  # extra draw on one stream only
+        self.assertEqual(a.events.random(), b.events.random())
+        self.assertNotEqual(RandomStreams(8).ai.random(), RandomStreams(7).ai.random())
+
+
+if __name__ == '__main__':
+    unittest.main()
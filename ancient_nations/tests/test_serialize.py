@@ -0,0 +1,94 @@
+"""
+Streaming serializer: the json backend must write exactly what json.dumps
+writes (compact and indent=2), converting Rows only as they are written.
+The orjson and msgpack backends are checked when those packages are installed.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_serialize
+"""
+
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serialize
+from engine import GameSession
+from serialize import Rows, write
+from snapshot import battle_dict
+
+DOC = {
+    'turn':   3,
+    'name':   'Ærelon',
+    'empty':  Rows([], str),
+    'nested': {'a': [1, {'b': None}], 'c': []},
+    'rows':   Rows(range(600), lambda i: {'i': i, 'sq': [i * i], 'ok': i % 2 == 0}),
+    'inner':  {'rows': Rows(range(2), float)},
+}
+
+
+def plain(doc):
+    # The same document with every Rows expanded to a list.
+    def expand(v):
+        if isinstance(v, Rows):
+            return [expand(x) for x in v]
+        if isinstance(v, dict):
+            return {k: expand(x) for k, x in v.items()}
+        return v
+    return expand(doc)
+
+
+def written(doc, encoder='json', pretty=False):
+    buf = io.BytesIO()
+    write(buf, doc, encoder, pretty)
+    return buf.getvalue()
+
+
+class TestSerialize(unittest.TestCase):
+
+    def test_json_matches_dumps(self):
+        for pretty in (False, True):
+            with self.subTest(pretty=pretty):
+                want = json.dumps(plain(DOC), indent=2 if pretty else None) + '\n'
+                self.assertEqual(written(DOC, pretty=pretty).decode(), want)
+        self.assertEqual(written(Rows([1, 2], str)), b'["1", "2"]\n')
+        self.assertEqual(written([]), b'[]\n')
+
+    def test_rows_are_lazy(self):
+        made = []
+        doc = {'rows': Rows(range(3), lambda i: made.append(i) or i)}
+        self.assertEqual(made, [])
+        written(doc)
+        self.assertEqual(made, [0, 1, 2])
+
+    def test_game_summary(self):
+        s = GameSession(seed=8)
+        s.run_turns(80)
+        names = [n.name for n in s.game.nations]
+        eager = s.snapshot(log_limit=40)
+        eager['battles'] = [battle_dict(b, names) for b in s.game.battles]
+        lazy = s.snapshot(log_limit=40, lazy=True)
+        lazy['battles'] = Rows(s.game.battles, lambda b: battle_dict(b, names))
+        self.assertEqual(written(lazy).decode(), json.dumps(eager) + '\n')
+
+    @unittest.skipUnless(serialize.orjson, 'orjson not installed')
+    def test_orjson(self):
+        for pretty in (False, True):
+            self.assertEqual(json.loads(written(DOC, 'orjson', pretty)), plain(DOC))
+
+    @unittest.skipUnless(serialize.msgpack, 'msgpack not installed')
+    def test_msgpack(self):
+        self.assertEqual(serialize.msgpack.unpackb(written(DOC, 'msgpack')), plain(DOC))
+
+    def test_missing_backend(self):
+        for enc in ('orjson', 'msgpack'):
+            if not serialize.available(enc):
+                with self.assertRaises(RuntimeError):
+                    written(DOC, enc)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Session server: answers must match a fresh GameSession at the same turn,
+cached answers must not outlive the turn they were computed for, and the
+pool must drop sessions by LRU order and idleness.  Both transports are
+exercised against a server thread.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_server
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import server
+from engine import GameSession
+from server import RPCError, SessionPool, handle
+from snapshot import events_query, nation_query, tile_query
+
+
+def rpc(pool, method, **params):
+    resp = json.loads(handle(pool, json.dumps({'jsonrpc': '2.0', 'id': 1,
+                                                'method': method, 'params': params})))
+    if 'error' in resp:
+        raise RPCError(resp['error']['code'], resp['error']['message'])
+    return resp['result']
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = SessionPool(max_sessions=3, cache=False)
+
+    def test_answers_match_fresh_session(self):
+        sid = rpc(self.pool, 'open', seed=4, turns=20)['session']
+        ref = GameSession(seed=4)
+        ref.run_turns(20)
+        self.assertEqual(rpc(self.pool, 'query', session=sid, tile=[10, 12]),
+                         json.loads(json.dumps(tile_query(ref.game, 10, 12))))
+        self.assertEqual(rpc(self.pool, 'step', session=sid)['turn'], 21)
+        ref.step()
+        name = ref.game.nations[0].name
+        self.assertEqual(rpc(self.pool, 'query', session=sid, nation=name),
+                         json.loads(json.dumps(nation_query(ref.game, name))))
+        self.assertEqual(rpc(self.pool, 'run_turns', session=sid, n=9), {'turn': 30})
+        ref.run_turns(9)
+        self.assertEqual(rpc(self.pool, 'snapshot', session=sid),
+                         json.loads(json.dumps(ref.snapshot())))
+
+    def test_cache_cleared_on_advance(self):
+        sid = rpc(self.pool, 'open', seed=5, turns=5)['session']
+        first = rpc(self.pool, 'snapshot', session=sid, log_limit=5)
+        self.assertEqual(rpc(self.pool, 'snapshot', session=sid, log_limit=5), first)
+        rpc(self.pool, 'step', session=sid)
+        self.assertEqual(rpc(self.pool, 'snapshot', session=sid, log_limit=5)['turn'], 6)
+
+    def test_fork_is_independent(self):
+        a = rpc(self.pool, 'open', seed=6, turns=10)['session']
+        b = rpc(self.pool, 'fork', session=a)
+        self.assertEqual(b['turn'], 10)
+        rpc(self.pool, 'run_turns', session=b['session'], n=5)
+        self.assertEqual(self.pool.entry(a).session.game.turn, 10)
+        ref = GameSession(seed=6)
+        ref.run_turns(15)
+        self.assertEqual(rpc(self.pool, 'snapshot', session=b['session']),
+                         json.loads(json.dumps(ref.snapshot())))
+
+    def test_eviction(self):
+        ids = [rpc(self.pool, 'open', seed=s)['session'] for s in (1, 2, 3)]
+        rpc(self.pool, 'query', session=ids[0], tile=[0, 0])     # ids[1] is now oldest
+        rpc(self.pool, 'open', seed=4)
+        self.assertEqual([d['session'] for d in rpc(self.pool, 'sessions')][:2],
+                         [ids[2], ids[0]])
+        self.pool.evict_idle(now=self.pool.entry(ids[0]).used + self.pool.idle + 1)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_errors(self):
+        def code(text):
+            return json.loads(handle(self.pool, text))['error']['code']
+        self.assertEqual(code('{not json'), server.PARSE_ERROR)
+        self.assertEqual(code('{"id": 1}'), server.INVALID_REQUEST)
+        self.assertEqual(code('{"id": 1, "method": "nope"}'), server.METHOD_NOT_FOUND)
+        self.assertEqual(code('{"id": 1, "method": "step", "params": {"bogus": 1}}'),
+                         server.INVALID_PARAMS)
+        self.assertEqual(code('{"id": 1, "method": "step", "params": {"session": "s9"}}'),
+                         server.SERVER_ERROR)
+        self.assertEqual(code('[]'), server.INVALID_REQUEST)
+        bad = json.loads(handle(self.pool, json.dumps(
+            {'jsonrpc': '2.0', 'id': 7, 'method': 'open', 'params': {'seed': 5, 'grid': 'bogus'}})))
+        self.assertEqual((bad['id'], bad['error']['code']), (7, server.INTERNAL_ERROR))
+        sid = rpc(self.pool, 'open', seed=1)['session']
+        with self.assertRaises(RPCError):
+            rpc(self.pool, 'query', session=sid, tile=[-1, 0])
+        with self.assertRaises(RPCError) as cm:
+            rpc(self.pool, 'query', session=sid, nation=5)
+        self.assertEqual(cm.exception.code, server.INTERNAL_ERROR)
+        with self.assertRaises(RPCError) as cm:
+            rpc(self.pool, 'query', session=sid, tile=[1, 2], evnets=True)   # typo
+        self.assertEqual(cm.exception.code, server.INVALID_PARAMS)
+        self.assertEqual(rpc(self.pool, 'query', session=sid, events=True, **{'from': 0}),
+                         json.loads(json.dumps(events_query(self.pool.entry(sid).session.game, 0))))
+        batch = json.loads(handle(self.pool, json.dumps([
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'sessions'},
+            {'jsonrpc': '2.0', 'method': 'step', 'params': {'session': sid}},   # notification
+        ])))
+        self.assertEqual([r['id'] for r in batch], [1])
+        self.assertEqual(self.pool.entry(sid).session.game.turn, 1)
+
+    def serve(self, srv):
+        t = threading.Thread(target=srv.serve_forever, kwargs={'poll_interval': 0.05})
+        t.start()
+        self.addCleanup(t.join)
+        self.addCleanup(srv.server_close)
+        self.addCleanup(srv.shutdown)
+
+    def test_http(self):
+        srv = server.HTTPRPCServer(('127.0.0.1', 0), self.pool)
+        self.serve(srv)
+        address = f'http://127.0.0.1:{srv.server_address[1]}'
+        sid = server.call(address, 'open', seed=2, turns=3)['session']
+        self.assertEqual(server.call(address, 'step', session=sid)['turn'], 4)
+        with self.assertRaises(RPCError):
+            server.call(address, 'query', session=sid, nation=5)
+        self.assertEqual(server.call(address, 'sessions')[0]['turn'], 4)
+
+    @unittest.skipUnless(hasattr(server.socketserver, 'UnixStreamServer'), 'no Unix sockets')
+    def test_unix_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), 'an.sock')
+        self.serve(server.UnixRPCServer(path, self.pool))
+        with self.assertRaises(RPCError):
+            server.call(f'unix:{path}', 'open', seed=2, grid='bogus')
+        sid = server.call(f'unix:{path}', 'open', seed=2)['session']
+        self.assertEqual(server.call(f'unix:{path}', 'run_turns', session=sid, n=2), {'turn': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Delta stream contract — `cli.py stream --delta`.
+
+Decoded with delta.DeltaDecoder, a delta stream must reproduce the plain
+stream line for line (see test_stream_schema for the frame schema), and
+its ownership map must match the game's.
+
+Schema (documented here next to the plain-stream contract):
+  - Every line has "frame": "key" or "delta", and "turn".
+  - The first line, and every K-th after it (--keyframe K, default 50), is
+    a keyframe: {frame, turn, map_size, nations, battles_this_turn,
+    events_this_turn, owners}.  nations are full turn_summary rows; owners
+    run-length encodes the map row-major as [[owner, count], ...] (owner -1
+    for unclaimed; counts sum to map_size**2).
+  - Other lines are deltas: {frame, turn, nations, battles_this_turn,
+    events_this_turn, owners} plus "dropped" only when a row lost keys.
+      nations: {"<row index>": {field: new value}} — changed fields only.
+      dropped: {"<row index>": [field, ...]} — e.g. death_turn/absorbed_by
+               after a rebel revives a slot.
+      owners:  [[start tile, count, owner], ...] — tiles start..start+count-1
+               (row-major) now belong to owner.
+  - battles_this_turn / events_this_turn are always present in full.
+  - "profile" is passed through unchanged when --profile is given.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_stream_delta
+"""
+
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from delta import DeltaDecoder, DeltaEncoder, decode
+from engine import GameSession
+
+ROOT = Path(__file__).parent.parent
+KEY_KEYS   = {'frame', 'turn', 'map_size', 'nations', 'battles_this_turn',
+              'events_this_turn', 'owners'}
+DELTA_KEYS = {'frame', 'turn', 'nations', 'battles_this_turn', 'events_this_turn', 'owners'}
+
+
+def stream(*args):
+    out = subprocess.run([sys.executable, 'cli.py', 'stream', '--no-cache', *args],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.splitlines()
+
+
+class TestDeltaStream(unittest.TestCase):
+
+    def test_cli_round_trip(self):
+        for extra in ((), ('--from', '40'), ('--keyframe', '7', '--profile')):
+            with self.subTest(extra=extra):
+                plain = stream('--seed', '123', '--turns', '120', *extra)
+                delta = stream('--seed', '123', '--turns', '120', '--delta', *extra)
+                self.assertEqual(len(plain), len(delta))
+                lines = [json.loads(l) for l in delta]
+                self.assertEqual(lines[0]['frame'], 'key')
+                for line in lines:
+                    keys = set(line) - {'dropped', 'profile'}
+                    self.assertEqual(keys, KEY_KEYS if line['frame'] == 'key' else DELTA_KEYS)
+                if '--profile' in extra:
+                    self.assertEqual([l['frame'] for l in lines[:8]],
+                                     ['key'] + ['delta'] * 6 + ['key'])
+                    # Timings differ between runs; compare everything else.
+                    strip = lambda f: {k: v for k, v in f.items() if k != 'profile'}
+                    self.assertEqual([strip(f) for f in decode(delta)],
+                                     [strip(json.loads(l)) for l in plain])
+                else:
+                    self.assertEqual([json.dumps(f) for f in decode(delta)], plain)
+
+    def test_owners_follow_game(self):
+        s = GameSession(seed=3)
+        s.run_turns(10)
+        enc, dec = DeltaEncoder(s.game, keyframe=25), DeltaDecoder()
+        size = len(s.game.world.tiles)
+        for _ in range(60):
+            s.step()
+            frame = dec.feed(json.dumps(enc.encode(s.turn_snapshot())))
+            self.assertEqual(frame, json.loads(json.dumps(s.turn_snapshot())))
+        enc.close()
+        self.assertFalse(any(w is enc._owned for w in s.game.world.owner_watchers))
+        self.assertEqual(dec.owners,
+                         [t.owner for row in s.game.world.tiles for t in row])
+        self.assertEqual(len(dec.owners), size * size)
+
+    def test_delta_needs_keyframe(self):
+        with self.assertRaises(ValueError):
+            DeltaDecoder().feed({'frame': 'delta', 'turn': 1, 'nations': {},
+                                 'battles_this_turn': [], 'events_this_turn': [],
+                                 'owners': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
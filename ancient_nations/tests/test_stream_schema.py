@@ -29,7 +29,7 @@ PYTHON = sys.executable
 
 def run_cli(*args):
     result = subprocess.run(
-        [PYTHON, str(CLI)] + list(args),
+        [PYTHON, str(CLI)] + list(args) + ['--no-cache'],   # plain replay, no checkpoints
         capture_output=True,
         text=True,
     )
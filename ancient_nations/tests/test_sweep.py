@@ -0,0 +1,85 @@
+"""
+Multi-seed sweep: parallel runs, aggregation, and resuming a killed sweep.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_sweep
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sweep
+
+PARAMS = {'turns': 12, 'nations': 4, 'grid': 'objects', 'no_events': False,
+          'no_cache': True, 'log_limit': 0}
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_parse_seeds(self):
+        self.assertEqual(sweep.parse_seeds('1-3,7,2'), [1, 2, 3, 7])
+        with self.assertRaises(ValueError):
+            sweep.parse_seeds('5-1')
+
+    def test_distribution(self):
+        d = sweep.distribution([4, 1, 3, 2])
+        self.assertEqual((d['count'], d['min'], d['max'], d['median']), (4, 1, 4, 2.5))
+        self.assertEqual(sweep.distribution([]), {'count': 0})
+
+    def test_pool_matches_inline_and_streams_summaries(self):
+        lines = []
+        inline = sweep.run_sweep([1, 2, 3], PARAMS, workers=1, emit=lines.append)
+        pooled = sweep.run_sweep([1, 2, 3], PARAMS, workers=2, emit=lambda line: None)
+        self.assertEqual(inline, pooled)
+        self.assertEqual(sorted(json.loads(l)['seed'] for l in lines), [1, 2, 3])
+        self.assertEqual(inline['seeds'], 3)
+        self.assertEqual(inline['survival_turn']['count'], 3 * PARAMS['nations'])
+        self.assertEqual(sum(t['wins'] for t in inline['traits'].values()), 3)
+
+    def test_resume_skips_finished_seeds_and_drops_torn_line(self):
+        out = self.dir / 'sweep.ndjson'
+        full = sweep.run_sweep([1, 2, 3], PARAMS, workers=1, out=out)
+
+        # Simulate a kill during seed 3: its line is only half written.
+        lines = out.read_text().splitlines(keepends=True)
+        out.write_text(''.join(lines[:-1]) + lines[-1][:40])
+        resumed = sweep.run_sweep([1, 2, 3], PARAMS, workers=1, out=out)
+
+        self.assertEqual(resumed.pop('resumed'), 2)
+        full.pop('resumed')
+        self.assertEqual(resumed, full)
+        self.assertEqual(len(out.read_text().splitlines()), 4)   # header + 3 seeds
+
+    def test_seed_zero_is_a_seed(self):
+        # 0 used to mean "random world": its line could never be matched on resume.
+        out = self.dir / 'sweep.ndjson'
+        full = sweep.run_sweep([0, 1], PARAMS, workers=1, out=out)
+        self.assertEqual(sorted(json.loads(l)['seed'] for l in out.read_text().splitlines()[1:]),
+                         [0, 1])
+        resumed = sweep.run_sweep([0, 1], PARAMS, workers=1, out=out)
+        self.assertEqual(resumed.pop('resumed'), 2)
+        full.pop('resumed')
+        self.assertEqual(resumed, full)
+        self.assertEqual(len(out.read_text().splitlines()), 3)   # header + 2 seeds
+
+    def test_resume_refuses_other_parameters(self):
+        out = self.dir / 'sweep.ndjson'
+        sweep.run_sweep([1], PARAMS, workers=1, out=out)
+        with self.assertRaises(ValueError):
+            sweep.run_sweep([1], dict(PARAMS, turns=13), workers=1, out=out)
+
+
+if __name__ == '__main__':
+    unittest.main()
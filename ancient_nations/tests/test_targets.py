@@ -0,0 +1,75 @@
+"""
+TargetMaps: army target picks must match the original radius scan, with
+and without NumPy, while the map changes under them.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_targets
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import targets
+from constants import NUM_RESOURCES
+from game import Game
+from targets import ATTACK, EXPAND, SEARCH_RADIUS, TargetMaps
+
+
+def _scan(ai, kind, needed, cx, cy):
+    best_score, best_tile = -1, None
+    for t in ai.world.tiles_in_radius(cx, cy, SEARCH_RADIUS):
+        if not t.is_land() or t.owner == ai.n.idx:
+            continue
+        if t.owner < 0 and kind == ATTACK:
+            continue
+        if t.owner >= 0 and not ai.n.at_war_with(t.owner):
+            continue
+        score = 0
+        score += t.deposits[needed] * 3
+        for r in range(NUM_RESOURCES):
+            score += t.deposits[r]
+        score /= (abs(t.x - cx) + abs(t.y - cy) + 1)
+        if score > best_score:
+            best_score, best_tile = score, (t.x, t.y)
+    return best_tile
+
+
+class TestTargetMaps(unittest.TestCase):
+
+    def test_picks_match_scan(self):
+        modes = [False] + ([True] if targets.np is not None else [])
+        g = Game(seed=42)
+        maps = [TargetMaps(g, vectorized=v) for v in modes]
+        checked = 0
+        for _ in range(160):
+            g.process_turn()
+            if g.turn % 20:
+                continue
+            for ai in g.ai:
+                if not ai.n.alive:
+                    continue
+                for army in ai.n.armies:
+                    for kind in (ATTACK, EXPAND):
+                        for needed in range(NUM_RESOURCES):
+                            want = _scan(ai, kind, needed, army.x, army.y)
+                            for m in maps:
+                                self.assertEqual(
+                                    m.best(ai.n, kind, needed, army.x, army.y), want)
+                            checked += want is not None
+        self.assertGreater(checked, 0)
+
+    def test_map_edges(self):
+        g = Game(seed=3)
+        n = g.nations[0]
+        for v in [False] + ([True] if targets.np is not None else []):
+            m = TargetMaps(g, vectorized=v)
+            for x, y in ((0, 0), (99, 0), (0, 99), (99, 99), (50, 2)):
+                self.assertEqual(m.best(n, EXPAND, 0, x, y),
+                                 _scan(g.ai[0], EXPAND, 0, x, y))
+
+
+if __name__ == '__main__':
+    unittest.main()
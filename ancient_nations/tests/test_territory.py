@@ -0,0 +1,116 @@
+"""
+TerritoryIndex: incremental coverage must match full rescans exactly.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_territory
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai import NationAI
+from constants import MAP_SIZE, TERRITORY_NEGLECT_ABANDON_TURNS
+from engine import GameSession
+from game import Game
+from nation import TileSet
+
+
+# The full-rescan implementations TerritoryIndex replaced.
+def _rescan_abandonment(self, t):
+    for n in self.nations:
+        if not n.alive:
+            continue
+        covered = set()
+        bonus = n.trait_val('town_radius_bonus', 0)
+        for town in n.towns:
+            for tile in self.world.tiles_in_radius(town.x, town.y, town.radius + bonus):
+                if tile.owner == n.idx:
+                    covered.add((tile.x, tile.y))
+        for xy in list(n.tiles):
+            tile = self.world.t(xy[0], xy[1])
+            if xy in covered:
+                tile.territory_neglect = 0
+                continue
+            tile.territory_neglect += 1
+            if tile.territory_neglect >= TERRITORY_NEGLECT_ABANDON_TURNS:
+                self._abandon_tile_to_neutral(n, tile, t)
+
+
+def _rescan_expansion(self, turn):
+    bonus = self.n.trait_val('town_radius_bonus', 0)
+    for town in self.n.towns:
+        for tile in self.world.tiles_in_radius(town.x, town.y, town.radius + bonus):
+            if tile.owner == -1 and tile.is_land():
+                self.world.set_tile_owner(tile.x, tile.y, self.n.idx)
+                self.n.tiles.add((tile.x, tile.y))
+
+
+class TestTerritoryIndex(unittest.TestCase):
+
+    def test_matches_full_rescan(self):
+        for seed in (1, 11):
+            with self.subTest(seed=seed):
+                s = GameSession(seed=seed)
+                s.run_turns(150)
+                expected = s.snapshot(log_limit=500)
+                with patch.object(Game, '_tick_territory_abandonment', _rescan_abandonment), \
+                        patch.object(NationAI, '_expansion_decisions', _rescan_expansion):
+                    ref = GameSession(seed=seed)
+                    ref.run_turns(150)
+                    self.assertEqual(ref.snapshot(log_limit=500), expected)
+
+    def test_counts_match_town_discs(self):
+        g = Game(seed=5)
+        for _ in range(120):
+            g.process_turn()
+            if g.turn % 30:
+                continue
+            for n in g.nations:
+                bonus = n.trait_val('town_radius_bonus', 0)
+                want = [0] * (MAP_SIZE * MAP_SIZE)
+                for town in n.towns:
+                    for tile in g.world.tiles_in_radius(town.x, town.y,
+                                                        town.radius + bonus):
+                        want[tile.y * MAP_SIZE + tile.x] += 1
+                self.assertEqual(g.territory.covered(n, 0, 0), bool(want[0]))
+                self.assertEqual(list(g.territory._cov[n.idx].count), want)
+
+    def test_border_sets_match_scan(self):
+        g = Game(seed=42)
+        rebelled = False
+        for _ in range(160):
+            g.process_turn()
+            if g.turn == 80:
+                parent = max((n for n in g.nations if n.alive), key=lambda n: len(n.tiles))
+                rebelled = g.spawn_rebel_nation(g.turn, parent) is not None
+            if g.turn % 20:
+                continue
+            for a in g.nations:
+                every = set()
+                for b in g.nations:
+                    if a is b:
+                        continue
+                    want = {(x, y) for x, y in a.tiles
+                            if {(x+1, y), (x-1, y), (x, y+1), (x, y-1)} & b.tiles.keys()}
+                    self.assertEqual(g.territory.border_tiles(a, b), want)
+                    self.assertEqual(g.territory.adjacent(a, b), bool(want))
+                    every |= want
+                self.assertEqual(g.territory.border_tiles(a), every)
+        self.assertTrue(rebelled)
+
+    def test_tileset_values_follow_insertion_order(self):
+        ts = TileSet([(3, 3), (1, 1), (3, 3), (2, 2)])
+        self.assertEqual(list(ts), [(3, 3), (1, 1), (2, 2)])
+        ts.discard((1, 1))
+        ts.add((0, 0))
+        ts.add((3, 3))
+        self.assertEqual(list(ts), [(3, 3), (2, 2), (0, 0)])
+        self.assertEqual(sorted(ts, key=ts.__getitem__), list(ts))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,9 +23,11 @@ class TestTraitHistory(unittest.TestCase):
             # Deterministic: first alternative trait in list order
             return seq[0]
 
-        # Call order: (1) target selection, (2) new_leader crisis branch, (3) ASSN_CHANGE_CHANCE
-        with patch('events.random.random', side_effect=[0.0, 0.0, 0.0]), patch(
-                'events.random.choice', fake_choice):
+        # Events stream: (1) target selection, (2) ASSN_CHANGE_CHANCE.
+        # Nations stream: crisis branch, then the new leader's aggression draw.
+        with patch.object(g.rng.events, 'random', side_effect=[0.0, 0.0]), \
+                patch.object(g.rng.events, 'choice', fake_choice), \
+                patch.object(g.rng.nations, 'random', side_effect=[0.0, 0.5]):
             es._assassination(turn=99, cx=1, cy=1, mag=1)
 
         self.assertTrue(target.trait_history)
@@ -45,8 +47,10 @@ class TestTraitHistory(unittest.TestCase):
         es = g.events
         target = g.nations[0]
 
-        # Call order: (1) target selection, (2) new_leader crisis branch, (3) ASSN_CHANGE_CHANCE
-        with patch('events.random.random', side_effect=[0.0, 0.99, 0.99]):
+        # Events stream: (1) target selection, (2) ASSN_CHANGE_CHANCE.
+        # Nations stream: crisis branch, then the new leader's aggression draw.
+        with patch.object(g.rng.events, 'random', side_effect=[0.0, 0.99]), \
+                patch.object(g.rng.nations, 'random', side_effect=[0.99, 0.5]):
             es._assassination(turn=3, cx=0, cy=0, mag=1)
 
         self.assertEqual(target.trait_history, [])
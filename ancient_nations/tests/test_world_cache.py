@@ -0,0 +1,98 @@
+"""
+On-disk world cache: hits must be indistinguishable from fresh generation.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_world_cache
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import worldcache
+from engine import GameSession
+from world import World
+from worldcache import WorldCache
+
+
+def _fingerprint(w):
+    return [(t.terrain, t.elevation, t.moisture, tuple(t.deposits.values()))
+            for row in w.tiles for t in row]
+
+
+class TestWorldCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = WorldCache(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_hit_matches_fresh_world_and_rng(self):
+        for grid in World.GRID_MODES:
+            with self.subTest(grid=grid):
+                fresh = World(42, grid=grid)
+                World(42, grid=grid, cache=self.cache)      # miss → store
+                hit = World(42, grid=grid, cache=self.cache)
+                self.assertEqual(hit.rng.getstate(), fresh.rng.getstate())
+                self.assertEqual(_fingerprint(hit), _fingerprint(fresh))
+                self.assertEqual(hit.resource_values, fresh.resource_values)
+
+    def test_session_from_cache_simulates_identically(self):
+        a = GameSession(seed=5, world_cache=self.cache)
+        a.run_turns(40)
+        out_a = a.snapshot(log_limit=100)
+        b = GameSession(seed=5, world_cache=self.cache)
+        b.run_turns(40)
+        self.assertEqual(b.snapshot(log_limit=100), out_a)
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_mapped_arrays_are_copy_on_write(self):
+        World(3, grid='arrays', cache=self.cache)
+        w = World(3, grid='arrays', cache=self.cache)
+        original = w.t(10, 10).terrain
+        w.t(10, 10).terrain = original + 1
+        self.assertEqual(World(3, grid='arrays', cache=self.cache).t(10, 10).terrain, original)
+
+    def test_directory_creation_is_announced_once(self):
+        created = []
+        cache = WorldCache(Path(self.dir) / 'sub' / 'worlds', on_create=created.append)
+        World(3, cache=cache)
+        World(4, cache=cache)
+        self.assertEqual(created, [cache.path])
+        self.assertEqual(len(cache.entries()), 2)
+
+    def test_code_change_changes_key(self):
+        before = self.cache.key(42)
+        fresh = WorldCache(self.dir)
+        with patch.object(worldcache, '_KEY_FILES', worldcache._KEY_FILES[1:]):
+            self.assertNotEqual(fresh.key(42), before)
+
+    def test_corrupt_entry_is_discarded(self):
+        World(8, cache=self.cache)
+        path = self.cache.entries()[0][0]
+        path.write_bytes(b'garbage')
+        self.assertIsNone(self.cache.load(8))
+        self.assertFalse(path.exists())
+
+    def test_lru_eviction(self):
+        World(1, cache=self.cache)
+        one_entry = self.cache.entries()[0][1]
+        small = WorldCache(self.dir, max_bytes=int(one_entry * 2.5))
+        World(2, cache=small)
+        time.sleep(0.05)
+        small.load(1)                  # touch seed 1 → seed 2 becomes LRU
+        World(3, cache=small)
+        names = {p.name for p, _, _ in small.entries()}
+        self.assertEqual(names, {f'{small.key(1)}.anw', f'{small.key(3)}.anw'})
+
+
+if __name__ == '__main__':
+    unittest.main()
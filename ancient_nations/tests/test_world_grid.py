@@ -0,0 +1,106 @@
+"""
+World grid modes — grid='arrays' must be a drop-in for Tile objects.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_world_grid
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from constants import *
+from engine import GameSession
+from grid import np
+from pathfinding import CostGrid
+from targets import ATTACK, EXPAND, TargetMaps
+from world import World
+
+
+class TestWorldGridParity(unittest.TestCase):
+
+    def test_generation_matches_objects(self):
+        a = World(seed=7, grid='arrays')
+        b = World(seed=7)
+        for y in range(MAP_SIZE):
+            for x in range(MAP_SIZE):
+                ta, tb = a.t(x, y), b.t(x, y)
+                self.assertEqual(ta.terrain, tb.terrain)
+                self.assertEqual(ta.elevation, tb.elevation)
+                self.assertEqual(ta.moisture, tb.moisture)
+                self.assertEqual(list(ta.deposits.values()), list(tb.deposits.values()))
+        self.assertEqual(a.resource_values, b.resource_values)
+
+    def test_simulation_matches_objects(self):
+        """Same seed, same turns → identical snapshot in both modes."""
+        sa = GameSession(seed=3, grid='arrays')
+        sb = GameSession(seed=3)
+        for _ in range(60):     # interleaved: each game draws from its own streams
+            sa.step()
+            sb.step()
+        self.assertEqual(sa.snapshot(log_limit=200), sb.snapshot(log_limit=200))
+
+    def test_tile_view_round_trips(self):
+        w = World(seed=1, grid='arrays')
+        t = w.t(10, 12)
+        t.entity = 'castle'
+        t.road = True
+        t.deposits[RES_GOLD] = 2.5
+        self.assertEqual(t.entity, 'castle')
+        self.assertIs(t.road, True)
+        self.assertEqual(w.grid.deposits[w.grid.idx(10, 12) * NUM_RESOURCES + RES_GOLD], 2.5)
+        t.entity = None
+        self.assertIsNone(t.entity)
+
+    def test_views_are_built_on_demand(self):
+        """No per-cell objects: views are transient, armies and towns sparse."""
+        s = GameSession(seed=3, grid='arrays')
+        s.run_turns(20)
+        w, g = s.game.world, s.game.world.grid
+        self.assertEqual(w.t(5, 6), w.tiles[6][5])
+        self.assertIsNot(w.t(5, 6), w.t(5, 6))
+        self.assertEqual(len(g.towns), sum(len(n.towns) for n in s.game.nations))
+        self.assertTrue(all(g.stacks.values()))
+        self.assertEqual(set(g.tops), set(g.stacks))
+        empty = next(t for row in w.tiles for t in row if not t.armies)
+        self.assertEqual(empty.armies, ())
+
+    def test_whole_map_builds_match_objects(self):
+        sa = GameSession(seed=3, grid='arrays')
+        sb = GameSession(seed=3)
+        sa.run_turns(30)
+        sb.run_turns(30)
+        wa, wb = sa.game.world, sb.game.world
+        self.assertEqual(wa.owners(), wb.owners())
+        for allow_ocean, allied in ((False, frozenset()), (True, frozenset({0, 1}))):
+            self.assertEqual(CostGrid(wa, allow_ocean, allied).cost,
+                             CostGrid(wb, allow_ocean, allied).cost)
+        for vectorized in (False, True) if np is not None else (False,):
+            ma = TargetMaps(sa.game, vectorized=vectorized)
+            mb = TargetMaps(sb.game, vectorized=vectorized)
+            for needed in range(NUM_RESOURCES):
+                self.assertTrue(np.array_equal(ma._values(needed), mb._values(needed))
+                                if vectorized else ma._values(needed) == mb._values(needed))
+            for na, nb in zip(sa.game.nations, sb.game.nations):
+                for kind in (ATTACK, EXPAND):
+                    for cx, cy in ((t.x, t.y) for t in na.towns[:2] + [sa.game.world.t(0, 0)]):
+                        self.assertEqual(ma.best(na, kind, RES_GOLD, cx, cy),
+                                         mb.best(nb, kind, RES_GOLD, cx, cy))
+
+    def test_unknown_grid_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            World(seed=1, grid='sparse')
+
+    @unittest.skipIf(np is None, 'NumPy not installed')
+    def test_numpy_views_alias_grid(self):
+        w = World(seed=1, grid='arrays')
+        views = w.grid.as_numpy()
+        views['owner'][4, 9] = 2
+        self.assertEqual(w.t(9, 4).owner, 2)
+        self.assertEqual(views['deposits'].shape, (MAP_SIZE, MAP_SIZE, NUM_RESOURCES))
+
+
+if __name__ == '__main__':
+    unittest.main()
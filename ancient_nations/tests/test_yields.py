@@ -0,0 +1,67 @@
+"""
+YieldCache: cached town yield tables must collect exactly what a rescan does.
+
+Run from ancient_nations/:
+    uv run python -m unittest tests.test_yields
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from constants import RES_GOLD
+from engine import GameSession
+from game import Game
+from yields import YieldCache
+
+
+def _uncached(self, n, town):
+    return n.town_yields(self.world, town)[0]
+
+
+class TestYieldCache(unittest.TestCase):
+
+    def test_matches_uncached_collection(self):
+        for seed in (3, 42):
+            with self.subTest(seed=seed):
+                s = GameSession(seed=seed)
+                s.run_turns(200)
+                expected = s.snapshot(log_limit=500)
+                with patch.object(YieldCache, 'table', _uncached):
+                    ref = GameSession(seed=seed)
+                    ref.run_turns(200)
+                self.assertEqual(ref.snapshot(log_limit=500), expected)
+
+    def test_cached_tables_stay_current(self):
+        g = Game(seed=8)
+        for _ in range(150):
+            g.process_turn()
+            if g.turn % 10:
+                continue
+            for n in g.nations:
+                if not n.alive:
+                    continue
+                for town in n.towns:
+                    self.assertEqual(g.yields.table(n, town),
+                                     n.town_yields(g.world, town)[0])
+
+    def test_touch_invalidates(self):
+        g = Game(seed=9)
+        n = g.nations[0]
+        town = n.towns[0]
+        before = g.yields.table(n, town)
+        self.assertIs(g.yields.table(n, town), before)
+        tile = g.world.t(town.x + 1, town.y)
+        tile.entity = None
+        tile.deposits[RES_GOLD] += 5.0
+        g.world.touch(tile.x, tile.y)
+        after = g.yields.table(n, town)
+        self.assertEqual(after, n.town_yields(g.world, town)[0])
+        self.assertNotEqual(after, before)
+
+
+if __name__ == '__main__':
+    unittest.main()
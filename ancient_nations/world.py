@@ -4,7 +4,14 @@ world.py – Map generation and tile system.
 """
 import random
 import math
+import worldgen
 from constants import *
+from array import array
+from armyindex import ArmyIndex
+from grid import WorldGrid, DepositsView, ENTITY_NAMES, ENTITY_CODES, GRID_FIELDS, np
+
+# Bump when a generation change alters seed→map output (invalidates worldcache).
+GENERATOR_VERSION = 1
 
 # Precomputed (dx, dy) offsets for each integer radius used by tiles_in_radius.
 # Built on first use; eliminates math.dist from the inner loop entirely.
@@ -23,35 +30,9 @@ def _get_radius_offsets(r: int) -> list:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-class Tile:
-    __slots__ = [
-        'x','y','terrain','elevation','moisture',
-        'owner',          # int nation idx or -1
-        'deposits',       # {RES_*: float}  natural deposits
-        'entity',         # None | 'farm' | 'mine' | 'castle'
-        'road',           # bool
-        'town',           # Town obj or None
-        'army',           # Army obj or None  (top army on tile)
-        'armies',         # list of Army objs
-        'captured_turn',
-        'territory_neglect',  # turns this tile was owned but outside all friendly town radii
-    ]
-
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.terrain  = TERRAIN_PLAIN
-        self.elevation= 0.5
-        self.moisture = 0.5
-        self.owner    = -1
-        self.deposits = {RES_FOOD:0, RES_WOOD:0, RES_METAL:0, RES_GOLD:0}
-        self.entity   = None
-        self.road     = False
-        self.town     = None
-        self.army     = None
-        self.armies   = []
-        self.captured_turn = -1
-        self.territory_neglect = 0
+class _TileMethods:
+    """Behaviour shared by Tile and TileView; reads only public attributes."""
+    __slots__ = ()
 
     def is_land(self):
         return self.terrain != TERRAIN_OCEAN
@@ -99,18 +80,240 @@ class Tile:
         return TERRAIN_COLORS[self.terrain] + c + RESET
 
 
+class Tile(_TileMethods):
+    __slots__ = [
+        'x','y','terrain','elevation','moisture',
+        'owner',          # int nation idx or -1
+        'deposits',       # {RES_*: float}  natural deposits
+        'entity',         # None | 'farm' | 'mine' | 'castle'
+        'road',           # bool
+        'town',           # Town obj or None
+        'army',           # Army obj or None  (top army on tile)
+        'armies',         # list of Army objs
+        'captured_turn',
+        'territory_neglect',  # turns this tile was owned but outside all friendly town radii
+    ]
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.terrain  = TERRAIN_PLAIN
+        self.elevation= 0.5
+        self.moisture = 0.5
+        self.owner    = -1
+        self.deposits = {RES_FOOD:0, RES_WOOD:0, RES_METAL:0, RES_GOLD:0}
+        self.entity   = None
+        self.road     = False
+        self.town     = None
+        self.army     = None
+        self.armies   = []
+        self.captured_turn = -1
+        self.territory_neglect = 0
+
+
+class TileView(_TileMethods):
+    """Tile facade over one cell of a WorldGrid, made on demand.
+
+    A view holds no state of its own: scalar fields live in the grid's typed
+    arrays and object references (town, army, armies) in its sparse dicts,
+    so any two views of a cell are interchangeable (and compare equal).
+    An empty `armies` reads as (); assign a list to start a stack.
+    """
+    __slots__ = ['x', 'y', '_g', '_i']
+
+    def __init__(self, grid, x, y):
+        self.x  = x
+        self.y  = y
+        self._g = grid
+        self._i = y * grid.size + x
+
+    def __getstate__(self):
+        return (self.x, self.y, self._g, self._i)
+
+    def __setstate__(self, state):
+        self.x, self.y, self._g, self._i = state
+
+    def __eq__(self, other):
+        return (isinstance(other, TileView) and other._i == self._i
+                and other._g is self._g)
+
+    def __hash__(self):
+        return self._i
+
+    @property
+    def deposits(self):           return DepositsView(self._g.deposits, self._i * NUM_RESOURCES)
+
+    @property
+    def town(self):               return self._g.towns.get(self._i)
+    @town.setter
+    def town(self, v):
+        if v is None: self._g.towns.pop(self._i, None)
+        else:         self._g.towns[self._i] = v
+
+    @property
+    def army(self):               return self._g.tops.get(self._i)
+    @army.setter
+    def army(self, v):
+        if v is None: self._g.tops.pop(self._i, None)
+        else:         self._g.tops[self._i] = v
+
+    @property
+    def armies(self):             return self._g.stacks.get(self._i, ())
+    @armies.setter
+    def armies(self, v):
+        if v:   self._g.stacks[self._i] = v
+        else:   self._g.stacks.pop(self._i, None)
+
+    # Explicit accessors (not a property factory): these sit on every hot loop.
+    @property
+    def terrain(self):            return self._g.terrain[self._i]
+    @terrain.setter
+    def terrain(self, v):         self._g.terrain[self._i] = v
+
+    @property
+    def owner(self):              return self._g.owner[self._i]
+    @owner.setter
+    def owner(self, v):           self._g.owner[self._i] = v
+
+    @property
+    def elevation(self):          return self._g.elevation[self._i]
+    @elevation.setter
+    def elevation(self, v):       self._g.elevation[self._i] = v
+
+    @property
+    def moisture(self):           return self._g.moisture[self._i]
+    @moisture.setter
+    def moisture(self, v):        self._g.moisture[self._i] = v
+
+    @property
+    def road(self):               return self._g.road[self._i] != 0
+    @road.setter
+    def road(self, v):            self._g.road[self._i] = 1 if v else 0
+
+    @property
+    def entity(self):             return ENTITY_NAMES[self._g.entity[self._i]]
+    @entity.setter
+    def entity(self, v):          self._g.entity[self._i] = ENTITY_CODES[v]
+
+    @property
+    def captured_turn(self):      return self._g.captured[self._i]
+    @captured_turn.setter
+    def captured_turn(self, v):   self._g.captured[self._i] = v
+
+    @property
+    def territory_neglect(self):  return self._g.neglect[self._i]
+    @territory_neglect.setter
+    def territory_neglect(self, v): self._g.neglect[self._i] = v
+
+
 # ─────────────────────────────────────────────────────────────────────────────
+class _ViewRow:
+    """Row y of an arrays-mode map: TileViews made as they are indexed."""
+    __slots__ = ('_g', '_y')
+
+    def __init__(self, grid, y):
+        self._g = grid
+        self._y = y
+
+    def __len__(self):
+        return self._g.size
+
+    def __getitem__(self, x):
+        if not 0 <= x < self._g.size:
+            raise IndexError(x)
+        return TileView(self._g, x, self._y)
+
+    def __iter__(self):
+        g, y = self._g, self._y
+        return (TileView(g, x, y) for x in range(g.size))
+
+
+class _ViewRows:
+    """world.tiles for grid='arrays': same rows[y][x] / iteration interface
+    as the list of Tile lists, without a per-cell object."""
+    __slots__ = ('_g',)
+
+    def __init__(self, grid):
+        self._g = grid
+
+    def __len__(self):
+        return self._g.size
+
+    def __getitem__(self, y):
+        if not 0 <= y < self._g.size:
+            raise IndexError(y)
+        return _ViewRow(self._g, y)
+
+    def __iter__(self):
+        return (_ViewRow(self._g, y) for y in range(self._g.size))
+
+    def __getstate__(self):
+        return self._g
+
+    def __setstate__(self, grid):
+        self._g = grid
+
+
 class World:
-    def __init__(self, seed=None):
-        self.seed = seed or random.randint(0, 9999999)
-        random.seed(self.seed)
-        self.tiles = [[Tile(x,y) for x in range(MAP_SIZE)] for y in range(MAP_SIZE)]
-        self._generate()
+    """The map.  grid='objects' (default) stores one Tile per cell;
+    grid='arrays' stores cells in a WorldGrid and self.tiles makes TileViews
+    as they are read, so whole-map passes can work on self.grid directly and
+    memory does not grow with per-cell objects."""
+
+    GRID_MODES = ('objects', 'arrays')
+
+    def __init__(self, seed=None, grid='objects', vectorized=None, cache=None):
+        """cache is an optional worldcache.WorldCache; hits skip generation."""
+        if grid not in self.GRID_MODES:
+            raise ValueError(f'unknown grid mode {grid!r}')
+        self.seed = seed if seed is not None else random.randint(0, 9999999)
+        # Generation draws only from this stream; Game keeps its own (rng.py).
+        self.rng  = random.Random(self.seed)
+        # Sets that collect (x, y) of every ownership change (e.g.
+        # territory.TerritoryIndex) and of every change to a tile's owner,
+        # terrain, road, entity or deposits (yields.YieldCache,
+        # pathfinding.PathService).  Consumers register their own set.
+        self.owner_watchers = []
+        self.tile_watchers  = []
+        # Tiles holding armies (see place_army / lift_army).
+        self.army_index  = ArmyIndex()
+        hit = cache.load(self.seed) if cache is not None else None
+        if grid == 'arrays':
+            self.grid  = WorldGrid(MAP_SIZE, buffers=hit.buffers if hit else None)
+            self.tiles = _ViewRows(self.grid)
+        else:
+            self.grid  = None
+            self.tiles = [[Tile(x,y) for x in range(MAP_SIZE)] for y in range(MAP_SIZE)]
+
+        if hit:
+            if self.grid is None:
+                self._load_generated(hit.buffers)
+            self.resource_values = list(hit.resource_values)
+            # Leave the shared RNG exactly where generation would have.
+            self.rng.setstate(hit.rng_state)
+            return
+
+        if vectorized is None:
+            vectorized = worldgen.available(self.seed)
+        if vectorized:
+            self._generate_vectorized()
+        else:
+            self._generate()
+        if cache is not None:
+            cache.store(self, self.rng.getstate())
 
     # ── accessors ──────────────────────────────────────────────────────────
     def t(self, x, y) -> Tile:
+        if self.grid is not None:
+            return TileView(self.grid, x, y)
         return self.tiles[y][x]
 
+    def owners(self):
+        """Every tile's owner, row-major (-1 = none)."""
+        if self.grid is not None:
+            return self.grid.owner.tolist()
+        return [t.owner for row in self.tiles for t in row]
+
     def in_bounds(self, x, y):
         return 0 <= x < MAP_SIZE and 0 <= y < MAP_SIZE
 
@@ -119,6 +322,47 @@ class World:
         t = self.t(x, y)
         t.territory_neglect = 0
         t.owner = nation_idx
+        for watch in self.owner_watchers:
+            watch.add((x, y))
+        for watch in self.tile_watchers:
+            watch.add((x, y))
+
+    def place_army(self, army, x, y):
+        """Put army on top of the stack at (x, y)."""
+        t = self.t(x, y)
+        if t.armies:
+            t.armies.append(army)
+        else:
+            t.armies = [army]     # a TileView has no list until it has an army
+        t.army = army
+        self.army_index.update(t)
+
+    def lift_army(self, army, x, y):
+        """Take army off the stack at (x, y), if it is there."""
+        t = self.t(x, y)
+        if army in t.armies:
+            t.armies.remove(army)
+            if not t.armies:
+                t.armies = []     # lets a TileView drop the empty stack
+        if t.army == army:   t.army = t.armies[0] if t.armies else None
+        self.army_index.update(t)
+
+    def touch(self, x, y):
+        """Record that a tile's terrain, road, entity or deposits changed.
+
+        Call after any such change so cached yields and paths are rebuilt.
+        """
+        for watch in self.tile_watchers:
+            watch.add((x, y))
+
+    def unwatch(self, journal):
+        """Unregister a change set from owner_watchers / tile_watchers.
+
+        Matched by identity: list.remove would drop the first *equal* set,
+        and every empty journal is equal to every other.
+        """
+        for watchers in (self.owner_watchers, self.tile_watchers):
+            watchers[:] = [w for w in watchers if w is not journal]
 
     def neighbors4(self, x, y):
         for dx,dy in ((1,0),(-1,0),(0,1),(0,-1)):
@@ -153,6 +397,43 @@ class World:
         self._distribute_resources()
         self._calc_resource_values()
 
+    def _generate_vectorized(self):
+        """Same output as _generate via worldgen (requires NumPy)."""
+        if not worldgen.available(self.seed):
+            raise RuntimeError('vectorized generation needs NumPy and an int64-range seed')
+        arrays = worldgen.generate(self.seed, self.rng, MAP_SIZE)
+        self._load_generated({k: v.ravel() for k, v in arrays.items()})
+        self._calc_resource_values()
+
+    def _load_generated(self, fields):
+        """Copy flat generated fields (see grid.GENERATED_FIELDS) into tile storage.
+
+        Accepts any flat sequences with .tolist() — ndarrays or memoryviews.
+        """
+        if self.grid is not None:
+            for name, src in fields.items():
+                dst = getattr(self.grid, name)
+                dst[:] = array(GRID_FIELDS[name], src.tolist())
+            return
+        terr  = fields['terrain'].tolist()
+        elev  = fields['elevation'].tolist()
+        moist = fields['moisture'].tolist()
+        deps  = fields['deposits'].tolist()
+        i = 0
+        for row in self.tiles:
+            for t in row:
+                t.elevation = elev[i]
+                t.terrain   = terr[i]
+                t.moisture  = moist[i]
+                d = t.deposits
+                o = i * NUM_RESOURCES
+                # Untouched deposits stay int 0, as in the reference pipeline.
+                for r in range(NUM_RESOURCES):
+                    v = deps[o + r]
+                    if v:
+                        d[r] = v
+                i += 1
+
     # ── heightmap via layered noise ────────────────────────────────────────
     def _gen_heightmap(self):
         S = MAP_SIZE
@@ -162,8 +443,8 @@ class World:
         for octave in range(5):
             freq  = 2**(octave+1)
             amp   = 0.5**(octave)
-            ox_off = random.uniform(0,100)
-            oy_off = random.uniform(0,100)
+            ox_off = self.rng.uniform(0,100)
+            oy_off = self.rng.uniform(0,100)
             for y in range(S):
                 for x in range(S):
                     h[y][x] += amp * self._value_noise(
@@ -219,7 +500,7 @@ class World:
                 if t.terrain == TERRAIN_MOUNTAIN and t.elevation > 0.85:
                     peaks.append((x,y))
 
-        random.shuffle(peaks)
+        self.rng.shuffle(peaks)
         num_rivers = MAP_SIZE // 10
         for px,py in peaks[:num_rivers]:
             self._trace_river(px, py)
@@ -246,7 +527,7 @@ class World:
             best_e,bx,by = candidates[0]
             if best_e >= self.tiles[y][x].elevation and t.terrain!=TERRAIN_OCEAN:
                 # pick random direction to break ties / meander
-                random.shuffle(candidates)
+                self.rng.shuffle(candidates)
                 _,bx,by = candidates[0]
             x,y = bx,by
 
@@ -294,7 +575,7 @@ class World:
                 if t.moisture < 0.15 and t.elevation < 0.55:
                     t.terrain = TERRAIN_DESERT
                 elif t.moisture > 0.45 and t.terrain == TERRAIN_PLAIN:
-                    if random.random() < 0.5:
+                    if self.rng.random() < 0.5:
                         t.terrain = TERRAIN_FOREST
 
     # ── resource deposits ─────────────────────────────────────────────────
@@ -306,44 +587,50 @@ class World:
                 if t.terrain == TERRAIN_OCEAN:
                     continue
                 if t.terrain == TERRAIN_RIVER:
-                    d[RES_FOOD]  = random.uniform(4, 8)
-                    d[RES_METAL] = random.uniform(0.2, 0.8)  # alluvial metal
+                    d[RES_FOOD]  = self.rng.uniform(4, 8)
+                    d[RES_METAL] = self.rng.uniform(0.2, 0.8)  # alluvial metal
                 elif t.terrain == TERRAIN_PLAIN:
                     if t.moisture > 0.3:
-                        d[RES_FOOD]  = random.uniform(1, 5)
-                    d[RES_METAL] = random.uniform(0.1, 0.5)  # surface ore
+                        d[RES_FOOD]  = self.rng.uniform(1, 5)
+                    d[RES_METAL] = self.rng.uniform(0.1, 0.5)  # surface ore
                 elif t.terrain == TERRAIN_FOREST:
-                    d[RES_WOOD]  = random.uniform(3, 7)
-                    d[RES_FOOD]  = random.uniform(0.5, 2)
-                    d[RES_METAL] = random.uniform(0.1, 0.4)
+                    d[RES_WOOD]  = self.rng.uniform(3, 7)
+                    d[RES_FOOD]  = self.rng.uniform(0.5, 2)
+                    d[RES_METAL] = self.rng.uniform(0.1, 0.4)
                 elif t.terrain == TERRAIN_MOUNTAIN:
-                    d[RES_METAL] = random.uniform(3, 8)   # rich veins
-                    d[RES_FOOD]  = random.uniform(0.1, 0.5)
+                    d[RES_METAL] = self.rng.uniform(3, 8)   # rich veins
+                    d[RES_FOOD]  = self.rng.uniform(0.1, 0.5)
                 elif t.terrain == TERRAIN_DESERT:
-                    d[RES_METAL] = random.uniform(0.3, 1.0)  # mineral deposits
+                    d[RES_METAL] = self.rng.uniform(0.3, 1.0)  # mineral deposits
 
         # Scatter rich metal clusters (veins) on non-ocean land
         land_tiles = [(x,y) for y in range(MAP_SIZE) for x in range(MAP_SIZE)
                       if self.tiles[y][x].is_land()]
         for _ in range(MAP_SIZE * MAP_SIZE // 80):
             if land_tiles:
-                x,y = random.choice(land_tiles)
+                x,y = self.rng.choice(land_tiles)
                 t = self.tiles[y][x]
-                t.deposits[RES_METAL] += random.uniform(1, 3)
+                t.deposits[RES_METAL] += self.rng.uniform(1, 3)
 
         # scatter rare gold deposits
         for _ in range(MAP_SIZE * MAP_SIZE // 150):
             if land_tiles:
-                x,y = random.choice(land_tiles)
-                self.tiles[y][x].deposits[RES_GOLD] = random.uniform(1, 4)
+                x,y = self.rng.choice(land_tiles)
+                self.tiles[y][x].deposits[RES_GOLD] = self.rng.uniform(1, 4)
 
     # ── resource rarity values ─────────────────────────────────────────────
     def _calc_resource_values(self):
         totals = [0.0]*NUM_RESOURCES
-        for y in range(MAP_SIZE):
-            for x in range(MAP_SIZE):
-                for r in range(NUM_RESOURCES):
-                    totals[r] += self.tiles[y][x].deposits[r]
+        if self.grid is not None:
+            deps = self.grid.deposits
+            for r in range(NUM_RESOURCES):
+                for d in deps[r::NUM_RESOURCES]:   # same order as the tile loop
+                    totals[r] += d
+        else:
+            for y in range(MAP_SIZE):
+                for x in range(MAP_SIZE):
+                    for r in range(NUM_RESOURCES):
+                        totals[r] += self.tiles[y][x].deposits[r]
         max_t = max(totals) or 1
         # value = inverse of relative abundance (0..1 scale)
         self.resource_values = [max_t / (totals[r]+1) for r in range(NUM_RESOURCES)]
@@ -353,6 +640,10 @@ class World:
 
     # ── helper: find valid land spawn points ──────────────────────────────
     def valid_spawn_points(self):
+        if self.grid is not None and np is not None:
+            terr = self.grid.as_numpy()['terrain'][5:MAP_SIZE-5, 5:MAP_SIZE-5]
+            ys, xs = np.nonzero((terr == TERRAIN_PLAIN) | (terr == TERRAIN_FOREST))
+            return list(zip((xs + 5).tolist(), (ys + 5).tolist()))
         pts=[]
         for y in range(5, MAP_SIZE-5):
             for x in range(5, MAP_SIZE-5):
@@ -361,6 +652,16 @@ class World:
                     pts.append((x,y))
         return pts
 
+    def land_points(self, margin=0):
+        """(x, y) of every land tile at least margin tiles from the edge, row-major."""
+        lo, hi = margin, MAP_SIZE - margin
+        if self.grid is not None and np is not None:
+            terr = self.grid.as_numpy()['terrain'][lo:hi, lo:hi]
+            ys, xs = np.nonzero(terr != TERRAIN_OCEAN)
+            return list(zip((xs + lo).tolist(), (ys + lo).tolist()))
+        return [(x, y) for y in range(lo, hi) for x in range(lo, hi)
+                if self.tiles[y][x].is_land()]
+
     def land_tiles_in_radius(self, cx, cy, r):
         rows   = self.tiles
         result = []
@@ -0,0 +1,270 @@
+"""
+worldcache.py – Persistent on-disk cache of generated worlds.
+
+World(seed) is deterministic, so its generated fields (grid.GENERATED_FIELDS)
+plus the RNG state left behind by generation fully describe it.  Entries are
+stored as compact binary files named by a content hash of
+
+    (seed, MAP_SIZE, GENERATOR_VERSION, data/balance.json5, generator sources)
+
+so editing the balance file or the generator code yields new keys; stale
+entries simply stop being hit and age out under the LRU size cap.
+
+Hits are memory-mapped copy-on-write: with World(grid='arrays') the grid
+arrays *are* the mapping (the simulation's writes stay private to the
+process); with Tile objects the tiles are filled from it.
+
+File layout:
+    b'ANWC' | u16 format | u16 reserved | u32 header length | header JSON
+    (little-endian prefix), then raw native-order typed sections at 8-byte
+    aligned offsets (recorded in the header) from the first 8-byte boundary
+    after it.  Byte order is part of the key, so files never cross platforms.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+from constants import MAP_SIZE, NUM_RESOURCES
+from grid import GENERATED_FIELDS, GRID_FIELDS
+
+FORMAT_VERSION = 1
+_MAGIC  = b'ANWC'
+_PREFIX = struct.Struct('<4sHHI')
+
+_HERE = Path(__file__).parent
+_KEY_FILES = (
+    _HERE / 'data' / 'balance.json5',
+    _HERE / 'world.py',
+    _HERE / 'worldgen.py',
+    _HERE / 'grid.py',
+)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _align8(n):
+    return -(-n // 8) * 8
+
+
+def default_cache_dir(kind='worlds') -> Path:
+    """Per-kind cache directory under ANCIENT_NATIONS_CACHE_DIR, else the XDG cache."""
+    root = os.environ.get('ANCIENT_NATIONS_CACHE_DIR')
+    if not root:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        root = Path(base) / 'ancient_nations'
+    return Path(root) / kind
+
+
+class CacheEntry:
+    """A loaded cache hit: typed buffers over the mapping plus generation state."""
+
+    def __init__(self, buffers, resource_values, rng_state):
+        self.buffers         = buffers           # {field: memoryview}
+        self.resource_values = resource_values
+        self.rng_state       = rng_state
+
+
+class CacheDir:
+    """A directory of SUFFIX files, evicted least-recently-used past max_bytes."""
+
+    KIND   = ''
+    SUFFIX = ''
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, on_create=None):
+        """on_create(path) is called once if a write has to create the directory."""
+        self.path      = Path(path) if path else default_cache_dir(self.KIND)
+        self.max_bytes = max_bytes
+        self.on_create = on_create
+
+    def entries(self):
+        """[(path, size, mtime)] for every cache file, least recently used first."""
+        out = []
+        if not self.path.is_dir():
+            return out
+        for p in self.path.glob(f'*{self.SUFFIX}'):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            out.append((p, st.st_size, st.st_mtime))
+        out.sort(key=lambda e: e[2])
+        return out
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits max_bytes."""
+        entries = self.entries()
+        total   = sum(size for _, size, _ in entries)
+        for p, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if self._discard(p):
+                total -= size
+
+    def clear(self):
+        for p, _, _ in self.entries():
+            self._discard(p)
+
+    def _write(self, final, chunks):
+        """Atomically write chunks to final; False (no partial file) on OSError."""
+        try:
+            if not self.path.is_dir():
+                self.path.mkdir(parents=True, exist_ok=True)
+                if self.on_create is not None:
+                    self.on_create(self.path)
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in chunks:
+                    out.write(chunk)
+            os.replace(tmp, final)
+        except OSError:
+            self._discard(Path(tmp))
+            return False
+        except BaseException:
+            self._discard(Path(tmp))
+            raise
+        self.evict()
+        return True
+
+    @staticmethod
+    def _touch(p):
+        try:
+            os.utime(p)   # LRU recency
+        except OSError:
+            pass
+
+    @staticmethod
+    def _discard(p):
+        try:
+            p.unlink()
+            return True
+        except OSError:   # already gone, or mapped by another process on Windows
+            return False
+
+
+class WorldCache(CacheDir):
+    """Content-addressed, LRU-capped store of generated worlds."""
+
+    KIND   = 'worlds'
+    SUFFIX = '.anw'
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, on_create=None):
+        super().__init__(path, max_bytes, on_create)
+        self._code_digest = None
+
+    # ── keys ──────────────────────────────────────────────────────────────
+    def _code_hash(self):
+        if self._code_digest is None:
+            from world import GENERATOR_VERSION
+            h = hashlib.sha256(f'{FORMAT_VERSION}:{GENERATOR_VERSION}:{sys.byteorder}'.encode())
+            for p in _KEY_FILES:
+                h.update(p.read_bytes())
+            self._code_digest = h.hexdigest()
+        return self._code_digest
+
+    def key(self, seed) -> str:
+        h = hashlib.sha256(f'{seed}:{MAP_SIZE}:{self._code_hash()}'.encode())
+        return h.hexdigest()[:32]
+
+    def _file(self, seed) -> Path:
+        return self.path / f'{self.key(seed)}{self.SUFFIX}'
+
+    # ── read ──────────────────────────────────────────────────────────────
+    def load(self, seed):
+        """Return a CacheEntry for seed, or None on a miss or unreadable entry."""
+        f = self._file(seed)
+        try:
+            with open(f, 'rb') as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):   # missing, unreadable, or empty file
+            return None
+        try:
+            entry = self._parse(mm, seed)
+        except (ValueError, KeyError, TypeError, struct.error):
+            entry = None
+        if entry is None:
+            mm.close()
+            self._discard(f)
+            return None
+        self._touch(f)
+        return entry
+
+    def _parse(self, mm, seed):
+        magic, fmt, _, hlen = _PREFIX.unpack_from(mm, 0)
+        if magic != _MAGIC or fmt != FORMAT_VERSION:
+            return None
+        header = json.loads(bytes(mm[_PREFIX.size:_PREFIX.size + hlen]))
+        if header['seed'] != seed or header['size'] != MAP_SIZE:
+            return None
+        base = _align8(_PREFIX.size + hlen)
+        view = memoryview(mm)
+        bufs = {}
+        for name, (code, offset, count) in header['sections'].items():
+            start = base + offset
+            bufs[name] = view[start:start + count * array(code).itemsize].cast(code)
+        n = MAP_SIZE * MAP_SIZE
+        for name in GENERATED_FIELDS:
+            want = n * NUM_RESOURCES if name == 'deposits' else n
+            if len(bufs[name]) != want:
+                return None
+        rng = header['rng']
+        rng_state = (rng['version'], tuple(bufs.pop('rng').tolist()), rng['gauss_next'])
+        return CacheEntry(bufs, header['resource_values'], rng_state)
+
+    # ── write ─────────────────────────────────────────────────────────────
+    def store(self, world, rng_state):
+        """Persist world's generated fields and the post-generation rng_state.
+
+        Best effort: returns False (and leaves no partial file) if the cache
+        directory is not writable.
+        """
+        sections = {name: self._field_array(world, name) for name in GENERATED_FIELDS}
+        version, internal, gauss_next = rng_state
+        sections['rng'] = array('I', internal)
+
+        layout, offset = {}, 0
+        for name, arr in sections.items():
+            layout[name] = [arr.typecode, offset, len(arr)]
+            offset += _align8(arr.itemsize * len(arr))
+        header = {
+            'seed': world.seed,
+            'size': MAP_SIZE,
+            'resource_values': world.resource_values,
+            'rng': {'version': version, 'gauss_next': gauss_next},
+            'sections': layout,
+        }
+        hbytes = json.dumps(header, separators=(',', ':')).encode()
+        base   = _align8(_PREFIX.size + len(hbytes))
+
+        def chunks():
+            pos = _PREFIX.size + len(hbytes)
+            yield _PREFIX.pack(_MAGIC, FORMAT_VERSION, 0, len(hbytes))
+            yield hbytes
+            for name, arr in sections.items():
+                start = base + layout[name][1]
+                yield b'\0' * (start - pos)
+                data = arr.tobytes()
+                yield data
+                pos = start + len(data)
+        return self._write(self._file(world.seed), chunks())
+
+    @staticmethod
+    def _field_array(world, name):
+        if world.grid is not None:
+            return array(GRID_FIELDS[name], getattr(world.grid, name))
+        code = GRID_FIELDS[name]
+        if name == 'deposits':
+            return array(code, [t.deposits[r] for row in world.tiles for t in row
+                                for r in range(NUM_RESOURCES)])
+        return array(code, [getattr(t, name) for row in world.tiles for t in row])
@@ -0,0 +1,221 @@
+"""
+worldgen.py – NumPy-vectorised world generation.
+
+Reproduces World._generate bit-for-bit: the same noise hash (in wrapping
+int64 arithmetic, whose low bits match Python's unbounded ints), the same
+float operation order, and the same sequence of draws from the shared RNG.
+World uses this path automatically when NumPy is installed; the
+per-tile methods on World remain the reference implementation.
+
+generate() returns plain arrays; World copies them into Tiles or its WorldGrid.
+"""
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_I64_MIN = -(2 ** 63)
+_I64_MAX = 2 ** 63 - 1
+
+# Worst-case hash input: x*374761393 + y*668265263 + seed with x,y < 2*MAP_SIZE+100.
+_HASH_HEADROOM = (2 * MAP_SIZE + 101) * (374761393 + 668265263)
+
+
+def available(seed):
+    """True if the vectorised path can reproduce the reference output for seed."""
+    return (np is not None
+            and _I64_MIN + _HASH_HEADROOM < seed < _I64_MAX - _HASH_HEADROOM)
+
+
+def generate(seed, rng, size=MAP_SIZE):
+    """Run the full generation pipeline.
+
+    rng is the random source World draws from (same call order as the
+    reference methods).  Returns {'elevation', 'terrain', 'moisture'} as
+    (size, size) arrays and 'deposits' as (size, size, NUM_RESOURCES).
+    """
+    elev = _heightmap(seed, rng, size)
+    terr = _assign_terrain(elev)
+    _trace_rivers(terr, elev, rng, size)
+    _ensure_oceans(terr)
+    moist = _moisture(terr, size)
+    _refine_biomes(terr, elev, moist, rng)
+    deps = _distribute_resources(terr, moist, rng, size)
+    return {'elevation': elev, 'terrain': terr, 'moisture': moist, 'deposits': deps}
+
+
+# ── heightmap ─────────────────────────────────────────────────────────────────
+def _rng_hash(x, y, seed):
+    n = x * 374761393 + y * 668265263 + seed
+    n = (n ^ (n >> 13)) * 1274126177
+    return ((n ^ (n >> 16)) & 0x7fffffff) / 0x7fffffff
+
+
+def _heightmap(seed, rng, S):
+    coords = np.arange(S, dtype=np.float64)
+    h = np.zeros((S, S))
+    with np.errstate(over='ignore'):
+        for octave in range(5):
+            freq   = 2**(octave+1)
+            amp    = 0.5**(octave)
+            ox_off = rng.uniform(0, 100)
+            oy_off = rng.uniform(0, 100)
+            fx = coords / S * freq + ox_off
+            fy = coords / S * freq + oy_off
+            ix = fx.astype(np.int64)
+            iy = fy.astype(np.int64)
+            tx = fx - ix
+            ty = fy - iy
+            tx = (tx * tx * (3 - 2 * tx))[None, :]
+            ty = (ty * ty * (3 - 2 * ty))[:, None]
+            X, Y = ix[None, :], iy[:, None]
+            noise = (_rng_hash(X,   Y,   seed) * (1 - tx) * (1 - ty) +
+                     _rng_hash(X+1, Y,   seed) * tx * (1 - ty) +
+                     _rng_hash(X,   Y+1, seed) * (1 - tx) * ty +
+                     _rng_hash(X+1, Y+1, seed) * tx * ty)
+            h += amp * noise
+    mn, mx = h.min(), h.max()
+    rng_span = (mx - mn) or 1
+    return (h - mn) / rng_span
+
+
+# ── terrain ───────────────────────────────────────────────────────────────────
+def _assign_terrain(elev):
+    return np.select(
+        [elev < 0.30, elev < 0.45, elev < 0.62, elev < 0.78],
+        [TERRAIN_OCEAN, TERRAIN_PLAIN, TERRAIN_FOREST, TERRAIN_PLAIN],
+        default=TERRAIN_MOUNTAIN).astype(np.int8)
+
+
+def _trace_rivers(terr, elev, rng, S):
+    """Same walk as World._gen_rivers/_trace_river, on Python lists."""
+    peak_mask = np.zeros_like(terr, dtype=bool)
+    inner = (slice(2, S-2), slice(2, S-2))
+    peak_mask[inner] = (terr[inner] == TERRAIN_MOUNTAIN) & (elev[inner] > 0.85)
+    ys, xs = np.nonzero(peak_mask)
+    peaks = list(zip(xs.tolist(), ys.tolist()))
+    rng.shuffle(peaks)
+
+    T = terr.tolist()
+    E = elev.tolist()
+    for sx, sy in peaks[:S // 10]:
+        x, y = sx, sy
+        visited = set()
+        for _ in range(S*2):
+            key = (x, y)
+            if key in visited: break
+            visited.add(key)
+            if T[y][x] == TERRAIN_OCEAN: break
+            if T[y][x] != TERRAIN_MOUNTAIN:
+                T[y][x] = TERRAIN_RIVER
+            candidates = []
+            for dx, dy in ((1,0),(-1,0),(0,1),(0,-1)):
+                nx, ny = x+dx, y+dy
+                if 0 <= nx < S and 0 <= ny < S:
+                    candidates.append((E[ny][nx], nx, ny))
+            if not candidates: break
+            candidates.sort()
+            best_e, bx, by = candidates[0]
+            if best_e >= E[y][x] and T[y][x] != TERRAIN_OCEAN:
+                rng.shuffle(candidates)
+                _, bx, by = candidates[0]
+            x, y = bx, by
+    terr[:] = T
+
+
+def _ensure_oceans(terr):
+    terr[:2, :]  = TERRAIN_OCEAN
+    terr[-2:, :] = TERRAIN_OCEAN
+    terr[:, :2]  = TERRAIN_OCEAN
+    terr[:, -2:] = TERRAIN_OCEAN
+
+
+# ── moisture ──────────────────────────────────────────────────────────────────
+def _moisture(terr, S):
+    """4-neighbour BFS distance to water == L1 distance transform (no obstacles).
+
+    Computed as two separable min-plus sweeps per axis; capped at the BFS
+    sentinel (999) so unreached tiles match the reference.
+    """
+    big = 1 << 30
+    d = np.where((terr == TERRAIN_OCEAN) | (terr == TERRAIN_RIVER), 0, big).astype(np.int64)
+    for axis in (1, 0):
+        d = np.moveaxis(d, axis, 0).copy()
+        for i in range(1, S):
+            np.minimum(d[i], d[i-1] + 1, out=d[i])
+        for i in range(S-2, -1, -1):
+            np.minimum(d[i], d[i+1] + 1, out=d[i])
+        d = np.moveaxis(d, 0, axis)
+    d = np.minimum(d, 999)
+    max_d = int(d.max()) or 1
+    return 1.0 - d / max_d
+
+
+# ── biomes ────────────────────────────────────────────────────────────────────
+def _refine_biomes(terr, elev, moist, rng):
+    candidate = ((terr != TERRAIN_OCEAN) & (terr != TERRAIN_MOUNTAIN)
+                 & (terr != TERRAIN_RIVER))
+    desert = candidate & (moist < 0.15) & (elev < 0.55)
+    draw   = candidate & ~desert & (moist > 0.45) & (terr == TERRAIN_PLAIN)
+    rolls  = np.array([rng.random() for _ in range(int(draw.sum()))])
+    terr[desert] = TERRAIN_DESERT
+    forest = np.zeros_like(draw)
+    forest[draw] = rolls < 0.5
+    terr[forest] = TERRAIN_FOREST
+
+
+# ── deposits ──────────────────────────────────────────────────────────────────
+def _u(a, b, r):
+    """random.uniform(a, b) given the underlying random() draw r."""
+    return a + (b - a) * r
+
+
+def _distribute_resources(terr, moist, rng, S):
+    river  = terr == TERRAIN_RIVER
+    plain  = terr == TERRAIN_PLAIN
+    wet_pl = plain & (moist > 0.3)
+    forest = terr == TERRAIN_FOREST
+    mount  = terr == TERRAIN_MOUNTAIN
+    desert = terr == TERRAIN_DESERT
+
+    # Draws per tile in the reference's row-major order.
+    counts = (2*river + plain + wet_pl + 3*forest + 2*mount + desert).ravel()
+    offs   = np.cumsum(counts) - counts
+    r      = np.array([rng.random() for _ in range(int(counts.sum()))])
+
+    def draw(mask, k):
+        return r[offs[mask.ravel()] + k]
+
+    deps = np.zeros((S, S, NUM_RESOURCES))
+    food, wood, metal = deps[..., RES_FOOD], deps[..., RES_WOOD], deps[..., RES_METAL]
+
+    food[river]  = _u(4, 8, draw(river, 0))
+    metal[river] = _u(0.2, 0.8, draw(river, 1))
+
+    food[wet_pl] = _u(1, 5, draw(wet_pl, 0))
+    # Plain tiles draw metal after the optional food roll.
+    metal[plain] = _u(0.1, 0.5, r[offs[plain.ravel()] + wet_pl[plain]])
+
+    wood[forest]  = _u(3, 7, draw(forest, 0))
+    food[forest]  = _u(0.5, 2, draw(forest, 1))
+    metal[forest] = _u(0.1, 0.4, draw(forest, 2))
+
+    metal[mount] = _u(3, 8, draw(mount, 0))
+    food[mount]  = _u(0.1, 0.5, draw(mount, 1))
+
+    metal[desert] = _u(0.3, 1.0, draw(desert, 0))
+
+    # Vein and gold scatter: few iterations, interleaved choice/uniform draws.
+    ys, xs = np.nonzero(terr != TERRAIN_OCEAN)
+    land = list(zip(xs.tolist(), ys.tolist()))
+    for _ in range(S * S // 80):
+        if land:
+            x, y = rng.choice(land)
+            deps[y, x, RES_METAL] += rng.uniform(1, 3)
+    for _ in range(S * S // 150):
+        if land:
+            x, y = rng.choice(land)
+            deps[y, x, RES_GOLD] = rng.uniform(1, 4)
+    return deps
@@ -0,0 +1,74 @@
+"""
+yields.py – Per-town cache of resource-collection tables.
+
+Nation.collect_resources sums, for every town, the yield of each tile in its
+gathering radius.  The per-tile part (ownership, terrain, entity, deposits)
+rarely changes, so YieldCache keeps each town's Nation.town_yields() table
+and collection only applies the trait and season multipliers to it.
+
+A table is rebuilt when:
+    - a tile in the town's radius changes owner, terrain, entity or deposits
+      (World.set_tile_owner and World.touch report into `dirty`);
+    - the town's collecting nation or radius (level, radius trait) changes;
+    - alliance status with a foreign owner in the radius changes.
+Trait and season multipliers are applied at collection time, so they never
+invalidate anything.
+"""
+
+
+class _Entry:
+    __slots__ = ('key', 'table', 'foreign', 'allies', 'tiles')
+
+    def __init__(self, key, table, foreign, allies, tiles):
+        self.key     = key       # (nation idx, radius) the table was built for
+        self.table   = table     # {res: [term, ...]}
+        self.foreign = foreign   # other owners in the radius
+        self.allies  = allies    # the subset we were allied with
+        self.tiles   = tiles     # (x, y) registered in YieldCache._watch
+
+
+class YieldCache:
+    """Cached Nation.town_yields() tables for every town in a Game."""
+
+    def __init__(self, world):
+        self.world    = world
+        self._entries = {}   # Town -> _Entry
+        self._watch   = {}   # (x, y) -> towns whose table reads that tile
+        # Tiles changed since the last flush (filled by World).
+        self.dirty    = set()
+        world.tile_watchers.append(self.dirty)
+
+    def table(self, n, town):
+        """town's yield table as collected by nation n (see Nation.town_yields)."""
+        if self.dirty:
+            self._flush()
+        key = (n.idx, town.radius + n.trait_val('town_radius_bonus', 0))
+        e = self._entries.get(town)
+        if e is not None:
+            if (e.key == key
+                    and e.allies == {o for o in e.foreign if n.allied_with(o)}):
+                return e.table
+            self._drop(town)
+        table, foreign = n.town_yields(self.world, town)
+        allies = {o for o in foreign if n.allied_with(o)}
+        tiles = [(t.x, t.y) for t in self.world.tiles_in_radius(town.x, town.y, key[1])]
+        for xy in tiles:
+            self._watch.setdefault(xy, set()).add(town)
+        self._entries[town] = _Entry(key, table, foreign, allies, tiles)
+        return table
+
+    def _flush(self):
+        watch = self._watch
+        for xy in self.dirty:
+            for town in list(watch.get(xy, ())):
+                self._drop(town)
+        self.dirty.clear()
+
+    def _drop(self, town):
+        e = self._entries.pop(town)
+        watch = self._watch
+        for xy in e.tiles:
+            towns = watch[xy]
+            towns.discard(town)
+            if not towns:
+                del watch[xy]